@@ -1,9 +1,10 @@
 import streamlit as st
-import os
 import pandas as pd
 
-from components.resume_parser import extract_text_from_pdf
+from components.resume_parser import extract_text_with_budget, DEFAULT_BUDGET
+from components.extraction_cache import get_extraction_cache
 from components.llm_review import review_resume
+from components.ats_scoring import IncrementalATSScorer
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -358,11 +359,38 @@ with col2:
 resume_text = ""
 
 if uploaded_file is not None:
-    tmp_path = os.path.join("/tmp", uploaded_file.name)
-    with open(tmp_path, "wb") as f:
-        f.write(uploaded_file.read())
+    pdf_bytes = uploaded_file.getvalue()
+
+    # Parsed in memory; reruns and repeat uploads are served from the cache
+    cache = get_extraction_cache()
+    cache_key = cache.key_for(pdf_bytes)
+    cached = cache.get(cache_key)
+
+    # Truncated / timed-out / failed extractions aren't cached as complete
+    # text; they are kept for this session, keyed by the budget that
+    # produced them, so reruns don't start a new extraction
+    partial = st.session_state.setdefault("partial_extractions", {})
+    partial_key = (cache_key, DEFAULT_BUDGET)
+
+    if cached is not None:
+        text, pages = cached
+    else:
+        extraction = partial.get(partial_key)
+        if extraction is None:
+            # Bounded pages / chars / wall-clock so one bad PDF can't hang the app
+            extraction = extract_text_with_budget(pdf_bytes, DEFAULT_BUDGET)
+            if extraction["status"] == "ok":
+                if extraction["text"]:
+                    cache.put(cache_key, extraction["text"], extraction["page_count"])
+            else:
+                partial[partial_key] = extraction
+        text, pages = extraction["text"], extraction["page_count"]
+
+        if extraction["status"] == "truncated":
+            st.warning(f"⚠️ Large PDF: only the first {extraction['pages_read']} pages were analyzed")
+        elif extraction["status"] != "ok" and text:
+            st.warning("⚠️ PDF extraction stopped early; analyzing the pages read so far")
 
-    text, pages = extract_text_from_pdf(tmp_path)
     if text:
         resume_text = text
         st.success(f"✅ Extracted text from PDF ({pages} pages)")
@@ -382,12 +410,17 @@ if st.button("🚀 Analyze Resume", type="primary", use_container_width=True):
     if not resume_text.strip():
         st.error("⚠️ Please upload a resume or paste resume text.")
     else:
+        # re-analysis after small edits only rescores the changed lines
+        if "ats_scorer" not in st.session_state:
+            st.session_state["ats_scorer"] = IncrementalATSScorer()
+
         with st.spinner("🔄 Analyzing resume…"):
             result = review_resume(
                 resume_text=resume_text,
                 guidance_blobs=[],
                 jd_text=jd_text,
                 job_role=None if target_role == "(Auto-detect from resume)" else target_role,
+                ats_scorer=st.session_state["ats_scorer"],
             )
 
         # -------------------------------------------------
@@ -424,6 +457,21 @@ if st.button("🚀 Analyze Resume", type="primary", use_container_width=True):
             else:
                 st.warning("⚠️ LLM Fallback Mode")
 
+        if result.get("role_fit"):
+            st.markdown("**Best-fit roles (keyword match)**")
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "Role": r["role"],
+                        "Match": f"{r['match_rate'] * 100:.0f}%",
+                        "Missing skills": ", ".join(r["missing"]),
+                    }
+                    for r in result["role_fit"]
+                ]),
+                use_container_width=True,
+                hide_index=True,
+            )
+
         st.markdown("")
         
         # ---- AI FEEDBACK ----
@@ -436,6 +484,7 @@ if st.button("🚀 Analyze Resume", type="primary", use_container_width=True):
             st.write("**LLM used:**", result.get("llm_used"))
             st.write("**Predicted role:**", result.get("predicted_role"))
             st.write("**Target role:**", result.get("target_role"))
+            st.write("**Extraction cache:**", get_extraction_cache().stats())
 
 # -------------------------------------------------
 # FOOTER
@@ -0,0 +1,236 @@
+"""
+Bulk resume scoring.
+
+Scores every PDF under a directory with the same pipeline as the
+Streamlit page (text extraction, ML role prediction, ATS score) and
+writes one record per resume to JSONL or Parquet.
+
+Usage (from the app/ directory):
+    python batch_ingest.py ./resumes --out scored.jsonl --workers 8
+    python batch_ingest.py ./resumes --out scored.parquet
+
+Re-running with the same --out skips resumes whose file hash is already
+recorded without an error, so interrupted runs can simply be restarted
+and failed files are retried; a retried file's newer record supersedes
+the old one. Parquet output is checkpointed every --checkpoint-every
+records.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Set
+
+from components.resume_parser import extract_text_with_budget, DEFAULT_BUDGET
+from components.ats_scoring import ats_score
+from components.utils import atomic_write_path, clean_text
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+
+def _score_file(path: str) -> Dict[str, Any]:
+    # imported lazily so each worker loads the role artifacts once
+    from components.llm_review import predict_role, get_role_meta, faiss_meta, META_LOAD_ERROR
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    record: Dict[str, Any] = {
+        "file": path,
+        "file_hash": hashlib.sha256(data).hexdigest(),
+    }
+
+    try:
+        if META_LOAD_ERROR:
+            # scoring without required skills would look like a success
+            raise RuntimeError(f"JD meta unavailable ({META_LOAD_ERROR})")
+
+        # bounded pages / chars / wall-clock so one bad PDF can't hang a worker
+        extraction = extract_text_with_budget(data, DEFAULT_BUDGET)
+        text = clean_text(extraction["text"])
+        page_count = extraction["page_count"]
+        status = extraction["status"]
+
+        role = predict_role(text) if text else None
+        role_meta = get_role_meta(role, faiss_meta) if role else None
+        required_skills = role_meta.get("skills", []) if role_meta else []
+
+        score, detail = ats_score(text, required_skills)
+
+        record.update({
+            "text_hash": hashlib.sha256(text.encode("utf-8")).hexdigest() if text else None,
+            "page_count": page_count,
+            "extract_status": status,
+            "page_backends": extraction["page_backends"],
+            "predicted_role": role,
+            "ats_score": score,
+            "ats_detail": detail,
+            "error": None if text else f"no text extracted ({status})",
+        })
+    except Exception as e:
+        record.update({
+            "text_hash": None,
+            "page_count": 0,
+            "extract_status": None,
+            "page_backends": None,
+            "predicted_role": None,
+            "ats_score": None,
+            "ats_detail": None,
+            "error": f"{type(e).__name__}: {e}",
+        })
+
+    return record
+
+
+# -------------------------------------------------
+# INPUT / OUTPUT
+# -------------------------------------------------
+
+def _iter_pdfs(root: str) -> Iterator[str]:
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(dirpath, name)
+
+
+def _latest_per_file(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One record per (file, file hash), the last one written winning."""
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for i, rec in enumerate(records):
+        key = (rec.get("file"), rec.get("file_hash")) if rec.get("file_hash") else ("row", i)
+        latest[key] = rec
+    return list(latest.values())
+
+
+def _load_existing(out_path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(out_path):
+        return []
+
+    if out_path.endswith(".parquet"):
+        import pandas as pd
+        df = pd.read_parquet(out_path).astype(object)
+        # missing values (e.g. error) come back as NaN; records use None
+        return _latest_per_file(df.where(df.notna(), None).to_dict("records"))
+
+    records = []
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except Exception:
+                pass  # partially written last line of an interrupted run
+    return _latest_per_file(records)
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_parquet(out_path: str, records: List[Dict[str, Any]]):
+    import pandas as pd
+
+    df = pd.DataFrame(_latest_per_file(records))
+    # nested ATS detail is stored as a JSON string column
+    df["ats_detail"] = df["ats_detail"].map(
+        lambda d: d if d is None or isinstance(d, str) else json.dumps(d)
+    )
+    # unique temp file + rename: an interrupted checkpoint leaves the previous
+    # one intact and two runs on the same --out never share a temp file
+    with atomic_write_path(out_path, suffix=".parquet") as tmp:
+        df.to_parquet(tmp, index=False)
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+def run(
+    input_dir: str,
+    out_path: str,
+    workers: int = 0,
+    checkpoint_every: int = 200,
+) -> Dict[str, Any]:
+    existing = _load_existing(out_path)
+    # failed files are retried on the next run
+    done: Set[str] = {
+        r["file_hash"] for r in existing if r.get("file_hash") and r.get("error") is None
+    }
+
+    pending = []
+    skipped = 0
+    for path in _iter_pdfs(input_dir):
+        if _file_hash(path) in done:
+            skipped += 1
+        else:
+            pending.append(path)
+
+    parquet = out_path.endswith(".parquet")
+    new_records: List[Dict[str, Any]] = []
+    failed = 0
+
+    start = time.perf_counter()
+    jsonl = None if parquet else open(out_path, "a", encoding="utf-8")
+    try:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            futures = [pool.submit(_score_file, p) for p in pending]
+            for i, fut in enumerate(as_completed(futures), 1):
+                rec = fut.result()
+                failed += rec["error"] is not None
+
+                if jsonl is not None:
+                    jsonl.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    jsonl.flush()
+                else:
+                    new_records.append(rec)
+                    if len(new_records) % checkpoint_every == 0:
+                        _write_parquet(out_path, existing + new_records)
+
+                if i % 100 == 0 or i == len(futures):
+                    rate = i / max(1e-9, time.perf_counter() - start)
+                    print(f"[{i}/{len(futures)}] {rate:.1f} files/s", file=sys.stderr)
+    finally:
+        if jsonl is not None:
+            jsonl.close()
+        if parquet and new_records:
+            _write_parquet(out_path, existing + new_records)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": len(pending),
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "files_per_second": round(len(pending) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of PDF resumes.")
+    parser.add_argument("input_dir", help="Directory searched recursively for *.pdf")
+    parser.add_argument("--out", default="scored_resumes.jsonl", help="Output .jsonl or .parquet file")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=200,
+        help="Rewrite Parquet output after this many new records (JSONL is written per record)",
+    )
+    args = parser.parse_args(argv)
+
+    summary = run(args.input_dir, args.out, args.workers, args.checkpoint_every)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
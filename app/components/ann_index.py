@@ -0,0 +1,266 @@
+import os
+import math
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from .utils import atomic_write_path, save_json, load_json
+
+
+# -------------------------------------------------
+# INDEX CONFIG
+# -------------------------------------------------
+
+INDEX_CONFIG_FILE = "faiss_index.json"
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# vector storage for flat / ivf_flat / hnsw: float32, or scalar-quantized
+SQ_TYPES = {"": None, "fp16": "QT_fp16", "int8": "QT_8bit"}
+
+
+class IndexConfig(NamedTuple):
+    """
+    FAISS index type and its parameters. 0 for `nlist` / `pq_m` picks a
+    value from the data. `nprobe` / `ef_search` are search-time knobs and
+    can be changed after the index is built.
+    """
+    type: str = "flat"
+    sq: str = ""             # "" (float32), "fp16" or "int8"; ivf_pq has its own codes
+    nlist: int = 0           # IVF cells
+    nprobe: int = 16         # IVF cells visited per query
+    pq_m: int = 0            # PQ sub-quantizers (must divide dim)
+    pq_nbits: int = 8        # bits per PQ code
+    hnsw_m: int = 32         # HNSW graph degree
+    ef_construction: int = 80
+    ef_search: int = 64
+    train_size: int = 100000  # vectors buffered / sampled to train IVF and PQ
+
+
+DEFAULT_INDEX_CONFIG = IndexConfig(
+    type=os.getenv("JD_INDEX_TYPE", "flat"),
+    sq=os.getenv("JD_INDEX_SQ", ""),
+    nlist=int(os.getenv("JD_INDEX_NLIST", "0")),
+    nprobe=int(os.getenv("JD_INDEX_NPROBE", "16")),
+    pq_m=int(os.getenv("JD_INDEX_PQ_M", "0")),
+    hnsw_m=int(os.getenv("JD_INDEX_HNSW_M", "32")),
+    ef_search=int(os.getenv("JD_INDEX_EF_SEARCH", "64")),
+    train_size=int(os.getenv("JD_INDEX_TRAIN_SIZE", "100000")),
+)
+
+# k-means wants ~39 points per centroid; more than 256 per centroid only slows training
+MIN_POINTS_PER_CELL = 39
+MAX_POINTS_PER_CELL = 256
+
+
+def save_index_config(art_dir: str, config: IndexConfig):
+    save_json(os.path.join(art_dir, INDEX_CONFIG_FILE), config._asdict())
+
+
+def load_index_config(art_dir: str) -> IndexConfig:
+    """Config stored next to faiss_index.bin; flat for artifacts built before it existed."""
+    stored = load_json(os.path.join(art_dir, INDEX_CONFIG_FILE), default={}) or {}
+    return IndexConfig(**{k: v for k, v in stored.items() if k in IndexConfig._fields})
+
+
+def is_ivf(config: IndexConfig) -> bool:
+    return config.type in ("ivf_flat", "ivf_pq")
+
+
+def needs_training(config: IndexConfig) -> bool:
+    # int8 SQ learns per-dimension ranges; fp16 is a plain conversion
+    return is_ivf(config) or config.sq == "int8"
+
+
+# -------------------------------------------------
+# INDEX CONSTRUCTION
+# -------------------------------------------------
+
+def _pq_m(dim: int, wanted: int) -> int:
+    """Largest divisor of dim not above `wanted` (default: 8 dims per sub-quantizer)."""
+    wanted = wanted or max(1, dim // 8)
+    return max(m for m in range(1, min(wanted, dim) + 1) if dim % m == 0)
+
+
+def resolve_config(config: IndexConfig, dim: int, n_train: int) -> IndexConfig:
+    """
+    Concrete parameters for `n_train` available training vectors. Falls
+    back to flat when there are too few vectors to train IVF / PQ.
+    """
+    if config.type not in INDEX_TYPES:
+        raise ValueError(f"Unknown FAISS index type: {config.type!r} (expected one of {INDEX_TYPES})")
+    if config.sq not in SQ_TYPES:
+        raise ValueError(f"Unknown vector storage: {config.sq!r} (expected one of {tuple(SQ_TYPES)})")
+    if config.type == "ivf_pq" and config.sq:
+        config = config._replace(sq="")
+    if not is_ivf(config):
+        return config
+
+    min_train = MIN_POINTS_PER_CELL
+    if config.type == "ivf_pq":
+        min_train *= 1 << config.pq_nbits
+    if n_train < min_train:
+        return config._replace(type="flat")
+
+    nlist = config.nlist or int(4 * math.sqrt(n_train))
+    nlist = max(1, min(nlist, n_train // MIN_POINTS_PER_CELL))
+    if config.type == "ivf_pq":
+        return config._replace(nlist=nlist, pq_m=_pq_m(dim, config.pq_m))
+    return config._replace(nlist=nlist)
+
+
+def make_index(config: IndexConfig, dim: int):
+    """Empty inner-product index for a resolved config."""
+    import faiss
+
+    metric = faiss.METRIC_INNER_PRODUCT
+    qtype = getattr(faiss.ScalarQuantizer, SQ_TYPES[config.sq]) if config.sq else None
+    if config.type == "flat":
+        if qtype is not None:
+            return faiss.IndexScalarQuantizer(dim, qtype, metric)
+        return faiss.IndexFlatIP(dim)
+    if config.type == "hnsw":
+        if qtype is not None:
+            index = faiss.IndexHNSWSQ(dim, qtype, config.hnsw_m, metric)
+        else:
+            index = faiss.IndexHNSWFlat(dim, config.hnsw_m, metric)
+        index.hnsw.efConstruction = config.ef_construction
+        return index
+
+    quantizer = faiss.IndexFlatIP(dim)
+    if config.type == "ivf_flat":
+        if qtype is not None:
+            return faiss.IndexIVFScalarQuantizer(quantizer, dim, config.nlist, qtype, metric)
+        return faiss.IndexIVFFlat(quantizer, dim, config.nlist, metric)
+    return faiss.IndexIVFPQ(quantizer, dim, config.nlist, config.pq_m, config.pq_nbits, metric)
+
+
+def apply_search_params(index, config: IndexConfig):
+    import faiss
+
+    if is_ivf(config):
+        faiss.extract_index_ivf(index).nprobe = config.nprobe
+    elif config.type == "hnsw":
+        if isinstance(index, faiss.IndexIDMap):
+            index = faiss.downcast_index(index.index)
+        index.hnsw.efSearch = config.ef_search
+
+
+def ensure_id_map(index, config: IndexConfig):
+    """
+    Index whose vector labels are set by the caller (IVF natively, other
+    types through IndexIDMap2). Indexes saved without labels are re-added
+    with labels 0..n-1, their row numbers.
+    """
+    import faiss
+
+    if is_ivf(config) or isinstance(index, faiss.IndexIDMap):
+        return index
+    labelled = faiss.IndexIDMap2(make_index(config, index.d))
+    apply_search_params(labelled, config)
+    if index.ntotal:
+        labelled.add_with_ids(index.reconstruct_n(0, index.ntotal), np.arange(index.ntotal, dtype=np.int64))
+    return labelled
+
+
+def read_index(path: str, mmap: bool = False):
+    """
+    Load an index. With `mmap` its vectors stay in the file's page cache,
+    shared by every process that maps it, instead of a private copy; a
+    mapped index is read-only.
+    """
+    import faiss
+
+    flags = 0
+    if mmap:
+        flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    return faiss.read_index(path, flags)
+
+
+def write_index(index, path: str):
+    """
+    Write via a unique temp file and rename, so concurrent writers (a
+    background retrain and JDIndex.save, or two processes) don't clobber
+    each other and processes mapping the old file keep a valid view.
+    """
+    import faiss
+
+    with atomic_write_path(path) as tmp:
+        faiss.write_index(index, tmp)
+
+
+def index_nbytes(index) -> int:
+    """Serialized size of an index, a proxy for its memory footprint."""
+    import faiss
+
+    return int(faiss.serialize_index(index).nbytes)
+
+
+# -------------------------------------------------
+# STREAMING BUILD
+# -------------------------------------------------
+
+class IndexBuilder:
+    """
+    Builds an index from embeddings added chunk by chunk, labelling
+    vectors 0, 1, 2, ... in arrival order. Types that need training (IVF,
+    int8 SQ) buffer the first `train_size` vectors, train on a random
+    sample of them, then add vectors as they arrive.
+    """
+
+    def __init__(self, config: IndexConfig = DEFAULT_INDEX_CONFIG, seed: int = 0):
+        self.config = config
+        self.seed = seed
+        self.index = None
+        self.n_added = 0
+        self._pending: List[np.ndarray] = []
+        self._n_pending = 0
+
+    def _add(self, embs: np.ndarray):
+        ids = np.arange(self.n_added, self.n_added + len(embs), dtype=np.int64)
+        self.index.add_with_ids(embs, ids)
+        self.n_added += len(embs)
+
+    def add(self, embs: np.ndarray):
+        embs = np.ascontiguousarray(embs, dtype=np.float32)
+        if self.index is not None:
+            self._add(embs)
+            return
+        if not needs_training(self.config):
+            self._create(embs.shape[1], len(embs))
+            self._add(embs)
+            return
+
+        self._pending.append(embs)
+        self._n_pending += len(embs)
+        if self._n_pending >= self.config.train_size:
+            self._train_pending()
+
+    def _create(self, dim: int, n_train: int):
+        self.config = resolve_config(self.config, dim, n_train)
+        self.index = ensure_id_map(make_index(self.config, dim), self.config)
+        apply_search_params(self.index, self.config)
+
+    def _train_pending(self):
+        buffered = np.concatenate(self._pending)
+        self._pending, self._n_pending = [], 0
+        self._create(buffered.shape[1], len(buffered))
+
+        if not self.index.is_trained:
+            cap = len(buffered)
+            if is_ivf(self.config):
+                cap = self.config.nlist * MAX_POINTS_PER_CELL
+            if self.config.type == "ivf_pq":
+                cap = max(cap, MAX_POINTS_PER_CELL * (1 << self.config.pq_nbits))
+            sample = buffered
+            if len(buffered) > cap:
+                rng = np.random.default_rng(self.seed)
+                sample = buffered[np.sort(rng.choice(len(buffered), cap, replace=False))]
+            self.index.train(sample)
+        self._add(buffered)
+
+    def finish(self) -> Optional[object]:
+        """The built index, or None if nothing was added."""
+        if self.index is None and self._n_pending:
+            self._train_pending()
+        return self.index
@@ -1,8 +1,17 @@
-from typing import Dict, List, Tuple
+from functools import cached_property, lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import os
 import re
-import textstat
+import math
+import numpy as np
+import pyphen
+from scipy import sparse
 
-from .utils import normalize_token
+from .skill_matcher import SkillMatcher, get_skill_matcher, normalized_tokens, tokenize_normalized
+from .syllable_seed import SYLLABLE_SEED
+from .utils import TOKEN_PATTERN, normalize_token
 
 
 # -------------------------------------------------
@@ -20,84 +29,296 @@ SECTION_HINTS = {
 }
 
 
+# -------------------------------------------------
+# ANALYZED DOCUMENT (SINGLE PASS)
+# -------------------------------------------------
+
+_SENTENCE_END = re.compile(r"[.!?]")
+_TOKEN = re.compile(r"[A-Za-z0-9\+\#\./-]{2,}")
+_BULLET = re.compile(r"(^\s*[-•*])", flags=re.MULTILINE)
+_NUMBER = re.compile(r"\b\d+(\.\d+)?%?\b")
+_ALL_CAPS = re.compile(r"\b[A-Z]{3,}\b")
+_EXPERIENCE_HINT = re.compile(r"\b(develop|built|worked|engineer|implemented|\d+\s+years?)\b")
+_EDUCATION_HINT = re.compile(r"\b(bachelor|master|degree|gpa|percentage)\b")
+
+
+class AnalyzedResume:
+    """
+    One resume text, tokenized once and shared by every ATS signal.
+    Each view is computed on first access and cached.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """Non-blank lines, stripped."""
+        return [ln for ln in (raw.strip() for raw in self.text.splitlines()) if ln]
+
+    @cached_property
+    def header_candidates(self) -> List[str]:
+        """Top 60 lines normalized for header comparison."""
+        if "lines" in self.__dict__:
+            top = self.lines[:60]
+        else:
+            top = _first_nonblank_lines(self.text, 60)
+        return [ln.lower().rstrip(":") for ln in top]
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Chunks between sentence terminators [.!?] (last one may be open)."""
+        return _SENTENCE_END.split(self.text)
+
+    @cached_property
+    def sentence_word_counts(self) -> List[int]:
+        return [len(seg.split()) for seg in self.sentences]
+
+    @cached_property
+    def words(self) -> List[str]:
+        return self.text.split()
+
+    @cached_property
+    def word_syllables(self) -> List[int]:
+        """Syllables per word in `words`; 0 for pure punctuation."""
+        return list(map(word_syllables, self.words))
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Tech-ish word tokens (keeps +, #, ., /, -)."""
+        return _TOKEN.findall(self.text)
+
+    @cached_property
+    def normalized_tokens(self) -> List[str]:
+        """normalize_token applied per token (separators split tokens)."""
+        return normalized_tokens(self.text)
+
+    @cached_property
+    def token_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of `normalized_tokens` in the text."""
+        return tokenize_normalized(self.text)[1]
+
+    @cached_property
+    def bullet_positions(self) -> List[int]:
+        return [m.start() for m in _BULLET.finditer(self.text)]
+
+    @cached_property
+    def number_count(self) -> int:
+        return len(_NUMBER.findall(self.text))
+
+    @cached_property
+    def all_caps_count(self) -> int:
+        return len(_ALL_CAPS.findall(self.text))
+
+
+def _first_nonblank_lines(text: str, n: int) -> List[str]:
+    """First n non-blank stripped lines, without splitting the whole text."""
+    size = 4096
+    while True:
+        parts = text[:size].splitlines()
+        if size < len(text):
+            parts = parts[:-1]  # may be cut mid-line
+        lines = [ln for ln in (p.strip() for p in parts) if ln]
+        if len(lines) >= n or size >= len(text):
+            return lines[:n]
+        size *= 4
+
+
+def _as_doc(text: Union[str, AnalyzedResume]) -> AnalyzedResume:
+    return text if isinstance(text, AnalyzedResume) else AnalyzedResume(text)
+
+
 # -------------------------------------------------
 # SECTION DETECTION
 # -------------------------------------------------
 
-def detect_sections(text: str) -> Dict[str, bool]:
-    if not text:
-        return {k: False for k in SECTION_HINTS}
+class _SectionDetector:
+    """
+    SECTION_HINTS compiled into one header lookup table and one regex.
+
+    The regex is a zero-width lookahead over every distinct hint, factored
+    into a character trie, so a single left-to-right scan reports hits at
+    every position, including hints that overlap. When several hints match
+    at the same position the trie reports the longest; the shorter ones are
+    exactly its word-boundary prefixes, which are precomputed per hint.
+    """
 
-    text_lower = text.lower()
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    presence = {}
+    def __init__(self, hints_table: Dict[str, List[str]]):
+        self.sections = list(hints_table)
 
-    for sec, hints in SECTION_HINTS.items():
-        found = False
+        # header line -> sections it names
+        self.header_lookup: Dict[str, set] = {}
+        hint_sections: Dict[str, set] = {}
+        for sec, hints in hints_table.items():
+            self.header_lookup.setdefault(sec, set()).add(sec)
+            for h in hints:
+                self.header_lookup.setdefault(h, set()).add(sec)
+                hint_sections.setdefault(h, set()).add(sec)
+
+        # matched hint -> sections it (and any hint it implies) belongs to
+        self.hit_sections: Dict[str, set] = {}
+        for h in hint_sections:
+            secs = set(hint_sections[h])
+            for shorter in hint_sections:
+                if len(shorter) < len(h) and h.startswith(shorter) and _boundary_at(h, len(shorter)):
+                    secs |= hint_sections[shorter]
+            self.hit_sections[h] = secs
+
+        self.max_hint_len = max(map(len, hint_sections), default=0)
+        self.pattern = None
+        if hint_sections:
+            self.pattern = re.compile(r"(?=\b(" + _trie_regex(hint_sections) + r")\b)")
+
+    def header_hits(self, header_candidates: List[str]) -> set:
+        hits = set()
+        lookup = self.header_lookup
+        for ln_norm in header_candidates:
+            secs = lookup.get(ln_norm)
+            if secs:
+                hits |= secs
+        return hits
 
-        # 1) Explicit headers near top
-        for ln in lines[:60]:
-            ln_norm = ln.lower().rstrip(":")
-            if ln_norm == sec or ln_norm in hints:
-                found = True
+    def hint_hits(self, text_lower: str, wanted: set) -> set:
+        """Sections in `wanted` with a hint somewhere in the text."""
+        hits = set()
+        if self.pattern is None or not wanted:
+            return hits
+        sections = self.hit_sections
+        for m in self.pattern.finditer(text_lower):
+            hits |= sections[m.group(1)]
+            if wanted <= hits:
                 break
+        return hits & wanted
 
-        # 2) Keyword presence fallback
-        if not found:
-            for h in hints:
-                if re.search(r"\b" + re.escape(h) + r"\b", text_lower):
-                    found = True
-                    break
 
-        # 3) Heuristic fallbacks
-        if not found:
-            if sec == "experience":
-                if re.search(r"\b(develop|built|worked|engineer|implemented|\d+\s+years?)\b", text_lower):
-                    found = True
-            elif sec == "education":
-                if re.search(r"\b(bachelor|master|degree|gpa|percentage)\b", text_lower):
-                    found = True
-            elif sec == "skills":
-                tokens = re.findall(r"[A-Za-z0-9\+\#\./-]{2,}", text)
-                if len(set(tokens)) > 8:
-                    found = True
+def _trie_regex(words) -> str:
+    """
+    Alternation of `words` factored by common prefix. Optional tails are
+    greedy, so the longest word that matches at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return emit(trie)
+
+
+def _boundary_at(s: str, i: int) -> bool:
+    """Whether regex \\b holds at index i of s (0 < i < len(s))."""
+    return (s[i - 1].isalnum() or s[i - 1] == "_") != (s[i].isalnum() or s[i] == "_")
+
+
+_detector_cache: Dict[str, object] = {"key": None, "detector": None}
 
-        presence[sec] = found
 
-    return presence
+def _section_detector() -> _SectionDetector:
+    """
+    Detector for the current SECTION_HINTS. The table may be edited at
+    runtime (new sections or hints); it is recompiled on the next call.
+    """
+    key = tuple((sec, tuple(hints)) for sec, hints in SECTION_HINTS.items())
+    if _detector_cache["key"] != key:
+        _detector_cache["detector"] = _SectionDetector(SECTION_HINTS)
+        _detector_cache["key"] = key
+    return _detector_cache["detector"]
+
+
+def register_section_hints(section: str, hints: List[str]):
+    """Add a section (or extra hints for an existing one) to SECTION_HINTS."""
+    current = SECTION_HINTS.setdefault(section, [])
+    current.extend(h.lower() for h in hints if h and h.lower() not in current)
+
+
+def _heuristic_section(sec: str, doc: AnalyzedResume) -> bool:
+    if sec == "experience":
+        return bool(_EXPERIENCE_HINT.search(doc.lower))
+    if sec == "education":
+        return bool(_EDUCATION_HINT.search(doc.lower))
+    if sec == "skills":
+        return len(set(doc.tokens)) > 8
+    return False
+
+
+def detect_sections(text: Union[str, AnalyzedResume]) -> Dict[str, bool]:
+    detector = _section_detector()
+    doc = _as_doc(text)
+    if not doc.text:
+        return {k: False for k in detector.sections}
+
+    # 1) Explicit headers near top
+    found = detector.header_hits(doc.header_candidates)
+
+    # 2) Keyword presence fallback (one scan for every remaining section)
+    found |= detector.hint_hits(doc.lower, set(detector.sections) - found)
+
+    # 3) Heuristic fallbacks
+    return {
+        sec: sec in found or _heuristic_section(sec, doc)
+        for sec in detector.sections
+    }
 
 
 # -------------------------------------------------
 # KEYWORD MATCHING
 # -------------------------------------------------
 
-def keyword_match_rate(text: str, skills: List[str]) -> float:
-    if not text or not skills:
+def keyword_match_rate(
+    text: Union[str, AnalyzedResume],
+    skills: Union[List[str], SkillMatcher],
+) -> float:
+    """
+    Fraction of required skills found in the resume. Skills are matched on
+    normalized token boundaries in one pass (see skill_matcher).
+    """
+    doc = _as_doc(text)
+    if not doc.text or not skills:
         return 0.0
 
-    text_norm = normalize_token(text)
-    skills_norm = {normalize_token(s) for s in skills if s}
-
-    if not skills_norm:
+    matcher = get_skill_matcher(skills)
+    if not len(matcher):
         return 0.0
 
-    matched = sum(1 for s in skills_norm if s and s in text_norm)
-    return matched / len(skills_norm)
+    matched = matcher.matched(doc.normalized_tokens)
+    return len(matched) / len(matcher)
+
+
+def keyword_matches(
+    text: Union[str, AnalyzedResume],
+    skills: Union[List[str], SkillMatcher],
+) -> Dict[str, List[Tuple[int, int]]]:
+    """Matched normalized skills with their (start, end) offsets in the text."""
+    doc = _as_doc(text)
+    if not doc.text or not skills:
+        return {}
+    return get_skill_matcher(skills).find_in_tokens(doc.normalized_tokens, doc.token_spans)
 
 
 # -------------------------------------------------
 # QUANTIFICATION SIGNAL
 # -------------------------------------------------
 
-def quantify_bullets_ratio(text: str) -> float:
-    if not text:
+def quantify_bullets_ratio(text: Union[str, AnalyzedResume]) -> float:
+    doc = _as_doc(text)
+    if not doc.text:
         return 0.0
 
-    nums = len(re.findall(r"\b\d+(\.\d+)?%?\b", text))
-    bullets = len(re.findall(r"(^\s*[-•*])", text, flags=re.MULTILINE))
-    sentences = max(1, len(re.findall(r"[.!?]", text)))
+    sentences = max(1, len(doc.sentences) - 1)
 
-    quantified = nums + bullets
+    quantified = doc.number_count + len(doc.bullet_positions)
     return min(1.0, quantified / (sentences * 0.6))
 
 
@@ -105,18 +326,16 @@ def quantify_bullets_ratio(text: str) -> float:
 # FORMATTING HEURISTICS
 # -------------------------------------------------
 
-def formatting_penalty(text: str) -> float:
-    if not text:
+def formatting_penalty(text: Union[str, AnalyzedResume]) -> float:
+    doc = _as_doc(text)
+    if not doc.text:
         return 0.0
 
-    words = text.split()
-    all_caps = len(re.findall(r"\b[A-Z]{3,}\b", text))
-    long_sentences = sum(
-        1 for s in re.split(r"[.!?]", text) if len(s.split()) > 35
-    )
+    counts = doc.sentence_word_counts
+    long_sentences = sum(1 for n in counts if n > 35)
 
-    caps_ratio = all_caps / max(1, len(words))
-    long_ratio = long_sentences / max(1, len(re.split(r"[.!?]", text)))
+    caps_ratio = doc.all_caps_count / max(1, len(doc.words))
+    long_ratio = long_sentences / max(1, len(counts))
 
     penalty = (caps_ratio * 0.15) + (long_ratio * 0.15)
     return min(0.15, penalty)
@@ -126,9 +345,62 @@ def formatting_penalty(text: str) -> float:
 # READABILITY
 # -------------------------------------------------
 
-def readability_score(text: str) -> float:
+# Flesch reading ease from the shared tokenization. Word, sentence and
+# syllable counting and the intermediate rounding follow textstat 0.7.x
+# (pyphen en_US syllables), so scores equal its flesch_reading_ease.
+# textstat releases that count syllables with CMUdict instead usually
+# differ by less than 5 points (see benchmarks/bench_readability.py).
+
+SYLLABLE_CACHE_SIZE = int(os.getenv("ATS_SYLLABLE_CACHE_SIZE", "100000"))
+
+_PUNCT = re.compile(r"[^\w\s]")
+_hyphenator = pyphen.Pyphen(lang="en_US")
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def word_syllables(word: str) -> int:
+    """Syllables in one whitespace-delimited word (punctuation ignored)."""
+    word = _PUNCT.sub("", word.lower())
+    if not word:
+        return 0
+    count = SYLLABLE_SEED.get(word)
+    if count is None:
+        count = len(_hyphenator.positions(word)) + 1
+    return count
+
+
+def _legacy_round(x: float, points: int) -> float:
+    # textstat rounds half away from zero
+    p = 10 ** points
+    return float(math.floor(x * p + math.copysign(0.5, x))) / p
+
+
+def _lexicon_count(syllables: List[int]) -> int:
+    # words made only of punctuation have no syllables and are not counted
+    return len(syllables) - syllables.count(0)
+
+
+def _flesch_counts(doc: AnalyzedResume) -> Tuple[int, int, int]:
+    """(words, sentences, syllables) as textstat counts them."""
+    per_word = doc.word_syllables
+    # sentences of one or two words (headers, contact lines) are ignored
+    sentences = sum(
+        1 for seg in doc.sentences
+        if _lexicon_count(list(map(word_syllables, seg.split()))) > 2
+    )
+    return _lexicon_count(per_word), sentences, sum(per_word)
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    sentence_length = _legacy_round(words / max(1, sentences), 1)
+    syllables_per_word = _legacy_round(syllables / words, 1) if words else 0.0
+    return _legacy_round(206.835 - 1.015 * sentence_length - 84.6 * syllables_per_word, 2)
+
+
+def readability_score(text: Union[str, AnalyzedResume]) -> float:
+    doc = _as_doc(text)
     try:
-        score = textstat.flesch_reading_ease(text)
+        score = flesch_reading_ease(*_flesch_counts(doc))
         return max(0.0, min(100.0, score))
     except Exception:
         return 50.0
@@ -142,17 +414,37 @@ def ats_score(text: str, required_skills: List[str]) -> Tuple[float, Dict]:
     if not text:
         return 0.0, {"error": "Empty resume text"}
 
-    # ---- Signals ----
-    sections = detect_sections(text)
-    coverage = sum(1 for v in sections.values() if v) / len(sections)
+    # ---- Signals (one shared analysis) ----
+    doc = AnalyzedResume(text)
+    sections = detect_sections(doc)
+    keyword_rate = keyword_match_rate(doc, required_skills)
+    quantify = quantify_bullets_ratio(doc)
+    read = readability_score(doc)
+    penalty = formatting_penalty(doc)
 
-    keyword_rate = keyword_match_rate(text, required_skills)
-    quantify = quantify_bullets_ratio(text)
+    return _combine_signals(sections, keyword_rate, quantify, read, penalty)
 
-    read = readability_score(text)
-    read_norm = max(0.0, min(1.0, (read - 30) / 70))
 
-    penalty = formatting_penalty(text)
+def _combine_signals(
+    sections: Union[Dict[str, bool], np.ndarray],
+    keyword_rate,
+    quantify,
+    read,
+    penalty,
+) -> Tuple[object, Dict]:
+    """
+    Weighted score and detail breakdown. `sections` is a {section: bool}
+    dict for one resume, or a bool (resume x section) matrix for a batch,
+    in which case the other signals are arrays and every value returned
+    is an array too (see ats_score_batch).
+    """
+    if isinstance(sections, np.ndarray):
+        coverage = sections.sum(axis=1) / sections.shape[1]
+        clip, rnd = np.clip, _round_column
+    else:
+        coverage = sum(1 for v in sections.values() if v) / len(sections)
+        clip, rnd = _clip, round
+    read_norm = clip((read - 30) / 70, 0.0, 1.0)
 
     # ---- Weighted score (0..1) ----
     score_01 = (
@@ -162,17 +454,843 @@ def ats_score(text: str, required_skills: List[str]) -> Tuple[float, Dict]:
         0.20 * read_norm
     )
 
-    score_01 = max(0.0, min(1.0, score_01 - penalty))
-    score_100 = round(score_01 * 100, 1)
+    score_01 = clip(score_01 - penalty, 0.0, 1.0)
+    score_100 = rnd(score_01 * 100, 1)
 
     # ---- Detailed breakdown ----
     detail = {
         "sections_detected": sections,
-        "section_coverage": round(coverage, 3),
-        "keyword_match_rate": round(keyword_rate, 3),
-        "quantification_signal": round(quantify, 3),
-        "readability": round(read, 1),
-        "formatting_penalty": round(penalty, 3),
+        "section_coverage": rnd(coverage, 3),
+        "keyword_match_rate": rnd(keyword_rate, 3),
+        "quantification_signal": rnd(quantify, 3),
+        "readability": rnd(read, 1),
+        "formatting_penalty": rnd(penalty, 3),
     }
 
     return score_100, detail
+
+
+def _clip(x: float, lo: float, hi: float) -> float:
+    return max(lo, min(hi, x))
+
+
+def _round_column(col: np.ndarray, digits: int) -> np.ndarray:
+    # Python round() rather than np.round, which can differ in the last digit
+    return np.array([round(v, digits) for v in col.tolist()], dtype=np.float64)
+
+
+# -------------------------------------------------
+# BATCH SCORING
+# -------------------------------------------------
+
+# Apart from bullets (line starts) and the "<n> years" experience hint,
+# every pattern behind the ATS signals matches inside one whitespace-
+# delimited word, so a resume's counts are sums over its words. A batch
+# evaluates each distinct word once and sums per resume with NumPy.
+
+_BULLET_CHARS = frozenset("-•*")
+
+
+class _BatchVocabulary:
+    """
+    Distinct whitespace-delimited words of a batch and their counts.
+    Word 0 is an empty sentinel put in front of every resume, so each
+    resume has at least one word and opens a sentence segment.
+
+    Per-word columns: syllables; number / all-caps matches; a bitmask of
+    the sections its hints name plus the education / experience
+    heuristics; its sentence pieces (split at [.!?]) with whether each is
+    a word and has syllables; its tech tokens; its normalized tokens, the
+    skills they match inside the word, and the skills a match may still
+    complete in the following words (with the character it needs next).
+    """
+
+    def __init__(self, detector: _SectionDetector, matcher: SkillMatcher):
+        self.detector = detector
+        self.sections = set(detector.sections)
+        self.section_bits = np.array([1 << b for b in range(len(detector.sections))], dtype=np.int64)
+        self.education_bit = 1 << len(detector.sections)
+        self.experience_bit = self.education_bit << 1
+        # hints containing whitespace can only match across words
+        self.spanning_hints = [(h, secs) for h, secs in detector.hit_sections.items() if len(h.split()) > 1]
+        # a header line naming a hint that starts and ends on a word
+        # character is also a hint match; only the other headers need a scan
+        self.header_only = set()
+        for key, secs in detector.header_lookup.items():
+            if key not in detector.hit_sections or not re.match(r"\w(.*\w)?$", key, re.S):
+                self.header_only |= secs
+
+        self.skills = list(matcher.skills)
+        self.skill_col = {sk: j for j, sk in enumerate(self.skills)}
+        self.skill_starts: Dict[str, List[int]] = {}
+        for sk, j in self.skill_col.items():
+            for k in range(1, len(sk)):
+                self.skill_starts.setdefault(sk[:k], []).append(j)
+
+        self.index: Dict[str, int] = {}
+        self.columns: Dict[str, list] = {name: [] for name in (
+            "syllables", "numbers", "all_caps", "bits", "piece_offset", "pieces",
+            "first_char", "skill_offset", "n_skills", "candidate_offset", "n_candidates",
+        )}
+        self.piece_word: List[bool] = []
+        self.piece_lexicon: List[bool] = []
+        self.skill_ids: List[int] = []
+        self.candidate_ids: List[int] = []
+        self.candidate_need: List[int] = []
+        self.tokens: List[Tuple[str, ...]] = []
+        self.norm_tokens: List[Tuple[str, ...]] = []
+        self._add("")
+
+    def add(self, words: List[str]) -> List[str]:
+        for word in set(words).difference(self.index):
+            self._add(word)
+        return words
+
+    def _add(self, word: str):
+        col = self.columns
+        self.index[word] = len(self.tokens)
+        lower = word.lower()
+
+        hit = self.detector.hint_hits(lower, self.sections)
+        bits = sum(1 << b for b, sec in enumerate(self.detector.sections) if sec in hit)
+        if _EDUCATION_HINT.search(lower):
+            bits |= self.education_bit
+        if _EXPERIENCE_HINT.search(lower):
+            bits |= self.experience_bit
+        col["bits"].append(bits)
+
+        col["syllables"].append(word_syllables(word))
+        col["numbers"].append(len(_NUMBER.findall(word)))
+        col["all_caps"].append(len(_ALL_CAPS.findall(word)))
+
+        pieces = _SENTENCE_END.split(word)
+        col["piece_offset"].append(len(self.piece_word))
+        col["pieces"].append(len(pieces))
+        self.piece_word.extend(bool(p) for p in pieces)
+        self.piece_lexicon.extend(word_syllables(p) != 0 for p in pieces)
+
+        norms = tuple(t for t in map(normalize_token, TOKEN_PATTERN.findall(word)) if t)
+        skills, candidates = self._word_skills(norms)
+        col["first_char"].append(ord(norms[0][0]) if norms else -1)
+        col["skill_offset"].append(len(self.skill_ids))
+        col["n_skills"].append(len(skills))
+        self.skill_ids.extend(skills)
+        col["candidate_offset"].append(len(self.candidate_ids))
+        col["n_candidates"].append(len(candidates))
+        for j, need in candidates:
+            self.candidate_ids.append(j)
+            self.candidate_need.append(ord(need))
+
+        self.tokens.append(tuple(_TOKEN.findall(word)))
+        self.norm_tokens.append(norms)
+
+    def _word_skills(self, norms: Tuple[str, ...]) -> Tuple[set, set]:
+        """
+        Skill columns matched by one token or a run of the word's tokens,
+        and (column, next character) for runs reaching the end of the word
+        as a proper prefix of the skill.
+        """
+        skills, candidates = set(), set()
+        for t, tok in enumerate(norms):
+            if tok in self.skill_col:
+                skills.add(self.skill_col[tok])
+            for j in self.skill_starts.get(tok, ()):
+                skill, joined = self.skills[j], tok
+                for nxt in norms[t + 1:]:
+                    joined += nxt
+                    if len(joined) >= len(skill):
+                        break
+                if joined == skill:
+                    skills.add(j)
+                elif len(joined) < len(skill) and skill.startswith(joined):
+                    candidates.add((j, skill[len(joined)]))
+        return skills, candidates
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        out = {name: np.array(values, dtype=np.int64) for name, values in self.columns.items()}
+        out["piece_word"] = np.array(self.piece_word, dtype=bool)
+        out["piece_lexicon"] = np.array(self.piece_lexicon, dtype=bool)
+        out["skill_ids"] = np.array(self.skill_ids, dtype=np.int64)
+        out["candidate_ids"] = np.array(self.candidate_ids, dtype=np.int64)
+        out["candidate_need"] = np.array(self.candidate_need, dtype=np.int64)
+        return out
+
+
+def _ragged_take(offsets: np.ndarray, counts: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of the items of `rows` in a ragged table (row r holds
+    [offsets[r], offsets[r] + counts[r])) in order, and each row's count.
+    """
+    c = counts[rows]
+    first = np.cumsum(c) - c
+    return np.repeat(offsets[rows], c) + (np.arange(int(c.sum())) - np.repeat(first, c)), c
+
+
+def _joins_into(tokens: List[Tuple[str, ...]], ids: List[int], p: int, end: int, skill: str) -> bool:
+    """
+    Whether consecutive normalized tokens, starting at one of word ids[p]'s
+    and running on through the words before `end`, concatenate to `skill`
+    (the matcher's multi-token match, e.g. "node" "js" -> "nodejs").
+    """
+    first = tokens[ids[p]]
+    for t in range(len(first)):
+        joined, rest, q = "", first[t:], p
+        while len(joined) < len(skill):
+            if rest:
+                joined += rest[0]
+                rest = rest[1:]
+                if not skill.startswith(joined):
+                    break
+            elif q + 1 < end:
+                q += 1
+                rest = tokens[ids[q]]
+            else:
+                break
+        if joined == skill:
+            return True
+    return False
+
+
+def ats_score_batch(texts: List[str], required_skills: List[str]) -> Dict[str, object]:
+    """
+    Score many resumes against one skill list. Returns columns rather
+    than one dict per resume:
+
+        score, section_coverage, keyword_match_rate, quantification_signal,
+        readability, formatting_penalty   float arrays, rounded like ats_score
+        sections          bool matrix (resume x section_names)
+        keyword_hits      CSR bool matrix (resume x skills)
+        empty             bool mask of resumes with no text (all zeros)
+
+    Row i equals ats_score(texts[i], required_skills). Each resume is
+    split into words once; word-level signals are computed once per
+    distinct word of the batch and summed per resume with array
+    reductions, and identical texts are analyzed once. Only resumes that
+    still miss a section after the word-level hints run the header,
+    multi-word hint and heuristic checks.
+    """
+    detector = _section_detector()
+    matcher = get_skill_matcher(required_skills or [])
+    n = len(texts)
+
+    empty = np.zeros(n, dtype=bool)
+    source = np.arange(n)
+    first_row: Dict[str, int] = {}
+    rows: List[int] = []  # first occurrence of each distinct non-empty text
+    for i, text in enumerate(texts):
+        if not text:
+            empty[i] = True
+            continue
+        j = first_row.setdefault(text, i)
+        if j != i:
+            source[i] = j
+        else:
+            rows.append(i)
+
+    vocab = _BatchVocabulary(detector, matcher)
+    doc_words = [vocab.add(texts[i].split()) for i in rows]
+    m = len(rows)
+
+    counts = np.zeros((n, 9), dtype=np.int64)
+    sections = np.zeros((n, len(detector.sections)), dtype=bool)
+    hits = sparse.csr_matrix((n, len(matcher)), dtype=bool)
+    if m:
+        hits, sections_m, counts_m = _score_words(vocab, rows, doc_words, [texts[i] for i in rows], n)
+        sections[rows] = sections_m
+        counts[rows] = counts_m
+
+    keyword_hits = hits[source]
+    sections, counts = sections[source], counts[source]
+    (words, lexicon, syllables, numbers, all_caps, bullets,
+     segments, long_segments, read_sentences) = counts.T
+
+    # ---- Signals, same arithmetic as the per-resume functions ----
+    read = np.array([
+        _clip(flesch_reading_ease(*c), 0.0, 100.0) if not e else 0.0
+        for c, e in zip(zip(lexicon.tolist(), read_sentences.tolist(), syllables.tolist()), empty.tolist())
+    ], dtype=np.float64)
+    keyword_rate = np.asarray(keyword_hits.sum(axis=1), dtype=np.float64).ravel() / max(1, len(matcher))
+    quantify = np.minimum(1.0, (numbers + bullets) / (np.maximum(1, segments - 1) * 0.6))
+    penalty = np.minimum(
+        0.15,
+        (all_caps / np.maximum(1, words)) * 0.15 + (long_segments / np.maximum(1, segments)) * 0.15,
+    )
+    score, detail = _combine_signals(sections, keyword_rate, quantify, read, penalty)
+
+    result: Dict[str, object] = {"score": score}
+    result.update(detail)
+    result.update({
+        "sections": result.pop("sections_detected"),
+        "section_names": list(detector.sections),
+        "keyword_hits": keyword_hits,
+        "skills": list(matcher.skills),
+        "empty": empty,
+    })
+    return result
+
+
+def _score_words(
+    vocab: _BatchVocabulary,
+    rows: List[int],
+    doc_words: List[List[str]],
+    doc_texts: List[str],
+    n: int,
+) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Keyword hits (n x skills, filled at `rows`), sections and the count
+    columns of ats_score_batch for the distinct resumes, in `rows` order.
+    """
+    m = len(rows)
+    get = vocab.index.__getitem__
+    lengths = np.fromiter((len(w) + 1 for w in doc_words), dtype=np.int64, count=m)
+    flat = np.fromiter(
+        chain.from_iterable(chain((0,), map(get, w)) for w in doc_words),
+        dtype=np.int64, count=int(lengths.sum()),
+    )
+    starts = np.cumsum(lengths) - lengths
+    word_doc = np.repeat(np.arange(m), lengths)
+    table = vocab.arrays()
+
+    def total(column: str) -> np.ndarray:
+        return np.add.reduceat(table[column][flat], starts)
+
+    # ---- sentence segments: [.!?] splits words into pieces ----
+    piece, n_pieces = _ragged_take(table["piece_offset"], table["pieces"], flat)
+    first_piece = np.cumsum(n_pieces) - n_pieces
+    new_segment = np.ones(len(piece), dtype=bool)
+    new_segment[first_piece] = False  # a word's first piece continues the segment
+    new_segment[first_piece[starts]] = True  # each resume opens one
+    segment = np.cumsum(new_segment) - 1
+    segment_words = np.bincount(segment, weights=table["piece_word"][piece])
+    segment_lexicon = np.bincount(segment, weights=table["piece_lexicon"][piece])
+    segment_doc = np.repeat(word_doc, n_pieces)[new_segment]
+
+    counts = np.stack([
+        lengths - 1,
+        np.add.reduceat((table["syllables"] != 0)[flat], starts),
+        total("syllables"),
+        total("numbers"),
+        total("all_caps"),
+        [sum(1 for ln in t.split("\n") if ln.lstrip()[:1] in _BULLET_CHARS) for t in doc_texts],
+        np.bincount(segment_doc, minlength=m),
+        np.bincount(segment_doc, weights=segment_words > 35, minlength=m),
+        np.bincount(segment_doc, weights=segment_lexicon > 2, minlength=m),
+    ], axis=1).astype(np.int64)
+
+    # ---- sections: word-level hints, the rest only where still missing ----
+    bits = np.bitwise_or.reduceat(table["bits"][flat], starts)
+    sections = (bits[:, None] & vocab.section_bits[None, :]) != 0
+    for k in np.flatnonzero(~sections.all(axis=1)).tolist():
+        sections[k] = _remaining_sections(vocab, doc_texts[k], doc_words[k], int(bits[k]), sections[k])
+
+    # ---- keyword hits: matches inside a word, then runs into the next words ----
+    pos_hits, n_skills = _ragged_take(table["skill_offset"], table["n_skills"], flat)
+    hit_doc = np.repeat(word_doc, n_skills)
+    shape = (m, len(vocab.skills))
+    hits = sparse.csr_matrix(
+        (np.ones(len(pos_hits), dtype=bool), (hit_doc, table["skill_ids"][pos_hits])), shape=shape,
+    ).astype(bool)
+
+    pos, n_candidates = _ragged_take(table["candidate_offset"], table["n_candidates"], flat)
+    candidate_word = np.repeat(np.arange(len(flat)), n_candidates)
+    candidate_skill = table["candidate_ids"][pos]
+    candidate_doc = word_doc[candidate_word]
+    # the next word must start with the missing character (or have no tokens)
+    next_char = table["first_char"][np.append(flat, 0)[candidate_word + 1]]
+    skill_count = len(vocab.skills)
+    pending = ((next_char == table["candidate_need"][pos]) | (next_char < 0)) & ~np.isin(
+        candidate_doc * skill_count + candidate_skill,
+        hit_doc * skill_count + table["skill_ids"][pos_hits],
+    )
+    found = set()
+    ids, ends = flat.tolist(), (starts + lengths).tolist()
+    for k, p, j in zip(*(a[pending].tolist() for a in (candidate_doc, candidate_word, candidate_skill))):
+        if (k, j) not in found and _joins_into(vocab.norm_tokens, ids, p, ends[k], vocab.skills[j]):
+            found.add((k, j))
+    if found:
+        found_rows, found_cols = zip(*found)
+        hits = hits + sparse.csr_matrix(
+            (np.ones(len(found), dtype=bool), (found_rows, found_cols)), shape=shape,
+        )
+
+    # scatter to batch rows
+    hits = hits.tocoo()
+    hits = sparse.csr_matrix(
+        (np.ones(hits.nnz, dtype=bool), (np.asarray(rows)[hits.row], hits.col)),
+        shape=(n, len(vocab.skills)),
+    )
+    return hits, sections, counts
+
+
+def _remaining_sections(
+    vocab: _BatchVocabulary,
+    text: str,
+    words: List[str],
+    bits: int,
+    found_row: np.ndarray,
+) -> List[bool]:
+    """detect_sections for one resume, given the sections its word-level hints found."""
+    detector = vocab.detector
+    found = {sec for sec, hit in zip(detector.sections, found_row.tolist()) if hit}
+    if vocab.header_only - found:
+        found |= detector.header_hits([ln.lower().rstrip(":") for ln in _first_nonblank_lines(text, 60)])
+    missing = vocab.sections - found
+
+    lower = None
+    if any(secs & missing for _, secs in vocab.spanning_hints):
+        lower = text.lower()
+        if any(secs & missing and h in lower for h, secs in vocab.spanning_hints):
+            found |= detector.hint_hits(lower, missing)
+
+    out = []
+    for sec in detector.sections:
+        if sec in found:
+            out.append(True)
+        elif sec == "experience":
+            # "<n> years" spans two words
+            out.append(bool(bits & vocab.experience_bit) or bool(
+                _EXPERIENCE_HINT.search(text.lower() if lower is None else lower)
+            ))
+        elif sec == "education":
+            out.append(bool(bits & vocab.education_bit))
+        elif sec == "skills":
+            ids = map(vocab.index.__getitem__, words)
+            out.append(len(set(chain.from_iterable(map(vocab.tokens.__getitem__, ids)))) > 8)
+        else:
+            out.append(False)
+    return out
+
+
+# -------------------------------------------------
+# STREAMING (PAGE-BY-PAGE) SCORING
+# -------------------------------------------------
+
+# characters of a page carried into the next page's section scan (at
+# least the longest hint): enough for a hint or "<n> years" phrase
+_PAGE_TAIL_CHARS = 64
+
+
+def _text_tail(text: str, n: int) -> str:
+    """Last ~n characters of text, starting on a word boundary."""
+    if len(text) <= n:
+        return text
+    tail = text[-n:]
+    m = re.search(r"\W", tail)
+    return tail[m.start():] if m else ""
+
+
+class StreamingATSScorer:
+    """
+    Accumulates ATS signals one page at a time, keeping only counters
+    (never the full text), so a partial score is available after every
+    page. Pages are treated as if joined with a newline.
+
+    Section, keyword, quantification and formatting signals match
+    `ats_score` on the joined text. Readability is computed from summed
+    per-page word/sentence/syllable counts, so a sentence split by a page
+    break can make it drift slightly from the whole-document score.
+    """
+
+    def __init__(self, required_skills: List[str]):
+        self.matcher = get_skill_matcher(required_skills or [])
+        self._skills_left = set(self.matcher.skills)
+        # trailing tokens of the previous page, so skills split across a
+        # page boundary still match
+        self._max_skill_len = max((len(s) for s in self.matcher.skills), default=0)
+        self._tail_tokens: List[str] = []
+        # end of the previous page's lowercased text, so section hints and
+        # "<n> years" split across a page boundary are still seen
+        self._tail_lower = ""
+
+        self.pages = 0
+        self.sections = {k: False for k in _section_detector().sections}
+        self._header_lines_seen = 0
+        self._skill_tokens = set()
+
+        self._nums = 0
+        self._bullets = 0
+        self._sentence_marks = 0
+
+        self._words = 0
+        self._all_caps = 0
+        self._segments = 0
+        self._long_segments = 0
+        self._open_segment_words = 0
+
+        self._lex_words = 0
+        self._syllables = 0
+        self._sentences = 0
+
+    def add_page(self, page_text: str):
+        if not page_text:
+            return
+        self.pages += 1
+        doc = AnalyzedResume(page_text)
+        self._update_sections(doc)
+        self._update_keywords(doc)
+
+        self._nums += doc.number_count
+        self._bullets += len(doc.bullet_positions)
+        self._sentence_marks += len(doc.sentences) - 1
+
+        self._words += len(doc.words)
+        self._all_caps += doc.all_caps_count
+
+        # the first segment continues the last unterminated one
+        counts = list(doc.sentence_word_counts)
+        counts[0] += self._open_segment_words
+        self._segments += len(counts) - 1
+        self._long_segments += sum(1 for n in counts[:-1] if n > 35)
+        self._open_segment_words = counts[-1]
+
+        words, sentences, syllables = _flesch_counts(doc)
+        self._lex_words += words
+        self._sentences += sentences
+        self._syllables += syllables
+
+    def _update_sections(self, doc: AnalyzedResume):
+        top = doc.header_candidates[:max(0, 60 - self._header_lines_seen)]
+        self._header_lines_seen += len(top)
+
+        if len(self._skill_tokens) <= 8:
+            self._skill_tokens.update(doc.tokens)
+
+        detector = _section_detector()
+        pending = {sec for sec in detector.sections if not self.sections.get(sec)}
+        if not pending:
+            return
+
+        lower = self._tail_lower + doc.lower
+        self._tail_lower = _text_tail(doc.lower, max(_PAGE_TAIL_CHARS, detector.max_hint_len + 1)) + "\n"
+
+        found = detector.header_hits(top) & pending
+        found |= detector.hint_hits(lower, pending - found)
+
+        for sec in pending:
+            if sec in found:
+                self.sections[sec] = True
+            elif sec == "experience":
+                self.sections[sec] = bool(_EXPERIENCE_HINT.search(lower))
+            elif sec == "education":
+                self.sections[sec] = bool(_EDUCATION_HINT.search(lower))
+            elif sec == "skills":
+                self.sections[sec] = len(self._skill_tokens) > 8
+            else:
+                self.sections[sec] = False
+
+    def _update_keywords(self, doc: AnalyzedResume):
+        if not self._skills_left:
+            return
+        tokens = self._tail_tokens + doc.normalized_tokens
+        self._skills_left -= self.matcher.matched(tokens)
+
+        tail: List[str] = []
+        size = 0
+        for tok in reversed(tokens):
+            size += len(tok)
+            if size >= self._max_skill_len:
+                break
+            tail.append(tok)
+        self._tail_tokens = tail[::-1]
+
+    def score(self) -> Tuple[float, Dict]:
+        """Score for the pages seen so far."""
+        if not self.pages:
+            return 0.0, {"error": "Empty resume text"}
+
+        keyword_rate = 0.0
+        if len(self.matcher):
+            keyword_rate = 1 - len(self._skills_left) / len(self.matcher)
+
+        sentences = max(1, self._sentence_marks)
+        quantify = min(1.0, (self._nums + self._bullets) / (sentences * 0.6))
+
+        segments = self._segments + 1
+        long_segments = self._long_segments + (self._open_segment_words > 35)
+        caps_ratio = self._all_caps / max(1, self._words)
+        long_ratio = long_segments / segments
+        penalty = min(0.15, (caps_ratio * 0.15) + (long_ratio * 0.15))
+
+        if self._lex_words:
+            read = flesch_reading_ease(self._lex_words, self._sentences, self._syllables)
+            read = max(0.0, min(100.0, read))
+        else:
+            read = 50.0
+
+        score_100, detail = _combine_signals(
+            dict(self.sections), keyword_rate, quantify, read, penalty
+        )
+        detail["pages_scored"] = self.pages
+        return score_100, detail
+
+
+def ats_score_stream(
+    pages: Iterable[str],
+    required_skills: List[str],
+    max_pages: Optional[int] = None,
+) -> Iterator[Tuple[float, Dict]]:
+    """
+    Consume a page stream (e.g. `resume_parser.iter_text_pages`) and yield
+    the partial (score, detail) after each page. Stops once `max_pages`
+    pages have been scored.
+    """
+    scorer = StreamingATSScorer(required_skills)
+    for page_text in pages:
+        if max_pages is not None and scorer.pages >= max_pages:
+            break
+        scorer.add_page(page_text)
+        yield scorer.score()
+
+
+# -------------------------------------------------
+# INCREMENTAL RESCORING
+# -------------------------------------------------
+
+class _LineStats(NamedTuple):
+    """Partial ATS signals of one "\n"-delimited line."""
+    headers: List[str]
+    hint_sections: FrozenSet[str]
+    education_hint: bool
+    experience_hint: bool
+    tokens: FrozenSet[str]
+    norm_tokens: List[str]
+    skills: FrozenSet[str]
+    # first / last token occurs inside some skill, so a skill may
+    # continue across the line break
+    open_left: bool
+    open_right: bool
+    numbers: int
+    bullet: bool
+    words: int
+    all_caps: int
+    lexicon: int
+    syllables: int
+    # sentence pieces between [.!?]: the first and last ones continue
+    # across line breaks, the inner ones are complete sentences
+    marks: int
+    first_words: int
+    last_words: int
+    inner_long: int
+    first_lexicon: int
+    last_lexicon: int
+    inner_sentences: int
+
+
+_LINE_FIELD = {name: itemgetter(i) for i, name in enumerate(_LineStats._fields)}
+
+
+def _line_stats(line: str, detector: _SectionDetector, matcher: SkillMatcher, skills_blob: str) -> _LineStats:
+    lower = line.lower()
+
+    hint_sections = set()
+    if detector.pattern is not None:
+        for m in detector.pattern.finditer(lower):
+            hint_sections |= detector.hit_sections[m.group(1)]
+
+    norms = normalized_tokens(line)
+    pieces = _SENTENCE_END.split(line)
+    piece_words = [len(p.split()) for p in pieces]
+    piece_lexicon = [_lexicon_count(list(map(word_syllables, p.split()))) for p in pieces]
+    per_word = list(map(word_syllables, line.split()))
+
+    return _LineStats(
+        headers=[ln.lower().rstrip(":") for ln in (raw.strip() for raw in line.splitlines()) if ln],
+        hint_sections=frozenset(hint_sections),
+        education_hint=bool(_EDUCATION_HINT.search(lower)),
+        experience_hint=bool(_EXPERIENCE_HINT.search(lower)),
+        tokens=frozenset(_TOKEN.findall(line)),
+        norm_tokens=norms,
+        skills=frozenset(matcher.matched(norms)) if len(matcher) else frozenset(),
+        open_left=bool(norms) and norms[0] in skills_blob,
+        open_right=bool(norms) and norms[-1] in skills_blob,
+        numbers=len(_NUMBER.findall(line)),
+        bullet=line.lstrip()[:1] in ("-", "•", "*"),
+        words=len(per_word),
+        all_caps=len(_ALL_CAPS.findall(line)),
+        lexicon=_lexicon_count(per_word),
+        syllables=sum(per_word),
+        marks=len(pieces) - 1,
+        first_words=piece_words[0],
+        last_words=piece_words[-1],
+        inner_long=sum(1 for n in piece_words[1:-1] if n > 35),
+        first_lexicon=piece_lexicon[0],
+        last_lexicon=piece_lexicon[-1],
+        inner_sentences=sum(1 for n in piece_lexicon[1:-1] if n > 2),
+    )
+
+
+class IncrementalATSScorer:
+    """
+    Re-scores successive versions of a resume (e.g. edits in the paste
+    box). Partial signals are kept per line, keyed by the line's content,
+    so a new version only analyzes the lines that differ from the last
+    one; the per-line partials are then summed. Results equal `ats_score`.
+
+    Skills can span line breaks ("Node" / "js"); those matches are
+    re-checked only at breaks where both neighbouring tokens occur inside
+    some skill.
+    """
+
+    def __init__(self, max_cached_lines: int = 5000):
+        self.max_cached_lines = max_cached_lines
+        self._lines: Dict[str, _LineStats] = {}
+        self._cross: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], FrozenSet[str]] = {}
+        self._detector: Optional[_SectionDetector] = None
+        self._matcher: Optional[SkillMatcher] = None
+        self._last: Optional[Tuple[str, Tuple[float, Dict]]] = None
+
+    def _reset(self, detector: _SectionDetector, matcher: SkillMatcher):
+        self._lines.clear()
+        self._cross.clear()
+        self._detector, self._matcher = detector, matcher
+        self._joined_skills = "\0".join(matcher.skills)
+        self._max_skill_len = max((len(s) for s in matcher.skills), default=0)
+        self._last = None
+
+    def score(self, text: str, required_skills: List[str]) -> Tuple[float, Dict]:
+        if not text:
+            return 0.0, {"error": "Empty resume text"}
+
+        detector = _section_detector()
+        matcher = get_skill_matcher(required_skills or [])
+        if detector is not self._detector or matcher is not self._matcher:
+            self._reset(detector, matcher)
+        elif self._last is not None and self._last[0] == text:
+            score_100, detail = self._last[1]
+            return score_100, dict(detail, sections_detected=dict(detail["sections_detected"]))
+
+        cache = self._lines
+        lines = text.split("\n")
+        stats = list(map(cache.get, lines))
+        if None in stats:
+            for i, line in enumerate(lines):
+                if stats[i] is None:
+                    stats[i] = cache[line] = _line_stats(line, detector, matcher, self._joined_skills)
+        if len(cache) > self.max_cached_lines:
+            self._lines = dict(zip(lines, stats))
+
+        result = self._fold(text, stats)
+        self._last = (text, result)
+        return result
+
+    def _fold(self, text: str, stats: List[_LineStats]) -> Tuple[float, Dict]:
+        """Sum line partials into document signals."""
+        def total(field: str) -> int:
+            return sum(map(_LINE_FIELD[field], stats))
+
+        hint_sections = set().union(*map(_LINE_FIELD["hint_sections"], stats))
+        skills = set().union(*map(_LINE_FIELD["skills"], stats))
+        marks = total("marks")
+
+        # sentences continuing across line breaks
+        long_segments = total("inner_long")
+        sentences = total("inner_sentences")
+        open_words = open_lexicon = 0
+        prev = -1  # last line with tokens
+
+        for i, st in enumerate(stats):
+            if st.marks:
+                long_segments += open_words + st.first_words > 35
+                sentences += open_lexicon + st.first_lexicon > 2
+                open_words, open_lexicon = st.last_words, st.last_lexicon
+            else:
+                open_words += st.first_words
+                open_lexicon += st.first_lexicon
+
+            if st.norm_tokens:
+                if st.open_left and prev >= 0 and stats[prev].open_right:
+                    skills |= self._cross_line(stats, prev, i)
+                prev = i
+
+        long_segments += open_words > 35
+        sentences += open_lexicon > 2
+
+        sections = self._sections(
+            text, stats, hint_sections, any(map(_LINE_FIELD["education_hint"], stats)),
+            any(map(_LINE_FIELD["experience_hint"], stats)),
+        )
+        keyword_rate = len(skills) / len(self._matcher) if len(self._matcher) else 0.0
+        quantify = min(1.0, (total("numbers") + total("bullet")) / (max(1, marks) * 0.6))
+        read = flesch_reading_ease(total("lexicon"), sentences, total("syllables"))
+        read = max(0.0, min(100.0, read))
+        caps_ratio = total("all_caps") / max(1, total("words"))
+        long_ratio = long_segments / (marks + 1)
+        penalty = min(0.15, (caps_ratio * 0.15) + (long_ratio * 0.15))
+
+        return _combine_signals(sections, keyword_rate, quantify, read, penalty)
+
+    def _sections(
+        self,
+        text: str,
+        stats: List[_LineStats],
+        hint_sections: set,
+        education: bool,
+        experience: bool,
+    ) -> Dict[str, bool]:
+        detector = self._detector
+
+        top: List[str] = []
+        for st in stats:
+            top.extend(st.headers)
+            if len(top) >= 60:
+                break
+        found = detector.header_hits(top[:60]) | hint_sections
+
+        sections = {}
+        for sec in detector.sections:
+            if sec in found:
+                sections[sec] = True
+            elif sec == "experience":
+                # "<n>\nyears" can straddle a line break
+                sections[sec] = experience or bool(_EXPERIENCE_HINT.search(text.lower()))
+            elif sec == "education":
+                sections[sec] = education
+            elif sec == "skills":
+                tokens = set()
+                for st in stats:
+                    tokens |= st.tokens
+                    if len(tokens) > 8:
+                        break
+                sections[sec] = len(tokens) > 8
+            else:
+                sections[sec] = False
+        return sections
+
+    def _cross_line(self, stats: List[_LineStats], left: int, right: int) -> FrozenSet[str]:
+        """Skills whose match starts at or before line `left` and ends at or after `right`."""
+        limit = self._max_skill_len
+
+        before: List[str] = []
+        size = 0
+        for st in reversed(stats[:left + 1]):
+            for tok in reversed(st.norm_tokens):
+                before.append(tok)
+                size += len(tok)
+                if size >= limit:
+                    break
+            if size >= limit:
+                break
+        before.reverse()
+
+        after: List[str] = []
+        size = 0
+        for st in stats[right:]:
+            for tok in st.norm_tokens:
+                after.append(tok)
+                size += len(tok)
+                if size >= limit:
+                    break
+            if size >= limit:
+                break
+
+        key = (tuple(before), tuple(after))
+        hits = self._cross.get(key)
+        if hits is None:
+            if len(self._cross) > self.max_cached_lines:
+                self._cross.clear()
+            split = len(before)
+            hits = self._cross[key] = frozenset(
+                skill for skill, first, last in self._matcher.match_tokens(before + after)
+                if first < split < last
+            )
+        return hits
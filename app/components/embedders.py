@@ -0,0 +1,138 @@
+import os
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+# -------------------------------------------------
+# BACKEND SETTINGS
+# -------------------------------------------------
+
+# An embedder is anything with SentenceTransformer's
+# encode(texts, batch_size=..., normalize_embeddings=...) -> (n, dim) array:
+# SentenceTransformer itself, OnnxEmbedder, or a stand-in in benchmarks.
+EMBED_BACKENDS = ("sentence_transformers", "onnx")
+EMBED_BACKEND = os.getenv("JD_EMBED_BACKEND", "sentence_transformers")
+EMBED_THREADS = int(os.getenv("JD_EMBED_THREADS", "0"))  # 0: the runtime's default
+
+# int8 (dynamic quantization) export published in the model's Hub repo;
+# the repo also has model_qint8_avx512_vnni.onnx, model_qint8_arm64.onnx
+# and the float32 onnx/model.onnx
+ONNX_MODEL_FILE = os.getenv("JD_ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+ONNX_MAX_LENGTH = int(os.getenv("JD_ONNX_MAX_LENGTH", "256"))  # all-MiniLM-L6-v2's max_seq_length
+
+
+def make_embedder(model_name: str, backend: str = EMBED_BACKEND, threads: int = EMBED_THREADS):
+    """Load `model_name` (Hub id or local directory) with the given backend."""
+    if backend == "sentence_transformers":
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model_name)
+    if backend == "onnx":
+        return OnnxEmbedder(model_name, threads=threads)
+    raise ValueError(f"Unknown embedding backend: {backend!r} (expected one of {EMBED_BACKENDS})")
+
+
+def embedder_cache_key(model_name: str, backend: str = EMBED_BACKEND) -> str:
+    """Embedding cache namespace: quantized vectors must not mix with float32 ones."""
+    if backend == "onnx":
+        return f"{model_name}#onnx:{ONNX_MODEL_FILE}"
+    return model_name
+
+
+# -------------------------------------------------
+# ONNX RUNTIME BACKEND
+# -------------------------------------------------
+
+def _model_files(model: str, model_file: str) -> Tuple[str, str]:
+    """Paths of the ONNX graph and tokenizer.json, from a local directory or the Hub."""
+    if os.path.isdir(model):
+        return os.path.join(model, model_file), os.path.join(model, "tokenizer.json")
+    from huggingface_hub import hf_hub_download
+    return hf_hub_download(model, model_file), hf_hub_download(model, "tokenizer.json")
+
+
+class OnnxEmbedder:
+    """
+    Sentence embeddings from an ONNX export of a BERT-style encoder, with
+    the pooling of all-MiniLM-L6-v2: mean over tokens, then L2 norm.
+
+    Texts are tokenized once, sorted by token count and batched in that
+    order, so each batch is padded only to its own longest text rather
+    than to the longest text of the call.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        model_file: str = ONNX_MODEL_FILE,
+        threads: int = EMBED_THREADS,
+        max_length: int = ONNX_MAX_LENGTH,
+        sort_by_length: bool = True,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path, tokenizer_path = _model_files(model, model_file)
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length)
+        self.pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.sort_by_length = sort_by_length
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+            opts.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        outputs = [o.name for o in self.session.get_outputs()]
+        self._output = "last_hidden_state" if "last_hidden_state" in outputs else outputs[0]
+
+    def _run(self, encodings: List) -> np.ndarray:
+        width = max(len(e.ids) for e in encodings)
+        ids = np.full((len(encodings), width), self.pad_id, dtype=np.int64)
+        mask = np.zeros((len(encodings), width), dtype=np.int64)
+        types = np.zeros((len(encodings), width), dtype=np.int64)
+        for r, e in enumerate(encodings):
+            n = len(e.ids)
+            ids[r, :n] = e.ids
+            mask[r, :n] = e.attention_mask
+            types[r, :n] = e.type_ids
+
+        feeds = {"input_ids": ids, "attention_mask": mask, "token_type_ids": types}
+        (hidden,) = self.session.run(
+            [self._output], {k: v for k, v in feeds.items() if k in self._inputs}
+        )
+        weights = mask[..., None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+    ) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        if not encodings:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        order = np.arange(len(encodings))
+        if self.sort_by_length:
+            lengths = np.fromiter((len(e.ids) for e in encodings), dtype=np.int64, count=len(encodings))
+            order = np.argsort(lengths, kind="stable")
+
+        out = None
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            pooled = self._run([encodings[i] for i in rows])
+            if out is None:
+                out = np.empty((len(encodings), pooled.shape[1]), dtype=np.float32)
+            out[rows] = pooled
+
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out
@@ -0,0 +1,236 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, use one process per cache dir
+    fcntl = None
+
+
+# -------------------------------------------------
+# CACHE SETTINGS
+# -------------------------------------------------
+
+CACHE_DIR = os.getenv(
+    "EMBED_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "jd_embed_cache"),
+)
+CACHE_DTYPE = os.getenv("EMBED_CACHE_DTYPE", "float32")  # float16 halves the disk size at ~3 significant digits
+
+KEY_BYTES = 16
+
+META_FILE = "meta.json"      # model name, dim, dtype
+VECTORS_FILE = "vectors.bin"  # row-major vectors, appended
+KEYS_FILE = "keys.bin"        # KEY_BYTES text hash per row, appended in the same order
+LOCK_FILE = "lock"            # flock target serializing appends across processes
+
+
+# -------------------------------------------------
+# APPEND-ONLY EMBEDDING CACHE
+# -------------------------------------------------
+
+class EmbeddingCache:
+    """
+    Embeddings of one model keyed by a hash of the text. Vectors are
+    appended to a flat file that is memory-mapped for reads; the row of
+    each hash is kept in memory and extended from the keys file on every
+    lookup. Appends hold an flock on the cache directory, so several
+    processes (Streamlit workers, batch_ingest) can share one cache.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = CACHE_DIR, dtype: str = CACHE_DTYPE):
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+
+        slug = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"{slug}-{self.dtype.name}")
+        os.makedirs(self.path, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._n = 0  # rows of the keys file read so far
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        with self._file_lock(exclusive=True):
+            self._sync(repair=True)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """flock on the cache directory's lock file, shared across processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._file(LOCK_FILE), "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reset(self):
+        self._rows = {}
+        self._n = 0
+        self._vectors = None
+        self.dim = None
+
+    def _sync(self, repair: bool = False):
+        """
+        Pick up rows appended by other processes since the last call.
+        With `repair` (exclusive lock held) a half-written append is
+        truncated away.
+        """
+        meta_path = self._file(META_FILE)
+        if not os.path.exists(meta_path):
+            self._reset()  # never written, or cleared by another process
+            return
+        if self.dim is None:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("model") != self.model_name or meta.get("dtype") != self.dtype.name:
+                raise ValueError(f"Embedding cache at {self.path} belongs to another model")
+            self.dim = int(meta["dim"])
+
+        keys_path = self._file(KEYS_FILE)
+        n = os.path.getsize(keys_path) // KEY_BYTES if os.path.exists(keys_path) else 0
+        if repair:
+            vec_path = self._file(VECTORS_FILE)
+            vec_bytes = os.path.getsize(vec_path) if os.path.exists(vec_path) else 0
+            # an interrupted append leaves one file longer than the other
+            n = min(n, vec_bytes // self._row_bytes())
+            if os.path.exists(keys_path) and os.path.getsize(keys_path) != n * KEY_BYTES:
+                os.truncate(keys_path, n * KEY_BYTES)
+            if vec_bytes != n * self._row_bytes():
+                os.truncate(vec_path, n * self._row_bytes())
+
+        if n < self._n:
+            # cleared and refilled by another process
+            dim = self.dim
+            self._reset()
+            self.dim = dim
+        if n > self._n:
+            with open(keys_path, "rb") as f:
+                f.seek(self._n * KEY_BYTES)
+                keys = f.read((n - self._n) * KEY_BYTES)
+            for i in range(n - self._n):
+                self._rows[keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]] = self._n + i
+            self._n = n
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _mapped(self) -> np.ndarray:
+        if self._vectors is None or self._vectors.shape[0] != self._n:
+            self._vectors = np.memmap(
+                self._file(VECTORS_FILE), dtype=self.dtype, mode="r", shape=(self._n, self.dim)
+            )
+        return self._vectors
+
+    @staticmethod
+    def key_for(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+    def _append(self, keys: List[bytes], vecs: np.ndarray):
+        """Append rows; the caller holds the exclusive file lock and has just synced."""
+        if self.dim is None:
+            self.dim = int(vecs.shape[1])
+            with open(self._file(META_FILE), "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": self.dim, "dtype": self.dtype.name}, f)
+        elif vecs.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d embeddings, got {vecs.shape[1]}")
+
+        # another process may have stored some of these while we embedded
+        new = [i for i, k in enumerate(keys) if k not in self._rows]
+        if not new:
+            return
+        keys = [keys[i] for i in new]
+        vecs = vecs[new]
+
+        # rows are numbered by the keys file on disk, not by what this
+        # process has seen
+        keys_path = self._file(KEYS_FILE)
+        start = os.path.getsize(keys_path) // KEY_BYTES if os.path.exists(keys_path) else 0
+
+        # vectors first: a row only counts once its key is written
+        with open(self._file(VECTORS_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(vecs, dtype=self.dtype).tobytes())
+        with open(keys_path, "ab") as f:
+            f.write(b"".join(keys))
+
+        for i, k in enumerate(keys):
+            self._rows[k] = start + i
+        self._n = start + len(keys)
+
+    def get_or_embed(
+        self,
+        texts: Sequence[str],
+        embed: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """
+        float32 embeddings of `texts`, in order. Only texts not cached yet
+        are passed to `embed` (once each), and their vectors are stored.
+        """
+        keys = [self.key_for(t) for t in texts]
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                self._sync()
+            missing: Dict[bytes, str] = {}
+            for k, t in zip(keys, texts):
+                if k not in self._rows and k not in missing:
+                    missing[k] = t
+            # a miss is a text the model has to embed; repeats within a call are hits
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+
+            if missing:
+                vecs = np.asarray(embed(list(missing.values())), dtype=np.float32)
+                with self._file_lock(exclusive=True):
+                    self._sync(repair=True)
+                    self._append(list(missing), vecs)
+
+            if not keys:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            rows = np.fromiter((self._rows[k] for k in keys), dtype=np.int64, count=len(keys))
+            return np.asarray(self._mapped()[rows], dtype=np.float32)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._rows),
+            "size_bytes": self._n * (self._row_bytes() + KEY_BYTES) if self.dim else 0,
+            "dtype": self.dtype.name,
+        }
+
+    def clear(self):
+        with self._lock, self._file_lock(exclusive=True):
+            self._vectors = None
+            for name in (META_FILE, KEYS_FILE, VECTORS_FILE):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            self._reset()
+
+
+_default_caches: Dict[str, EmbeddingCache] = {}
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Process-wide cache per embedding model."""
+    if model_name not in _default_caches:
+        _default_caches[model_name] = EmbeddingCache(model_name)
+    return _default_caches[model_name]
@@ -0,0 +1,159 @@
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from components.resume_parser import PARSER_VERSION
+
+
+# -------------------------------------------------
+# CACHE SETTINGS
+# -------------------------------------------------
+
+CACHE_PATH = os.getenv(
+    "RESUME_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_extract_cache.sqlite"),
+)
+CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+# -------------------------------------------------
+# CONTENT-ADDRESSED EXTRACTION CACHE
+# -------------------------------------------------
+
+class ExtractionCache:
+    """
+    SQLite-backed store of (text, page_count) keyed by a hash of the PDF
+    bytes and the parser version. Least recently used entries are evicted
+    once the stored text exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " page_count INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_access ON extractions(last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(pdf_bytes: bytes) -> str:
+        h = hashlib.sha256()
+        h.update(f"parser-v{PARSER_VERSION}:".encode("utf-8"))
+        h.update(pdf_bytes)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, page_count FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE extractions SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0], int(row[1])
+
+    def put(self, key: str, text: str, page_count: int):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, text, page_count, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, text, int(page_count), size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM extractions ORDER BY last_access ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM extractions WHERE key = ?", stale)
+
+    def get_or_extract(
+        self,
+        pdf_bytes: bytes,
+        extract: Callable[[], Tuple[str, int]],
+    ) -> Tuple[str, int]:
+        """
+        Return the cached (text, page_count) for these bytes, or call
+        `extract()` and cache its result. Failed extractions are not cached.
+        """
+        key = self.key_for(pdf_bytes)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        text, page_count = extract()
+        if text:
+            self.put(key, text, page_count)
+        return text, page_count
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": int(entries),
+            "size_bytes": int(size),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+
+
+_default_cache: Optional[ExtractionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Process-wide cache shared by every Streamlit session."""
+    global _default_cache
+    # sessions run in their own threads; only one may open the database
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionCache()
+        return _default_cache
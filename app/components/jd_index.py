@@ -1,14 +1,34 @@
 import os
+import sys
 import json
-from typing import List, Dict, Any, Tuple
+import time
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import joblib
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 
-from .utils import clean_text, split_csv_list, save_json, load_json, normalize_token
+from .utils import atomic_write_path, split_csv_list, save_json, normalize_token
+from .skill_index import SkillIndex
+from .meta_store import MetaStore, META_JSON_FILE, _store_lock, open_meta_store
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedders import EMBED_BACKEND, EMBED_BACKENDS, EMBED_THREADS, embedder_cache_key, make_embedder
+from .ann_index import (
+    IndexBuilder,
+    IndexConfig,
+    DEFAULT_INDEX_CONFIG,
+    apply_search_params,
+    ensure_id_map,
+    load_index_config,
+    read_index,
+    save_index_config,
+    write_index,
+)
 
 
 # -------------------------------------------------
@@ -19,18 +39,245 @@ ART_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "artifa
 os.makedirs(ART_DIR, exist_ok=True)
 
 
+# -------------------------------------------------
+# BUILD SETTINGS
+# -------------------------------------------------
+
+BUILD_CHUNK_ROWS = int(os.getenv("JD_BUILD_CHUNK_ROWS", "5000"))
+EMBED_BATCH_SIZE = int(os.getenv("JD_EMBED_BATCH_SIZE", "64"))
+EMBED_CACHE = os.getenv("JD_EMBED_CACHE", "1") == "1"
+
+# map faiss_index.bin instead of reading it into private memory: worker
+# processes then share one copy through the page cache
+INDEX_MMAP = os.getenv("JD_INDEX_MMAP", "0") == "1"
+INDEX_FILE = "faiss_index.bin"
+
+# "dense": FAISS over sentence embeddings. "sparse": cosine over the JD
+# TF-IDF matrix, never loads the embedding model. "hybrid": sparse
+# candidates reranked by embeddings once the model is loaded anyway.
+RETRIEVAL_MODES = ("dense", "sparse", "hybrid")
+RETRIEVAL_MODE = os.getenv("JD_RETRIEVAL_MODE", "dense")
+HYBRID_CANDIDATES = int(os.getenv("JD_HYBRID_CANDIDATES", "50"))
+
+# seconds after an upsert / delete before the role classifier is refit
+# in the background; further changes in that window share one refit
+RETRAIN_DELAY = float(os.getenv("JD_RETRAIN_DELAY", "60"))
+
+
+# -------------------------------------------------
+# POSTINGS META (SNAPSHOT + APPEND LOG)
+# -------------------------------------------------
+
+# the last full build is faiss_meta.json (tracked) and the MetaStore
+# snapshot converted from it (meta_*.npy / meta_strings.json, untracked)
+META_LOG_FILE = "faiss_meta_log.jsonl"  # upserts / deletes since then
+
+
+def _replay_meta(art_dir: str) -> Tuple[MetaStore, int]:
+    """Meta records and the next unused posting id (deleted ids are never reused)."""
+    meta = open_meta_store(art_dir)
+    next_id = int(meta.posting_ids().max(initial=-1)) + 1
+    log_path = os.path.join(art_dir, META_LOG_FILE)
+    if os.path.exists(log_path):
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    continue  # partially written last line
+                if entry.get("op") == "add":
+                    meta.append(entry["record"])
+                    next_id = max(next_id, entry["record"]["id"] + 1)
+                elif entry.get("op") == "delete":
+                    meta.delete(entry["row"])
+    return meta, next_id
+
+
+def load_meta(art_dir: str) -> MetaStore:
+    """
+    Posting records indexed by FAISS label: the build snapshot with the
+    change log replayed. Deleted postings read as None so labels stay
+    valid. Records are decoded on access.
+    """
+    return _replay_meta(art_dir)[0]
+
+
+def _role_prompt(job_position: str) -> Dict[str, str]:
+    return {
+        "system": "You are an expert resume reviewer for this role.",
+        "instruction": (
+            f"Focus on {job_position}. "
+            "Tailor feedback using concrete bullet rewrites and missing skills."
+        ),
+    }
+
+
+def _fit_role_matcher(texts: List[str], y: List[str]):
+    """Vectorizer, classifier and the L2-normalized TF-IDF rows of `texts`."""
+    vectorizer = TfidfVectorizer(
+        ngram_range=(1, 2),
+        max_features=30000,
+        min_df=1,
+    )
+
+    X = vectorizer.fit_transform(texts)
+
+    clf = LogisticRegression(max_iter=300)
+    clf.fit(X, y)
+    return vectorizer, clf, X.astype(np.float32)
+
+
+# -------------------------------------------------
+# JD TF-IDF MATRIX (SPARSE RETRIEVAL)
+# -------------------------------------------------
+
+TFIDF_MATRIX_FILE = "jd_tfidf.npz"  # TF-IDF row per meta row, fit together with vectorizer.pkl
+
+
+def _scatter_rows(X: sparse.csr_matrix, rows: Iterable[int], n_rows: int) -> sparse.csr_matrix:
+    """`X` with its i-th row moved to rows[i] (ascending) of an n_rows matrix; other rows empty."""
+    counts = np.zeros(n_rows, dtype=np.int64)
+    counts[np.asarray(list(rows), dtype=np.int64)] = np.diff(X.indptr)
+    indptr = np.concatenate([[0], np.cumsum(counts)])
+    return sparse.csr_matrix((X.data, X.indices, indptr), shape=(n_rows, X.shape[1]))
+
+
+def _save_tfidf(art_dir: str, X: sparse.csr_matrix):
+    with atomic_write_path(os.path.join(art_dir, TFIDF_MATRIX_FILE), suffix=".npz") as tmp:
+        sparse.save_npz(tmp, X, compressed=False)
+
+
+def _save_role_matcher(art_dir: str, vectorizer, clf, X: sparse.csr_matrix):
+    """Vectorizer, classifier and TF-IDF rows, each file replaced atomically."""
+    for name, obj in (("vectorizer.pkl", vectorizer), ("role_match_clf.pkl", clf)):
+        with atomic_write_path(os.path.join(art_dir, name)) as tmp:
+            joblib.dump(obj, tmp)
+    _save_tfidf(art_dir, X)
+
+
+def _load_tfidf(art_dir: str, vectorizer, n_rows: int) -> Optional[sparse.csr_matrix]:
+    """None when missing or not from this vectorizer (artifacts built before it existed)."""
+    path = os.path.join(art_dir, TFIDF_MATRIX_FILE)
+    if not os.path.exists(path):
+        return None
+    X = sparse.load_npz(path).tocsr()
+    if X.shape[1] != len(vectorizer.vocabulary_) or X.shape[0] > n_rows:
+        return None
+    return X
+
+
+# -------------------------------------------------
+# CSV CHUNK -> RECORDS
+# -------------------------------------------------
+
+def _clean_column(col: pd.Series) -> pd.Series:
+    """clean_text applied to a whole column."""
+    return (
+        col.str.replace("\x00", " ", regex=False)
+        .str.replace(r"[\r\t]", " ", regex=True)
+        .str.replace(r" {2,}", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _chunk_records(chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+    """faiss_meta records for one CSV chunk, built column-wise."""
+    def column(name: str) -> pd.Series:
+        if name in chunk:
+            return chunk[name]
+        return pd.Series("", index=chunk.index, dtype=object)
+
+    job = _clean_column(column("job_position"))
+
+    # ragged skill lists stay Python lists; each distinct skill is
+    # normalized once per chunk
+    skills = list(map(split_csv_list, column("relevant_skills").tolist()))
+    norm = {s: normalize_token(s) for s in set().union(*skills)}
+    skills_norm = [[norm[s] for s in row] for row in skills]
+
+    text = (
+        "Job Position: " + job
+        + "\nSkills: " + pd.Series([", ".join(row) for row in skills], index=chunk.index)
+        + "\nQualifications: " + _clean_column(column("required_qualifications"))
+        + "\nResponsibilities: " + _clean_column(column("job_responsibilities"))
+        + "\nSummary: " + _clean_column(column("ideal_candidate_summary"))
+    )
+
+    return [
+        {
+            "job_position": j,
+            "job_position_norm": normalize_token(j),
+            "skills": sk,
+            "skills_norm": sn,
+            "text": t,
+        }
+        for j, sk, sn, t in zip(job.tolist(), skills, skills_norm, text.tolist())
+    ]
+
+
+def _empty_hits(n: int, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ids / rows / scores arrays of query_batch, all padding."""
+    return (
+        np.full((n, k), -1, dtype=np.int64),
+        np.full((n, k), -1, dtype=np.int64),
+        np.full((n, k), -np.inf, dtype=np.float32),
+    )
+
+
 # -------------------------------------------------
 # JD INDEX CLASS
 # -------------------------------------------------
 
 class JDIndex:
-    def __init__(self, embed_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        embed_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        use_embed_cache: bool = EMBED_CACHE,
+        index_config: IndexConfig = DEFAULT_INDEX_CONFIG,
+        retrieval_mode: str = RETRIEVAL_MODE,
+        embed_backend: str = EMBED_BACKEND,
+        embed_threads: int = EMBED_THREADS,
+    ):
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode!r} (expected one of {RETRIEVAL_MODES})")
+        if embed_backend not in EMBED_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {embed_backend!r} (expected one of {EMBED_BACKENDS})")
         self.embed_model_name = embed_model
+        self.embed_backend = embed_backend
+        self.embed_threads = embed_threads
+        self.index_config = index_config
+        self.retrieval_mode = retrieval_mode
+        self.hybrid_candidates = HYBRID_CANDIDATES
         self.model = None
+        self.embed_cache: Optional[EmbeddingCache] = (
+            get_embedding_cache(embedder_cache_key(embed_model, embed_backend))
+            if use_embed_cache else None
+        )
         self.index = None
-        self.meta: List[Dict[str, Any]] = []
+        self._index_mmapped = False
+        self.meta: MetaStore = MetaStore.from_records([])
         self.vectorizer = None
         self.role_match_clf = None
+        # TF-IDF of each meta row under self.vectorizer; rows added since
+        # it was computed are transformed on the next sparse query
+        self._tfidf: Optional[sparse.csr_matrix] = None
+        self.skill_index = None
+        self._skill_index_stale = False
+        self._ids_by_row: Optional[np.ndarray] = None
+
+        # posting id -> FAISS label (row of meta), live roles and their prompts
+        self._row_of: Dict[int, int] = {}
+        self._role_counts: Counter = Counter()
+        self.prompts: Dict[str, Dict[str, str]] = {}
+        self.next_id = 0
+        self._pending_log: List[Dict[str, Any]] = []
+
+        self.retrain_delay: Optional[float] = RETRAIN_DELAY
+        self._retrain_timer: Optional[threading.Timer] = None
+        self._model_lock = threading.Lock()
+        # upsert / delete change the index and meta together under this lock;
+        # a background retrain copies meta under it
+        self._index_lock = threading.Lock()
 
     # -------------------------------------------------
     # EMBEDDING (LAZY LOAD)
@@ -38,134 +285,536 @@ class JDIndex:
 
     def load_embedder(self):
         if self.model is None:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(self.embed_model_name)
+            self.model = make_embedder(self.embed_model_name, self.embed_backend, self.embed_threads)
 
-    def _embed(self, texts: List[str]) -> np.ndarray:
+    def _encode(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
         self.load_embedder()
-        embs = self.model.encode(texts, normalize_embeddings=True)
+        embs = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
         return np.asarray(embs, dtype="float32")
 
+    def _embed(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+        """Embeddings via the on-disk cache; the model only sees (and loads for) new texts."""
+        if self.embed_cache is None:
+            return self._encode(texts, batch_size)
+        return self.embed_cache.get_or_embed(texts, lambda new: self._encode(new, batch_size))
+
     # -------------------------------------------------
     # BUILD FROM CSV
     # -------------------------------------------------
 
-    def build_from_csv(self, csv_path: str):
-        df = pd.read_csv(csv_path, encoding="utf-8")
-        df.fillna("", inplace=True)
-
-        records = []
-        skills_vocab = set()
-
-        for _, r in df.iterrows():
-            job = clean_text(str(r.get("job_position", "")))
-            job_norm = normalize_token(job)
-
-            skills_raw = split_csv_list(str(r.get("relevant_skills", "")))
-            skills = []
-            for s in skills_raw:
-                skills.append(s)
-                skills_vocab.add(normalize_token(s))
-
-            quals = clean_text(str(r.get("required_qualifications", "")))
-            resp = clean_text(str(r.get("job_responsibilities", "")))
-            ideal = clean_text(str(r.get("ideal_candidate_summary", "")))
-
-            blob = (
-                f"Job Position: {job}\n"
-                f"Skills: {', '.join(skills)}\n"
-                f"Qualifications: {quals}\n"
-                f"Responsibilities: {resp}\n"
-                f"Summary: {ideal}"
-            )
-
-            records.append({
-                "job_position": job,
-                "job_position_norm": job_norm,
-                "skills": skills,
-                "skills_norm": [normalize_token(s) for s in skills],
-                "text": blob,
-            })
+    def build_from_csv(
+        self,
+        csv_path: str,
+        chunk_rows: int = BUILD_CHUNK_ROWS,
+        batch_size: int = EMBED_BATCH_SIZE,
+        progress: bool = True,
+    ) -> Dict[str, float]:
+        """
+        Stream the CSV in chunks of `chunk_rows`: build each chunk's records
+        with column operations, embed it and add it to the FAISS index, so
+        only one chunk of embeddings is in memory at a time (IVF types also
+        buffer their training set). Rows whose text is already in the
+        embedding cache are not re-embedded. Returns a throughput report.
+        """
+        from tqdm import tqdm
+
+        start = time.perf_counter()
+        embed_seconds = 0.0
+        cache = self.embed_cache
+        hits0, misses0 = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        self.index = None
+        self._index_mmapped = False
+        builder = IndexBuilder(self.index_config)
+        records: List[Dict[str, Any]] = []
+        texts: List[str] = []
+
+        # dtype=str: every chunk parses the same way regardless of its values
+        reader = pd.read_csv(csv_path, encoding="utf-8", dtype=str, chunksize=chunk_rows)
+        bar = tqdm(unit=" rows", disable=not progress, desc="Indexing JDs")
+        for chunk in reader:
+            chunk_records = _chunk_records(chunk.fillna(""))
+            chunk_texts = [rec["text"] for rec in chunk_records]
+
+            t0 = time.perf_counter()
+            embs = self._embed(chunk_texts, batch_size=batch_size)
+            embed_seconds += time.perf_counter() - t0
+
+            # ---------- FAISS INDEX (incremental) ----------
+            builder.add(embs)
+
+            records.extend(chunk_records)
+            texts.extend(chunk_texts)
+            bar.update(len(chunk_records))
+            bar.set_postfix(rows_per_s=f"{len(records) / (time.perf_counter() - start):.0f}")
+        bar.close()
+
+        self.index = builder.finish()
+        if self.index is None:
+            raise ValueError(f"No job postings found in {csv_path}")
+
+        # resolved parameters (nlist, pq_m, or a fallback to flat)
+        self.index_config = builder.config
+        # stable posting ids, equal to the FAISS labels after a full build
+        for i, rec in enumerate(records):
+            rec["id"] = i
+
+        write_index(self.index, os.path.join(ART_DIR, INDEX_FILE))
+        save_index_config(ART_DIR, self.index_config)
+        # faiss_meta.json is the tracked copy; the memory-mapped snapshot is
+        # written after it, so open_meta_store sees it as up to date. Both
+        # under the store lock, so no other process converts or loads a
+        # half-written pair meanwhile
+        with _store_lock(ART_DIR, exclusive=True):
+            if not save_json(os.path.join(ART_DIR, META_JSON_FILE), records):
+                raise OSError(f"Cannot write {META_JSON_FILE} to {ART_DIR}")
+            MetaStore.from_records(records).save(ART_DIR)
+            if os.path.exists(os.path.join(ART_DIR, META_LOG_FILE)):
+                os.remove(os.path.join(ART_DIR, META_LOG_FILE))
+        self.meta = open_meta_store(ART_DIR)
+        self._pending_log = []
+        self._index_rows()
 
-        # ---------- FAISS INDEX ----------
-        texts = [rec["text"] for rec in records]
-        embs = self._embed(texts)
-        dim = embs.shape[1]
+        # ---------- TF-IDF ROLE MATCHER ----------
+        vectorizer, clf, tfidf = _fit_role_matcher(texts, [rec["job_position"] for rec in records])
+        with self._model_lock:
+            self.vectorizer, self.role_match_clf, self._tfidf = vectorizer, clf, tfidf
 
-        import faiss
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(embs)
+        _save_role_matcher(ART_DIR, vectorizer, clf, tfidf)
 
-        self.meta = records
+        # ---------- INVERTED SKILL INDEX ----------
+        # skill -> role ids; also writes skills_vocab.json
+        self.skill_index = SkillIndex.build([rec["skills_norm"] for rec in records])
+        self.skill_index.save(ART_DIR)
 
-        faiss.write_index(self.index, os.path.join(ART_DIR, "faiss_index.bin"))
-        save_json(os.path.join(ART_DIR, "faiss_meta.json"), self.meta)
+        # ---------- ROLE PROMPTS ----------
+        save_json(os.path.join(ART_DIR, "role_prompts.json"), self.prompts)
+
+        elapsed = time.perf_counter() - start
+        report = {
+            "rows": len(records),
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(len(records) / elapsed, 1) if elapsed > 0 else 0.0,
+            "embed_seconds": round(embed_seconds, 2),
+            "index_type": self.index_config.type,
+            "index_storage": self.index_config.sq or "float32",
+        }
+        if cache is not None:
+            hits, misses = cache.hits - hits0, cache.misses - misses0
+            report["embed_cache_hit_rate"] = round(hits / max(1, hits + misses), 3)
+            report["embed_cache_entries"] = cache.stats()["entries"]
+        if progress:
+            print(json.dumps(report), file=sys.stderr)
+        return report
 
-        # ---------- TF-IDF ROLE MATCHER ----------
-        self.vectorizer = TfidfVectorizer(
-            ngram_range=(1, 2),
-            max_features=30000,
-            min_df=1,
-        )
+    # -------------------------------------------------
+    # LOAD ARTIFACTS
+    # -------------------------------------------------
 
-        X = self.vectorizer.fit_transform(texts)
-        y = [rec["job_position"] for rec in records]
+    def load(self, mmap: bool = INDEX_MMAP):
+        """
+        Load all artifacts. With `mmap` the FAISS vectors are mapped
+        read-only from disk; the first upsert / delete then reads a private
+        copy.
+        """
+        self.index = read_index(os.path.join(ART_DIR, INDEX_FILE), mmap=mmap)
+        self._index_mmapped = mmap
+        self.index_config = load_index_config(ART_DIR)
+        apply_search_params(self.index, self.index_config)
+        self.meta, next_id = _replay_meta(ART_DIR)
+        self._pending_log = []
+        self._index_rows()
+        self.next_id = max(self.next_id, next_id)
+
+        vectorizer = joblib.load(os.path.join(ART_DIR, "vectorizer.pkl"))
+        clf = joblib.load(os.path.join(ART_DIR, "role_match_clf.pkl"))
+        tfidf = _load_tfidf(ART_DIR, vectorizer, len(self.meta))
+        with self._model_lock:
+            self.vectorizer, self.role_match_clf, self._tfidf = vectorizer, clf, tfidf
+
+        # the saved skill index reflects the last full build only
+        self._skill_index_stale = os.path.exists(os.path.join(ART_DIR, META_LOG_FILE))
+        if not self._skill_index_stale:
+            self.skill_index = SkillIndex.load(ART_DIR, n_roles=len(self.meta))
+
+    def _index_rows(self):
+        """Id -> row map, live role counts and prompts from self.meta."""
+        self._ids_by_row = None
+        self._row_of = {}
+        self._role_counts = Counter()
+        self.prompts = {}
+        for row, rec in enumerate(self.meta.iter_records(("id", "job_position"))):
+            if rec is None:
+                continue
+            self._row_of[rec["id"]] = row
+            self._add_role(rec["job_position"])
+        self.next_id = max(self._row_of, default=-1) + 1
 
-        self.role_match_clf = LogisticRegression(max_iter=300)
-        self.role_match_clf.fit(X, y)
+    def _add_role(self, job_position: str):
+        self._role_counts[job_position] += 1
+        if self._role_counts[job_position] == 1:
+            self.prompts[job_position] = _role_prompt(job_position)
 
-        joblib.dump(self.vectorizer, os.path.join(ART_DIR, "vectorizer.pkl"))
-        joblib.dump(self.role_match_clf, os.path.join(ART_DIR, "role_match_clf.pkl"))
+    def _drop_role(self, job_position: str):
+        self._role_counts[job_position] -= 1
+        if self._role_counts[job_position] <= 0:
+            del self._role_counts[job_position]
+            self.prompts.pop(job_position, None)
 
-        save_json(os.path.join(ART_DIR, "skills_vocab.json"), sorted(skills_vocab))
+    # -------------------------------------------------
+    # INCREMENTAL UPDATES
+    # -------------------------------------------------
 
-        # ---------- ROLE PROMPTS ----------
-        prompts = {}
-        for rec in records:
-            jp = rec["job_position"]
-            prompts[jp] = {
-                "system": "You are an expert resume reviewer for this role.",
-                "instruction": (
-                    f"Focus on {jp}. "
-                    "Tailor feedback using concrete bullet rewrites and missing skills."
-                ),
-            }
+    def upsert(self, postings: List[Dict[str, Any]], save: bool = True) -> List[int]:
+        """
+        Add or replace postings given as CSV-style rows (job_position,
+        relevant_skills, ...) with an optional "id". A known id replaces
+        that posting; rows without one get a new id. Only these rows are
+        embedded. Returns the posting ids.
+        """
+        if self.index is None:
+            raise RuntimeError("FAISS index not loaded")
+        if not postings:
+            return []
+
+        ids = []
+        for p in postings:
+            pid = p.get("id")
+            pid = self.next_id if pid is None else int(pid)
+            self.next_id = max(self.next_id, pid + 1)
+            ids.append(pid)
+
+        # the same id twice in one call: the last row wins
+        last = list({pid: i for i, pid in enumerate(ids)}.values())
+        frame = pd.DataFrame([postings[i] for i in last]).drop(columns="id", errors="ignore")
+        records = _chunk_records(frame.fillna("").astype(str))
+        embs = self._embed([rec["text"] for rec in records])
+
+        self._writable_index()
+        with self._index_lock:
+            self._remove_rows([self._row_of[ids[i]] for i in last if ids[i] in self._row_of])
+
+            start = len(self.meta)
+            self.index.add_with_ids(embs, np.arange(start, start + len(records), dtype=np.int64))
+            for row, (i, rec) in enumerate(zip(last, records), start):
+                rec["id"] = ids[i]
+                self.meta.append(rec)
+                self._row_of[rec["id"]] = row
+                self._add_role(rec["job_position"])
+                self._pending_log.append({"op": "add", "record": rec})
+
+        self._changed(save)
+        return ids
+
+    def delete(self, ids: Iterable[int], save: bool = True) -> int:
+        """Remove postings by id; unknown ids are ignored. Returns how many were removed."""
+        if self.index is None:
+            raise RuntimeError("FAISS index not loaded")
 
-        save_json(os.path.join(ART_DIR, "role_prompts.json"), prompts)
+        rows = [self._row_of[i] for i in dict.fromkeys(int(i) for i in ids) if i in self._row_of]
+        if rows:
+            self._writable_index()
+            with self._index_lock:
+                self._remove_rows(rows)
+            self._changed(save)
+        return len(rows)
+
+    def _writable_index(self):
+        """Labelled index in private memory; a mapped one can't be modified."""
+        if self._index_mmapped:
+            self.index = read_index(os.path.join(ART_DIR, INDEX_FILE))
+            apply_search_params(self.index, self.index_config)
+            self._index_mmapped = False
+        self.index = ensure_id_map(self.index, self.index_config)
+
+    def _remove_rows(self, rows: List[int]):
+        if not rows:
+            return
+        try:
+            self.index.remove_ids(np.asarray(rows, dtype=np.int64))
+        except RuntimeError:
+            pass  # HNSW can't remove vectors; query() skips deleted rows
+        for row in rows:
+            rec = self.meta.record(row, ("id", "job_position"))
+            self._row_of.pop(rec["id"], None)
+            self._drop_role(rec["job_position"])
+            self.meta.delete(row)
+            self._pending_log.append({"op": "delete", "row": row})
+
+    def _changed(self, save: bool):
+        self._ids_by_row = None
+        self._skill_index_stale = True
+        self._schedule_retrain()
+        if save:
+            self.save()
+
+    def save(self):
+        """
+        Persist upserts / deletes: rewrites the FAISS index, appends the
+        changes to the meta log and rewrites the role prompts. The skill
+        index is rebuilt from meta on load instead.
+        """
+        write_index(self.index, os.path.join(ART_DIR, INDEX_FILE))
+        if self._pending_log:
+            with open(os.path.join(ART_DIR, META_LOG_FILE), "a", encoding="utf-8") as f:
+                for entry in self._pending_log:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._pending_log = []
+        save_json(os.path.join(ART_DIR, "role_prompts.json"), self.prompts)
 
     # -------------------------------------------------
-    # LOAD ARTIFACTS
+    # ROLE CLASSIFIER RETRAINING
     # -------------------------------------------------
 
-    def load(self):
-        import faiss
-
-        self.index = faiss.read_index(os.path.join(ART_DIR, "faiss_index.bin"))
-        self.meta = load_json(os.path.join(ART_DIR, "faiss_meta.json"), default=[])
-
-        self.vectorizer = joblib.load(os.path.join(ART_DIR, "vectorizer.pkl"))
-        self.role_match_clf = joblib.load(os.path.join(ART_DIR, "role_match_clf.pkl"))
+    def retrain_role_classifier(self, save: bool = True):
+        """
+        Refit TF-IDF and the classifier on the live postings. Queries keep
+        using the previous pair until the new one is swapped in.
+        """
+        # a consistent copy: upsert / delete may change meta during the fit
+        with self._index_lock:
+            records = list(self.meta.iter_records(("text", "job_position")))
+        live_rows = [row for row, rec in enumerate(records) if rec is not None]
+        vectorizer, clf, X = _fit_role_matcher(
+            [records[row]["text"] for row in live_rows],
+            [records[row]["job_position"] for row in live_rows],
+        )
+        tfidf = _scatter_rows(X, live_rows, len(records))
+        with self._model_lock:
+            self.vectorizer, self.role_match_clf, self._tfidf = vectorizer, clf, tfidf
+
+        if save:
+            _save_role_matcher(ART_DIR, vectorizer, clf, tfidf)
+
+    def _schedule_retrain(self):
+        if self.retrain_delay is None:
+            return
+        with self._model_lock:
+            if self._retrain_timer is not None:
+                return
+            self._retrain_timer = threading.Timer(self.retrain_delay, self._background_retrain)
+            self._retrain_timer.daemon = True
+            self._retrain_timer.start()
+
+    def _background_retrain(self):
+        # changes arriving during the refit schedule another one
+        with self._model_lock:
+            self._retrain_timer = None
+        try:
+            self.retrain_role_classifier()
+        except Exception as e:
+            # nothing else would report a failure in the timer thread;
+            # queries keep the previous model
+            print(f"Background role classifier retrain failed: {e!r}", file=sys.stderr)
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """Trade recall for latency on a built IVF (`nprobe`) or HNSW (`ef_search`) index."""
+        changes = {k: v for k, v in (("nprobe", nprobe), ("ef_search", ef_search)) if v is not None}
+        self.index_config = self.index_config._replace(**changes)
+        if self.index is not None:
+            apply_search_params(self.index, self.index_config)
 
     # -------------------------------------------------
     # FAISS QUERY
     # -------------------------------------------------
 
-    def query(self, text: str, k: int = 5) -> List[Dict[str, Any]]:
+    def query(self, text: str, k: int = 5, mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top-k postings (meta records with a "score"); `mode` defaults to self.retrieval_mode."""
+        mode = self._retrieval_mode(mode)
+        if mode != "dense":
+            hits = self._sparse_query_batch([text], k, mode)
+            results = []
+            for row, score in zip(hits["rows"][0].tolist(), hits["scores"][0].tolist()):
+                if row < 0:
+                    break
+                m = self.meta[row]
+                m["score"] = score
+                results.append(m)
+            return results
+
         if self.index is None:
             raise RuntimeError("FAISS index not loaded")
 
         embs = self._embed([text])
-        sims, ids = self.index.search(embs, k)
+        # vectors of deleted postings an HNSW index still holds
+        dead = max(0, self.index.ntotal - len(self._row_of))
+        sims, ids = self.index.search(embs, min(k + dead, max(1, self.index.ntotal)))
 
         results = []
         for score, idx in zip(sims[0], ids[0]):
-            if idx == -1:
+            m = self.meta[idx] if 0 <= idx < len(self.meta) else None
+            if m is None:
                 continue
-            m = self.meta[idx].copy()
             m["score"] = float(score)
             results.append(m)
 
-        return results
+        return results[:k]
+
+    def _posting_ids(self) -> np.ndarray:
+        """Posting id of every FAISS label (meta row), -1 for deleted rows."""
+        if self._ids_by_row is None:
+            self._ids_by_row = self.meta.posting_ids()
+        return self._ids_by_row
+
+    def query_batch(
+        self,
+        texts: List[str],
+        k: int = 5,
+        batch_size: int = EMBED_BATCH_SIZE,
+        mode: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Nearest postings for many texts with one embedding pass and one
+        FAISS search (or one sparse product per batch). Returns
+        (len(texts), k) arrays rather than meta copies:
+
+            ids      posting ids, -1 where fewer than k postings exist
+            rows     meta rows (self.meta[row]), -1 likewise
+            scores   similarity (inner product / TF-IDF cosine), -inf likewise
+
+        Row i holds the postings query(texts[i], k, mode) returns, in order.
+        """
+        mode = self._retrieval_mode(mode)
+        if mode != "dense":
+            return self._sparse_query_batch(texts, k, mode, batch_size)
+        if self.index is None:
+            raise RuntimeError("FAISS index not loaded")
+
+        n = len(texts)
+        ids, rows, scores = _empty_hits(n, k)
+        if n == 0 or k <= 0 or self.index.ntotal == 0:
+            return {"ids": ids, "rows": rows, "scores": scores}
+
+        embs = self._embed(list(texts), batch_size=batch_size)
+        dead = max(0, self.index.ntotal - len(self._row_of))
+        sims, labels = self.index.search(embs, min(k + dead, self.index.ntotal))
+
+        # drop misses and deleted rows, keeping the first k live hits per query
+        row_ids = self._posting_ids()
+        valid = (labels >= 0) & (labels < len(row_ids))
+        hit_ids = np.where(valid, row_ids[np.where(valid, labels, 0)], -1)
+        live = hit_ids >= 0
+        order = np.argsort(~live, axis=1, kind="stable")[:, :k]
+        keep = np.take_along_axis(live, order, axis=1)
+
+        width = order.shape[1]
+        ids[:, :width] = np.where(keep, np.take_along_axis(hit_ids, order, axis=1), -1)
+        rows[:, :width] = np.where(keep, np.take_along_axis(labels, order, axis=1), -1)
+        scores[:, :width] = np.where(keep, np.take_along_axis(sims, order, axis=1), -np.inf)
+        return {"ids": ids, "rows": rows, "scores": scores}
+
+    def _retrieval_mode(self, mode: Optional[str]) -> str:
+        mode = mode or self.retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode!r} (expected one of {RETRIEVAL_MODES})")
+        return mode
+
+    # -------------------------------------------------
+    # SPARSE / HYBRID QUERY (TF-IDF)
+    # -------------------------------------------------
+
+    def _tfidf_matrix(self) -> Tuple[Any, sparse.csr_matrix]:
+        """
+        Vectorizer and the TF-IDF rows of all of meta, transforming rows
+        added since. Terms new to those rows count once the vectorizer is
+        refit by the next retrain.
+        """
+        if self.vectorizer is None:
+            raise RuntimeError("TF-IDF vectorizer not loaded")
+        with self._model_lock:
+            vectorizer, X = self.vectorizer, self._tfidf
+        if X is None:
+            X = sparse.csr_matrix((0, len(vectorizer.vocabulary_)), dtype=np.float32)
+
+        n = len(self.meta)
+        if X.shape[0] < n:
+            # deleted rows transform to empty ones
+            tail = [rec["text"] if rec else "" for rec in
+                    (self.meta.record(row, ("text",)) for row in range(X.shape[0], n))]
+            X = sparse.vstack([X, vectorizer.transform(tail).astype(np.float32)], format="csr")
+            with self._model_lock:
+                # a retrain may have swapped the vectorizer meanwhile
+                if self.vectorizer is vectorizer:
+                    self._tfidf = X
+        return vectorizer, X
+
+    def _sparse_query_batch(
+        self,
+        texts: List[str],
+        k: int,
+        mode: str,
+        batch_size: int = EMBED_BATCH_SIZE,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Top-k postings by cosine between L2-normalized TF-IDF rows, one
+        matrix product per batch of queries. Postings sharing no term with
+        the query are not returned. In hybrid mode, when the embedding
+        model is already loaded, the top `hybrid_candidates` are reranked
+        by embedding similarity.
+        """
+        n = len(texts)
+        ids, rows, scores = _empty_hits(n, k)
+        if n == 0 or k <= 0:
+            return {"ids": ids, "rows": rows, "scores": scores}
+
+        rerank = mode == "hybrid" and self.model is not None
+        width = max(k, self.hybrid_candidates) if rerank else k
+
+        vectorizer, X = self._tfidf_matrix()
+        row_ids = self._posting_ids()
+        n_rows = min(X.shape[0], len(row_ids))
+        if X.shape[0] > n_rows:
+            X = X[:n_rows]
+        dead = row_ids[:n_rows] < 0
+        width = min(width, n_rows)
+        if width == 0:
+            return {"ids": ids, "rows": rows, "scores": scores}
+
+        Q = vectorizer.transform(texts).astype(np.float32)
+        cand_rows = np.full((n, width), -1, dtype=np.int64)
+        cand_scores = np.full((n, width), -np.inf, dtype=np.float32)
+        for start in range(0, n, batch_size):
+            # one pass over X's nonzeros against a dense query block; a
+            # sparse x sparse product costs ~10x more on JD-sized rows
+            sims = np.ascontiguousarray((X @ Q[start:start + batch_size].T.toarray()).T)
+            sims[:, dead] = 0.0
+            top = np.argpartition(-sims, width - 1, axis=1)[:, :width]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_sims = np.take_along_axis(top_sims, order, axis=1)
+            hit = top_sims > 0
+            cand_rows[start:start + batch_size] = np.where(hit, top, -1)
+            cand_scores[start:start + batch_size] = np.where(hit, top_sims, -np.inf)
+
+        if rerank:
+            cand_rows, cand_scores = self._rerank_dense(texts, cand_rows, batch_size)
+
+        width = min(k, width)
+        rows[:, :width] = cand_rows[:, :width]
+        scores[:, :width] = cand_scores[:, :width]
+        ids[:, :width] = np.where(rows[:, :width] >= 0, row_ids[np.maximum(rows[:, :width], 0)], -1)
+        return {"ids": ids, "rows": rows, "scores": scores}
+
+    def _rerank_dense(
+        self,
+        texts: List[str],
+        cand_rows: np.ndarray,
+        batch_size: int = EMBED_BATCH_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate rows of each query reordered by embedding similarity; -1 rows stay last."""
+        uniq = np.unique(cand_rows[cand_rows >= 0])
+        if len(uniq) == 0:
+            return cand_rows, np.full(cand_rows.shape, -np.inf, dtype=np.float32)
+
+        # JD texts embedded at build time come from the embedding cache
+        docs = self._embed([self.meta.record(int(r), ("text",))["text"] for r in uniq], batch_size)
+        queries = self._embed(list(texts), batch_size)
+        pos = np.searchsorted(uniq, np.maximum(cand_rows, 0))
+        sims = np.einsum("qd,qcd->qc", queries, docs[pos])
+        sims = np.where(cand_rows >= 0, sims, -np.inf).astype(np.float32)
+
+        order = np.argsort(-sims, axis=1, kind="stable")
+        return np.take_along_axis(cand_rows, order, axis=1), np.take_along_axis(sims, order, axis=1)
 
     # -------------------------------------------------
     # ROLE MATCHING (ROBUST)
@@ -175,9 +824,65 @@ class JDIndex:
         if self.vectorizer is None or self.role_match_clf is None:
             raise RuntimeError("Role classifier not loaded")
 
-        X = self.vectorizer.transform([text])
-        proba = self.role_match_clf.predict_proba(X)[0]
-        classes = list(self.role_match_clf.classes_)
+        with self._model_lock:
+            vectorizer, clf = self.vectorizer, self.role_match_clf
+
+        X = vectorizer.transform([text])
+        proba = clf.predict_proba(X)[0]
+        classes = list(clf.classes_)
 
         idx = int(np.argmax(proba))
         return classes[idx], float(proba[idx])
+
+    def match_role_batch(self, texts: List[str], top_n: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Top `top_n` roles for many texts with one TF-IDF transform and one
+        predict_proba. Returns (len(texts), top_n) arrays:
+
+            roles    role names, best first
+            proba    their probabilities
+
+        Column 0 equals match_role(texts[i]).
+        """
+        if self.vectorizer is None or self.role_match_clf is None:
+            raise RuntimeError("Role classifier not loaded")
+
+        with self._model_lock:
+            vectorizer, clf = self.vectorizer, self.role_match_clf
+
+        top_n = max(0, min(top_n, len(clf.classes_)))
+        if len(texts) == 0:
+            return {
+                "roles": np.empty((0, top_n), dtype=clf.classes_.dtype),
+                "proba": np.empty((0, top_n), dtype=np.float64),
+            }
+
+        proba = clf.predict_proba(vectorizer.transform(texts))
+        # ties keep class order, as np.argmax does
+        order = np.argsort(-proba, axis=1, kind="stable")[:, :top_n]
+        return {
+            "roles": clf.classes_[order],
+            "proba": np.take_along_axis(proba, order, axis=1),
+        }
+
+    # -------------------------------------------------
+    # SKILL-BASED CANDIDATES (NO EMBEDDINGS)
+    # -------------------------------------------------
+
+    def candidate_roles(self, text: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Roles sharing the resume's skills, ranked by IDF-weighted overlap."""
+        if self._skill_index_stale:
+            # deleted rows keep their id with no skills
+            self.skill_index = SkillIndex.build(
+                [rec["skills_norm"] if rec else [] for rec in self.meta.iter_records(("skills_norm",))]
+            )
+            self._skill_index_stale = False
+        if self.skill_index is None:
+            raise RuntimeError("Skill index not loaded")
+
+        results = []
+        for idx, score in self.skill_index.candidate_roles(text, k):
+            m = self.meta[idx]
+            m["skill_score"] = score
+            results.append(m)
+        return results
@@ -1,14 +1,16 @@
-import os, json, re
-from typing import Dict, Any, List, Optional
+import os, sys, json, re
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
 import joblib
 import streamlit as st
 from dotenv import load_dotenv
 
-from .ats_scoring import ats_score, detect_sections
+from .ats_scoring import ats_score, detect_sections, keyword_matches, IncrementalATSScorer
+from .role_fit import get_role_skill_matrix
+from .jd_index import load_meta
+from .meta_store import MetaStore
 from .utils import clean_text
 from .utils import normalize_token  # added in STEP 2 later (safe import)
-from .utils import load_json
 
 # -------------------------------------------------
 # ENV + ARTIFACT SETUP
@@ -21,15 +23,14 @@ ART_DIR = os.path.join(APP_DIR, "../artifacts")
 
 VECTOR_PATH = os.path.join(ART_DIR, "vectorizer.pkl")
 CLF_PATH = os.path.join(ART_DIR, "role_match_clf.pkl")
-FAISS_META_PATH = os.path.join(ART_DIR, "faiss_meta.json")
 
 # -------------------------------------------------
 # LOAD ARTIFACTS (DEFENSIVE)
 # -------------------------------------------------
 
 def _load_artifacts():
-    vectorizer = clf = None
-    meta = []
+    vectorizer = clf = meta_error = None
+    meta: MetaStore = MetaStore.from_records([])
     try:
         vectorizer = joblib.load(VECTOR_PATH)
     except Exception:
@@ -39,13 +40,19 @@ def _load_artifacts():
     except Exception:
         pass
     try:
-        meta = load_json(FAISS_META_PATH, default=[]) or []
-    except Exception:
-        meta = []
-    return vectorizer, clf, meta
+        # memory-mapped build snapshot plus upserts / deletes made since;
+        # records are decoded on access
+        meta = load_meta(ART_DIR)
+    except Exception as e:
+        # an empty meta scores every resume without required skills, so
+        # say so; batch_ingest records it as an error for each file
+        meta_error = f"{type(e).__name__}: {e}"
+        print(f"Could not load JD meta from {ART_DIR}: {meta_error}", file=sys.stderr)
+        meta = MetaStore.from_records([])
+    return vectorizer, clf, meta, meta_error
 
 
-vectorizer, clf, faiss_meta = _load_artifacts()
+vectorizer, clf, faiss_meta, META_LOAD_ERROR = _load_artifacts()
 
 # -------------------------------------------------
 # BACKEND SETUP (GROQ ENABLED)
@@ -98,14 +105,23 @@ def predict_role(text: str) -> Optional[str]:
         return None
 
 
-def get_role_meta(role: str, meta: List[dict]) -> Optional[dict]:
+def get_role_meta(role: str, meta: Union[MetaStore, List[dict]]) -> Optional[dict]:
+    if isinstance(meta, MetaStore):
+        return meta.find_role(role)
     role_norm = role.lower().strip()
     for m in meta:
-        if m.get("job_position", "").lower().strip() == role_norm:
+        if m and m.get("job_position", "").lower().strip() == role_norm:
             return m
     return None
 
 
+def rank_roles(text: str, top_k: Optional[int] = 10) -> List[Dict[str, Any]]:
+    """Best-fit roles by keyword match rate over every role in faiss_meta."""
+    if not faiss_meta:
+        return []
+    return get_role_skill_matrix(faiss_meta).rank(text, top_k=top_k)
+
+
 # -------------------------------------------------
 # PROMPT BUILDER
 # -------------------------------------------------
@@ -160,6 +176,7 @@ def review_resume(
     guidance_blobs: List[str],
     jd_text: str = "",
     job_role: Optional[str] = None,
+    ats_scorer: Optional[IncrementalATSScorer] = None,
 ) -> Dict[str, Any]:
 
     resume_text = clean_text(resume_text)
@@ -177,7 +194,9 @@ def review_resume(
         required_skills = []
 
     # ---- ATS SCORE ----
-    ats_score_raw, ats_detail = ats_score(
+    # a scorer kept across runs only re-analyzes the lines that changed
+    score_fn = ats_scorer.score if ats_scorer is not None else ats_score
+    ats_score_raw, ats_detail = score_fn(
         resume_text + "\n" + jd_text,
         required_skills,
     )
@@ -211,9 +230,9 @@ def review_resume(
         }
 
         missing = []
-        resume_norm = normalize_token(resume_text)
+        found = keyword_matches(resume_text, required_skills)
         for s in required_skills:
-            if normalize_token(s) not in resume_norm:
+            if normalize_token(s) not in found:
                 missing.append(s)
 
         llm_output = json.dumps({
@@ -233,5 +252,6 @@ def review_resume(
             "score": ats_score_final,
             "detail": ats_detail,
         },
+        "role_fit": rank_roles(resume_text),
         "llm_feedback_raw": llm_output,
     }
@@ -0,0 +1,347 @@
+import os
+import json
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, convert once before starting workers
+    fcntl = None
+
+from .utils import atomic_write_path, load_json, normalize_token
+
+
+# -------------------------------------------------
+# ARTIFACT FILES
+# -------------------------------------------------
+
+STRINGS_FILE = "meta_strings.json"           # interned role names and skills (+ normalized forms)
+IDS_FILE = "meta_ids.npy"                    # int64 posting id per row
+ROLES_FILE = "meta_roles.npy"                # int32 role string id per row
+SKILL_OFFSETS_FILE = "meta_skill_offsets.npy"  # int64, skills of row i = [off[i], off[i+1])
+SKILL_IDS_FILE = "meta_skill_ids.npy"        # int32 skill string ids, grouped by row
+TEXT_OFFSETS_FILE = "meta_text_offsets.npy"  # int64, text of row i = heap[off[i]:off[i+1]]
+TEXT_FILE = "meta_text.npy"                  # uint8 UTF-8 heap of all JD texts
+
+STORE_FILES = (
+    STRINGS_FILE, IDS_FILE, ROLES_FILE, SKILL_OFFSETS_FILE,
+    SKILL_IDS_FILE, TEXT_OFFSETS_FILE, TEXT_FILE,
+)
+
+META_JSON_FILE = "faiss_meta.json"  # tracked source of truth, written by every full build
+LOCK_FILE = "meta.lock"             # flock target serializing conversions across processes
+
+FIELDS = ("job_position", "job_position_norm", "skills", "skills_norm", "text", "id")
+
+
+# -------------------------------------------------
+# COLUMNAR META STORE
+# -------------------------------------------------
+
+class MetaStore:
+    """
+    Posting records (one per FAISS label) stored column-wise. Role names
+    and skills are interned, JD texts live in one UTF-8 heap, and all
+    columns are memory-mapped on load; a record is only decoded when it
+    is read. Rows appended or deleted after the snapshot was written are
+    kept in memory on top of it.
+
+    Indexing returns the record dict, or None for a deleted row.
+    """
+
+    def __init__(
+        self,
+        strings: Dict[str, List[str]],
+        ids: np.ndarray,
+        roles: np.ndarray,
+        skill_offsets: np.ndarray,
+        skill_ids: np.ndarray,
+        text_offsets: np.ndarray,
+        text: np.ndarray,
+    ):
+        self.role_names = strings["roles"]
+        self.role_names_norm = strings["roles_norm"]
+        self.skill_names = strings["skills"]
+        self.skill_names_norm = strings["skills_norm"]
+        # plain ndarray views: still backed by the mapped file, without
+        # np.memmap's per-slice overhead
+        self._ids = np.asarray(ids)
+        self._roles = np.asarray(roles)
+        self._skill_offsets = np.asarray(skill_offsets)
+        self._skill_ids = np.asarray(skill_ids)
+        self._text_offsets = np.asarray(text_offsets)
+        self._text = np.asarray(text)
+
+        self._n_base = len(ids)
+        self._extra: List[Dict[str, Any]] = []
+        self._deleted = np.zeros(0, dtype=bool)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Optional[Dict[str, Any]]]) -> "MetaStore":
+        """Snapshot of meta records; None rows (deleted postings) are kept as deleted."""
+        role_id: Dict[str, int] = {}
+        skill_id: Dict[str, int] = {}
+        strings = {"roles": [], "roles_norm": [], "skills": [], "skills_norm": []}
+
+        n = len(records)
+        ids = np.full(n, -1, dtype=np.int64)
+        roles = np.zeros(n, dtype=np.int32)
+        skill_counts = np.zeros(n, dtype=np.int64)
+        skill_ids: List[int] = []
+        texts: List[bytes] = []
+
+        for row, rec in enumerate(records):
+            if rec is None:
+                texts.append(b"")
+                continue
+            ids[row] = rec.get("id", row)
+
+            jp = rec.get("job_position", "")
+            r = role_id.get(jp)
+            if r is None:
+                r = role_id[jp] = len(strings["roles"])
+                strings["roles"].append(jp)
+                strings["roles_norm"].append(rec.get("job_position_norm", normalize_token(jp)))
+            roles[row] = r
+
+            skills = rec.get("skills") or []
+            skills_norm = rec.get("skills_norm") or [normalize_token(s) for s in skills]
+            for s, norm in zip(skills, skills_norm):
+                j = skill_id.get(s)
+                if j is None:
+                    j = skill_id[s] = len(strings["skills"])
+                    strings["skills"].append(s)
+                    strings["skills_norm"].append(norm)
+                skill_ids.append(j)
+            skill_counts[row] = len(skills)
+            texts.append(rec.get("text", "").encode("utf-8"))
+
+        skill_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(skill_counts, out=skill_offsets[1:])
+        text_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=text_offsets[1:])
+        text = np.frombuffer(b"".join(texts), dtype=np.uint8)
+
+        store = cls(
+            strings, ids, roles, skill_offsets,
+            np.asarray(skill_ids, dtype=np.int32), text_offsets, text,
+        )
+        store._deleted = ids < 0
+        return store
+
+    # -------------------------------------------------
+    # PERSISTENCE
+    # -------------------------------------------------
+
+    def save(self, art_dir: str):
+        """
+        Write the snapshot columns (rows added since are not included).
+        Raises OSError when `art_dir` is not writable.
+        """
+        strings = {
+            "roles": self.role_names,
+            "roles_norm": self.role_names_norm,
+            "skills": self.skill_names,
+            "skills_norm": self.skill_names_norm,
+        }
+        # unique temp file + rename per file: concurrent writers never share
+        # a temp file and stores already mapped from the old file stay valid
+        with atomic_write_path(os.path.join(art_dir, STRINGS_FILE)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(strings, f, ensure_ascii=False, indent=2)
+        ids = np.where(self._deleted_base(), -1, self._ids)
+        for name, arr in (
+            (IDS_FILE, ids),
+            (ROLES_FILE, self._roles),
+            (SKILL_OFFSETS_FILE, self._skill_offsets),
+            (SKILL_IDS_FILE, self._skill_ids),
+            (TEXT_OFFSETS_FILE, self._text_offsets),
+            (TEXT_FILE, self._text),
+        ):
+            with atomic_write_path(os.path.join(art_dir, name)) as tmp:
+                with open(tmp, "wb") as f:
+                    np.save(f, np.asarray(arr))
+
+    @classmethod
+    def load(cls, art_dir: str, mmap: bool = True) -> Optional["MetaStore"]:
+        """None when the store files are missing."""
+        paths = {name: os.path.join(art_dir, name) for name in STORE_FILES}
+        if not all(os.path.exists(p) for p in paths.values()):
+            return None
+        mode = "r" if mmap else None
+        store = cls(
+            load_json(paths[STRINGS_FILE], default={}),
+            np.load(paths[IDS_FILE], mmap_mode=mode),
+            np.load(paths[ROLES_FILE], mmap_mode=mode),
+            np.load(paths[SKILL_OFFSETS_FILE], mmap_mode=mode),
+            np.load(paths[SKILL_IDS_FILE], mmap_mode=mode),
+            np.load(paths[TEXT_OFFSETS_FILE], mmap_mode=mode),
+            np.load(paths[TEXT_FILE], mmap_mode=mode),
+        )
+        store._deleted = np.asarray(store._ids) < 0
+        return store
+
+    # -------------------------------------------------
+    # RECORD ACCESS
+    # -------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n_base + len(self._extra)
+
+    def _deleted_base(self) -> np.ndarray:
+        return self._deleted[:self._n_base]
+
+    def is_deleted(self, row: int) -> bool:
+        if row < self._n_base:
+            return bool(self._deleted[row])
+        return self._extra[row - self._n_base] is None
+
+    def record(self, row: int, fields: Iterable[str] = FIELDS) -> Optional[Dict[str, Any]]:
+        """Decode `fields` of one row; None if the row was deleted."""
+        if row < 0:
+            row += len(self)
+        if row >= self._n_base:
+            rec = self._extra[row - self._n_base]
+            return None if rec is None else {f: rec[f] for f in fields if f in rec}
+        if self._deleted[row]:
+            return None
+
+        out: Dict[str, Any] = {}
+        for f in fields:
+            if f == "job_position":
+                out[f] = self.role_names[self._roles[row]]
+            elif f == "job_position_norm":
+                out[f] = self.role_names_norm[self._roles[row]]
+            elif f in ("skills", "skills_norm"):
+                names = self.skill_names if f == "skills" else self.skill_names_norm
+                lo, hi = self._skill_offsets[row:row + 2].tolist()
+                out[f] = [names[j] for j in self._skill_ids[lo:hi].tolist()]
+            elif f == "text":
+                lo, hi = self._text_offsets[row:row + 2].tolist()
+                out[f] = self._text[lo:hi].tobytes().decode("utf-8")
+            elif f == "id":
+                out[f] = int(self._ids[row])
+        return out
+
+    def __getitem__(self, row: int) -> Optional[Dict[str, Any]]:
+        return self.record(row)
+
+    def __iter__(self) -> Iterator[Optional[Dict[str, Any]]]:
+        return self.iter_records()
+
+    def iter_records(self, fields: Iterable[str] = FIELDS) -> Iterator[Optional[Dict[str, Any]]]:
+        """Records in row order, decoding only `fields` (skip "text" when it isn't needed)."""
+        fields = tuple(fields)
+        for row in range(len(self)):
+            yield self.record(row, fields)
+
+    def posting_ids(self) -> np.ndarray:
+        """Posting id per row, -1 for deleted rows."""
+        base = np.where(self._deleted_base(), -1, self._ids)
+        extra = np.fromiter(
+            (-1 if rec is None else rec["id"] for rec in self._extra),
+            dtype=np.int64,
+            count=len(self._extra),
+        )
+        return np.concatenate([base, extra]).astype(np.int64, copy=False)
+
+    def find_role(self, role: str) -> Optional[Dict[str, Any]]:
+        """First live record whose job_position matches `role` (case / space insensitive)."""
+        want = role.lower().strip()
+        matches = [i for i, name in enumerate(self.role_names) if name.lower().strip() == want]
+        if matches:
+            rows = np.flatnonzero(np.isin(self._roles, matches) & ~self._deleted_base())
+            if len(rows):
+                return self.record(int(rows[0]))
+        for rec in self._extra:
+            if rec is not None and rec.get("job_position", "").lower().strip() == want:
+                return dict(rec)
+        return None
+
+    # -------------------------------------------------
+    # CHANGES ON TOP OF THE SNAPSHOT
+    # -------------------------------------------------
+
+    def append(self, rec: Dict[str, Any]):
+        self._extra.append(rec)
+
+    def delete(self, row: int):
+        if row < self._n_base:
+            self._deleted[row] = True
+        else:
+            self._extra[row - self._n_base] = None
+
+
+def _snapshot_mtime(art_dir: str) -> float:
+    """Modification time of the oldest store file (the snapshot is only as new as that)."""
+    return min(os.path.getmtime(os.path.join(art_dir, name)) for name in STORE_FILES)
+
+
+@contextmanager
+def _store_lock(art_dir: str, exclusive: bool):
+    """
+    flock on the artifacts' lock file: loads share it, a conversion holds
+    it exclusively. Without a writable lock file (read-only artifacts)
+    nothing can be converted in place, so nothing is locked.
+    """
+    try:
+        f = open(os.path.join(art_dir, LOCK_FILE), "a+b") if fcntl is not None else None
+    except OSError:
+        f = None
+    if f is None:
+        yield
+        return
+    with f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _load_current(art_dir: str) -> Optional[MetaStore]:
+    """The store, unless faiss_meta.json is missing from it or newer than it."""
+    json_path = os.path.join(art_dir, META_JSON_FILE)
+    store = MetaStore.load(art_dir)
+    if store is not None and not (
+        os.path.exists(json_path) and os.path.getmtime(json_path) > _snapshot_mtime(art_dir)
+    ):
+        return store
+    return None
+
+
+def open_meta_store(art_dir: str) -> MetaStore:
+    """
+    Memory-mapped store from `art_dir`. faiss_meta.json is converted when
+    there is no store yet (fresh checkout) or when it is newer than the
+    store (artifacts replaced by another build); an empty store if
+    neither exists. If the converted store cannot be written (read-only
+    artifacts) it is used from memory.
+
+    Processes starting together (batch_ingest workers) convert once: the
+    conversion holds an exclusive lock and the others load its result.
+    """
+    with _store_lock(art_dir, exclusive=False):
+        store = _load_current(art_dir)
+    if store is not None:
+        return store
+
+    with _store_lock(art_dir, exclusive=True):
+        store = _load_current(art_dir)
+        if store is not None:
+            return store  # converted by another process meanwhile
+
+        records = load_json(os.path.join(art_dir, META_JSON_FILE), default=None)
+        if records is None:
+            # unreadable or missing JSON: keep any (stale) snapshot
+            return MetaStore.load(art_dir) or MetaStore.from_records([])
+        store = MetaStore.from_records(records)
+        if records:
+            try:
+                store.save(art_dir)
+            except OSError:
+                return store
+            store = MetaStore.load(art_dir) or store
+        return store
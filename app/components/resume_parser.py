@@ -1,8 +1,34 @@
-from typing import Tuple
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import io
+import os
 import re
+import time
+import signal
 from components.utils import clean_text
 
 
+# Bump whenever extraction output changes so cached results are invalidated.
+PARSER_VERSION = "3"
+
+
+# -------------------------------------------------
+# PARALLEL EXTRACTION SETTINGS
+# -------------------------------------------------
+
+# Documents with fewer pages than this are parsed serially; spinning up a
+# process pool costs more than it saves on a typical 1-3 page resume.
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("RESUME_PARALLEL_PAGE_THRESHOLD", "16"))
+
+# A PDF given either as a filesystem path or as raw bytes already in memory
+PdfSource = Union[str, bytes]
+
+# Post-processed page: (lines, ends_with_break), see _process_page
+ProcessedPage = Tuple[List[str], bool]
+
+# Line-break characters recognised by str.splitlines()
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
 def _normalize_bullets(text: str) -> str:
     """
     Normalize common bullet characters to '-' so downstream
@@ -13,92 +39,501 @@ def _normalize_bullets(text: str) -> str:
     return re.sub(r"[•▪◦●‣∙]", "-", text)
 
 
-def _postprocess_lines(text: str) -> str:
+def _clean_line(ln: str) -> str:
+    """Strip junk characters and collapse excessive internal spacing."""
+    ln = ln.replace("\x00", " ").strip()
+    if not ln:
+        return ""  # preserve blank line for structure
+    # collapse excessive internal spacing (but not newlines)
+    return re.sub(r"[ \t]{2,}", " ", ln)
+
+
+def _process_page(page_text: str) -> ProcessedPage:
     """
-    Clean extracted text while PRESERVING structure.
-    - Keep newlines
-    - Remove junk-only lines
-    - Normalize spacing per line
+    Run bullet + line post-processing on a single page.
+
+    Returns (lines, ends_with_break). The flag records whether the raw page
+    ended on a line break, which decides how it joins with the next page.
     """
-    lines = []
-    for ln in text.splitlines():
-        ln = ln.replace("\x00", " ").strip()
-        if not ln:
-            lines.append("")  # preserve blank line for structure
-            continue
+    lines = [_clean_line(ln) for ln in _normalize_bullets(page_text).splitlines()]
+    # "\r" + the "\n" page separator collapses into one "\r\n" break
+    ends_with_break = page_text[-1] in _LINE_BREAKS and page_text[-1] != "\r"
+    return lines, ends_with_break
 
-        # collapse excessive internal spacing (but not newlines)
-        ln = re.sub(r"[ \t]{2,}", " ", ln)
-        lines.append(ln)
 
-    # collapse multiple blank lines to max 2
+def _join_lines(lines: List[str]) -> str:
+    """Join post-processed lines and apply the document-level cleanup."""
     cleaned = "\n".join(lines)
     cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
-    return cleaned.strip()
+    return clean_text(cleaned.strip())  # final light cleanup (safe)
+
+
+def _assemble_pages(pages: List[ProcessedPage]) -> str:
+    """
+    Join per-page results in page order.
+
+    Produces exactly what post-processing "\\n" + page for every page
+    as one string would, without re-scanning the whole document.
+    """
+    lines: List[str] = []
+    prev_break = True
+    for page_lines, ends_with_break in pages:
+        if prev_break:
+            lines.append("")
+        lines.extend(page_lines)
+        prev_break = ends_with_break
 
+    return _join_lines(lines)
 
-def extract_text_from_pdf(file_path: str) -> Tuple[str, int]:
+
+def _open_fitz(source: PdfSource):
+    import fitz  # PyMuPDF
+
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _open_pdfplumber(source: PdfSource):
+    import pdfplumber
+
+    if isinstance(source, bytes):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _fitz_page_text(page) -> str:
+    try:
+        return page.get_text("text") or ""
+    except Exception:
+        try:
+            return page.get_text() or ""
+        except Exception:
+            return ""
+
+
+def _process_raw(page_text: str) -> Optional[ProcessedPage]:
+    return _process_page(page_text) if page_text else None
+
+
+def _has_text(page: Optional[ProcessedPage]) -> bool:
+    return page is not None and any(page[0])
+
+
+def _extract_page_range(source: PdfSource, start: int, stop: int) -> List[Optional[ProcessedPage]]:
+    """
+    Process-pool worker: open the document independently and
+    post-process pages [start, stop). Pages without text are None.
+    """
+    doc = _open_fitz(source)
+    try:
+        return [_process_raw(_fitz_page_text(doc[i])) for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _page_ranges(page_count: int, n_chunks: int) -> List[Tuple[int, int]]:
+    step = -(-page_count // n_chunks)
+    return [(s, min(s + step, page_count)) for s in range(0, page_count, step)]
+
+
+def _extract_parallel(source: PdfSource, page_count: int, max_workers: Optional[int]) -> List[Optional[ProcessedPage]]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, page_count))
+    ranges = _page_ranges(page_count, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_page_range, source, s, e) for s, e in ranges]
+        chunks = [f.result() for f in futures]  # page order preserved
+
+    return [page for chunk in chunks for page in chunk]
+
+
+def _pdfplumber_page_text(pdf, i: int) -> str:
+    if i >= len(pdf.pages):
+        return ""
+    try:
+        return pdf.pages[i].extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract(
+    source: PdfSource,
+    parallel: Optional[bool],
+    parallel_threshold: int,
+    max_workers: Optional[int],
+) -> Tuple[str, int, List[Optional[str]]]:
+    page_count = 0
+    pages: Optional[List[Optional[ProcessedPage]]] = None
+
+    # ---------- Try PyMuPDF ----------
+    try:
+        doc = _open_fitz(source)
+        page_count = len(doc)
+
+        use_parallel = parallel if parallel is not None else page_count >= parallel_threshold
+
+        if use_parallel and page_count > 1:
+            doc.close()
+            doc = None
+            try:
+                pages = _extract_parallel(source, page_count, max_workers)
+            except Exception:
+                pass  # pool unavailable – go serial
+
+        if pages is None:
+            doc = doc or _open_fitz(source)
+            try:
+                pages = [_process_raw(_fitz_page_text(page)) for page in doc]
+            finally:
+                doc.close()
+
+    except Exception:
+        pages = None  # fitz unusable – every page goes to pdfplumber
+
+    backends: List[Optional[str]] = (
+        ["pymupdf" if _has_text(p) else None for p in pages] if pages is not None else []
+    )
+
+    # ---------- Fallback: pdfplumber, only for pages fitz missed ----------
+    if pages is None or not all(backends):
+        try:
+            with _open_pdfplumber(source) as pdf:
+                if pages is None:
+                    page_count = len(pdf.pages)
+                    pages = [None] * page_count
+                    backends = [None] * page_count
+
+                for i, backend in enumerate(backends):
+                    if backend:
+                        continue
+                    fallback = _process_raw(_pdfplumber_page_text(pdf, i))
+                    if _has_text(fallback):
+                        pages[i] = fallback
+                        backends[i] = "pdfplumber"
+        except Exception:
+            pass
+
+    text = _assemble_pages([p for p in (pages or []) if p is not None])
+    if not text:
+        return "", 0, []
+    return text, page_count, backends
+
+
+def extract_text_from_pdf(
+    file_path: str,
+    parallel: Optional[bool] = None,
+    parallel_threshold: int = PARALLEL_PAGE_THRESHOLD,
+    max_workers: Optional[int] = None,
+) -> Tuple[str, int]:
     """
     Return (text, page_count).
 
     Strategy:
     1) Try PyMuPDF (fitz) – fast, accurate (preferred on macOS M-series)
-    2) Fallback to pdfplumber
+    2) Fallback to pdfplumber, only for the pages fitz left empty
+
+    Documents with at least `parallel_threshold` pages are split into
+    page ranges and extracted across a process pool (each worker opens
+    the file itself). `parallel=True/False` forces either path. Output
+    is identical to the serial path.
 
     If neither works, returns ("", 0).
     """
-    text = ""
-    page_count = 0
+    return _extract(file_path, parallel, parallel_threshold, max_workers)[:2]
 
-    # ---------- Try PyMuPDF ----------
+
+def _iter_pages(
+    source: PdfSource,
+    max_pages: Optional[int] = None,
+    parallel_threshold: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[int, int, Optional[ProcessedPage], Optional[str]]]:
+    """
+    Yield (page_index, page_count, processed_page, backend) for every
+    page read, reading each page with PyMuPDF first and retrying pages it
+    leaves empty with pdfplumber. backend is "pymupdf" or "pdfplumber",
+    or None when neither found text (processed_page is then None or
+    blank). Stops after `max_pages` pages. A document that fails partway
+    through raises, so callers can tell it from a complete one.
+
+    With `parallel_threshold`, documents with at least that many pages
+    to read have their PyMuPDF pass split across a process pool before
+    the first page is yielded (see _extract_parallel).
+    """
     try:
-        import fitz  # PyMuPDF
+        doc = _open_fitz(source)
+    except Exception:
+        doc = None
 
-        doc = fitz.open(file_path)
-        page_count = len(doc)
+    pdf = None
+    plumber_ok = True
+
+    try:
+        if doc is not None:
+            page_count = len(doc)
+        else:
+            pdf = _open_pdfplumber(source)
+            page_count = len(pdf.pages)
 
-        for page in doc:
-            page_text = ""
+        page_total = page_count if max_pages is None else min(page_count, max_pages)
+
+        fitz_pages = None
+        use_parallel = (
+            doc is not None and parallel_threshold is not None
+            and page_total > 1 and page_total >= parallel_threshold
+        )
+        if use_parallel:
             try:
-                page_text = page.get_text("text") or ""
+                fitz_pages = _extract_parallel(source, page_total, max_workers)
             except Exception:
-                try:
-                    page_text = page.get_text() or ""
-                except Exception:
-                    page_text = ""
+                pass  # pool unavailable – go serial
 
-            if page_text:
-                text += "\n" + page_text
+        for i in range(page_total):
+            if fitz_pages is not None:
+                page = fitz_pages[i]
+            else:
+                page = _process_raw(_fitz_page_text(doc[i])) if doc is not None else None
+            backend = "pymupdf" if _has_text(page) else None
 
-        doc.close()
+            if not _has_text(page) and plumber_ok:
+                if pdf is None:
+                    try:
+                        pdf = _open_pdfplumber(source)
+                    except Exception:
+                        plumber_ok = False
+                if pdf is not None:
+                    fallback = _process_raw(_pdfplumber_page_text(pdf, i))
+                    if _has_text(fallback):
+                        page, backend = fallback, "pdfplumber"
+
+            yield i, page_count, page, backend
+
+    finally:
+        if doc is not None:
+            doc.close()
+        if pdf is not None:
+            pdf.close()
+
+
+def iter_text_pages(
+    source: PdfSource,
+    max_pages: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Yield normalized text page by page as it is extracted, skipping
+    pages without text. Only the current page is held in memory, and
+    iteration stops after `max_pages` pages have been read.
+
+    `source` is a file path or the raw PDF bytes. Each page is read with
+    PyMuPDF first; pages it leaves empty are retried with pdfplumber.
+    """
+    for _, _, page, _ in _iter_pages(source, max_pages):
+        if _has_text(page):
+            yield _join_lines(page[0])
+
+
+# -------------------------------------------------
+# EXTRACTION BUDGET (PATHOLOGICAL PDFs)
+# -------------------------------------------------
+
+class ExtractionBudget(NamedTuple):
+    """Limits for one extraction. None disables a limit."""
+    max_pages: Optional[int] = None
+    max_chars: Optional[int] = None
+    timeout: Optional[float] = None  # wall-clock seconds
+
+
+DEFAULT_BUDGET = ExtractionBudget(
+    max_pages=int(os.getenv("RESUME_MAX_PAGES", "50")),
+    max_chars=int(os.getenv("RESUME_MAX_CHARS", "200000")),
+    timeout=float(os.getenv("RESUME_EXTRACT_TIMEOUT", "20")),
+)
 
-        if text.strip():
-            text = _normalize_bullets(text)
-            text = _postprocess_lines(text)
-            text = clean_text(text)  # final light cleanup (safe)
-            return text, page_count
 
+def _extract_within_budget(
+    source: PdfSource,
+    max_pages: Optional[int],
+    max_chars: Optional[int],
+    emit: Callable[[tuple], None],
+    parallel_threshold: Optional[int] = None,
+):
+    """
+    Stream pages with text to `emit` as ("page", index, page_count, page,
+    backend) messages, stopping early once `max_chars` characters have been
+    produced, then emit ("done", pages_read, page_count). Pages without
+    text count as read. Errors from the PDF libraries propagate.
+    Long documents are read in parallel above `parallel_threshold` pages.
+    """
+    chars = 0
+    pages_read = 0
+    page_count = 0
+    for i, page_count, page, backend in _iter_pages(source, max_pages, parallel_threshold):
+        pages_read = i + 1
+        if page is None:
+            continue
+        emit(("page", i, page_count, page, backend))
+        chars += sum(len(ln) + 1 for ln in page[0])
+        if max_chars is not None and chars >= max_chars:
+            break
+    emit(("done", pages_read, page_count))
+
+
+def _budget_worker(source: PdfSource, max_pages, max_chars, parallel_threshold, queue):
+    if hasattr(os, "setsid"):
+        # own process group, so a kill at the deadline also reaches the
+        # page-range pool started for long documents
+        os.setsid()
+    try:
+        _extract_within_budget(source, max_pages, max_chars, queue.put, parallel_threshold)
     except Exception:
-        pass  # silently fall back
+        queue.put(("error",))
+
+
+def _kill_worker(proc):
+    """Kill a budget worker and any pool processes it started."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass  # exited, or killed before it had its own group
+    if proc.is_alive():
+        proc.kill()
+
+
+_mp_context = None
+
+
+def _budget_context():
+    """
+    Process context for budget workers. Forking the (multithreaded)
+    Streamlit server can copy a lock held by another thread into the
+    child and hang its first import, so workers come from a forkserver
+    that preloads the PDF libraries (spawn where that is unavailable).
+    """
+    global _mp_context
+    if _mp_context is None:
+        import multiprocessing
+
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _mp_context = multiprocessing.get_context("forkserver")
+            _mp_context.set_forkserver_preload(["components.resume_parser", "fitz", "pdfplumber"])
+        else:
+            _mp_context = multiprocessing.get_context("spawn")
+    return _mp_context
 
-    # ---------- Fallback: pdfplumber ----------
+
+def _collect_in_subprocess(
+    source: PdfSource,
+    budget: ExtractionBudget,
+) -> Tuple[List[tuple], str, Optional[tuple]]:
+    """
+    Run extraction in a child process that is killed at the deadline.
+    Returns the page messages received so far, a status and the
+    worker's ("done", pages_read, page_count) message (None unless the
+    status is "ok").
+    """
+    import queue as queue_mod
+
+    ctx = _budget_context()
+    queue = ctx.Queue()
+    # not a daemon: daemonic processes cannot start the page-range pool
+    proc = ctx.Process(
+        target=_budget_worker,
+        args=(source, budget.max_pages, budget.max_chars, PARALLEL_PAGE_THRESHOLD, queue),
+    )
+
+    messages: List[tuple] = []
+    status = "timeout"
+    done = None
+    deadline = time.monotonic() + budget.timeout
+
+    proc.start()
     try:
-        import pdfplumber
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                msg = queue.get(timeout=min(remaining, 0.25))
+            except queue_mod.Empty:
+                if not proc.is_alive() and queue.empty():
+                    status = "error"  # worker died without reporting
+                    break
+                continue
 
-        with pdfplumber.open(file_path) as pdf:
-            page_count = len(pdf.pages)
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                if page_text:
-                    text += "\n" + page_text
+            if msg[0] == "page":
+                messages.append(msg)
+            elif msg[0] == "done":
+                status, done = "ok", msg
+                break
+            else:
+                status = "error"
+                break
+    finally:
+        _kill_worker(proc)
+        proc.join()
+        queue.close()
 
-        if text.strip():
-            text = _normalize_bullets(text)
-            text = _postprocess_lines(text)
-            text = clean_text(text)
-            return text, page_count
+    return messages, status, done
 
-    except Exception:
-        return "", 0
 
-    return "", 0
+def extract_text_with_budget(
+    source: PdfSource,
+    budget: ExtractionBudget = DEFAULT_BUDGET,
+) -> Dict[str, Any]:
+    """
+    Extract text (path or raw bytes) without letting one document block
+    the caller. Returns a dict with text, page_count, pages_read,
+    page_backends (per page read: "pymupdf", "pdfplumber" or None) and
+    status:
+
+    - "ok":        full document extracted
+    - "truncated": stopped at max_pages / max_chars
+    - "timeout":   killed at the deadline; text holds the pages read so far
+    - "error":     extraction crashed; text holds the pages read so far
+
+    With a timeout, extraction runs in a separate process that is killed
+    when the deadline passes, so hangs inside fitz/pdfplumber cannot
+    stall the worker. Documents with at least PARALLEL_PAGE_THRESHOLD
+    pages to read are split across a process pool inside that process.
+    """
+    if budget.timeout is not None:
+        messages, status, done = _collect_in_subprocess(source, budget)
+    else:
+        messages = []
+        status = "ok"
+        done = None
+        try:
+            _extract_within_budget(source, budget.max_pages, budget.max_chars, messages.append)
+            done = messages.pop()
+        except Exception:
+            status = "error"
+
+    if done is not None:
+        _, pages_read, page_count = done
+    else:
+        # timeout / error: pages up to the last one received were read
+        pages_read = messages[-1][1] + 1 if messages else 0
+        page_count = messages[-1][2] if messages else 0
+    text = _assemble_pages([m[3] for m in messages])
+    page_backends: List[Optional[str]] = [None] * pages_read
+    for m in messages:
+        page_backends[m[1]] = m[4]
+
+    if status == "ok" and pages_read < page_count:
+        status = "truncated"
+    if budget.max_chars is not None and len(text) > budget.max_chars:
+        text = text[:budget.max_chars]
+        if status == "ok":
+            status = "truncated"
+
+    return {
+        "text": text,
+        "page_count": page_count,
+        "pages_read": pages_read,
+        "page_backends": page_backends,
+        "status": status,
+    }
@@ -0,0 +1,120 @@
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from scipy import sparse
+
+from .ats_scoring import AnalyzedResume
+from .meta_store import MetaStore
+from .skill_matcher import get_skill_matcher
+from .utils import normalize_token
+
+
+# -------------------------------------------------
+# ROLE x SKILL MATRIX
+# -------------------------------------------------
+
+class RoleSkillMatrix:
+    """
+    Required skills of every role (faiss_meta records) as one sparse
+    role x skill incidence matrix. A resume is tokenized and matched
+    against the union of all role skills once; per-role keyword match
+    rates then come from a single matrix-vector product and equal
+    `keyword_match_rate(resume, role["skills"])`. Deleted postings
+    (None rows) are left out.
+    """
+
+    def __init__(self, meta: Union[MetaStore, List[dict]]):
+        if isinstance(meta, MetaStore):
+            # role names and skills only; JD texts stay undecoded
+            meta = meta.iter_records(("job_position", "skills"))
+        meta = [m for m in meta if m is not None]
+        self.roles: List[str] = [m.get("job_position", "") for m in meta]
+
+        col: Dict[str, int] = {}
+        self.skill_names: List[str] = []  # display name per column
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, m in enumerate(meta):
+            row_cols = set()
+            for s in m.get("skills") or []:
+                norm = normalize_token(s) if s else ""
+                if not norm:
+                    continue
+                j = col.get(norm)
+                if j is None:
+                    j = col[norm] = len(self.skill_names)
+                    self.skill_names.append(s)
+                row_cols.add(j)
+            rows.extend([i] * len(row_cols))
+            cols.extend(sorted(row_cols))
+
+        self.skills: List[str] = list(col)
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.roles), len(self.skills)),
+        )
+        self.skill_counts = np.diff(self.matrix.indptr)
+        self.matcher = get_skill_matcher(self.skills)
+        self._col = col
+
+    def resume_vector(self, text: Union[str, AnalyzedResume]) -> np.ndarray:
+        """0/1 vector over `skills`: which role skills the resume contains."""
+        doc = text if isinstance(text, AnalyzedResume) else AnalyzedResume(text)
+        x = np.zeros(len(self.skills), dtype=np.float32)
+        if doc.text and len(self.matcher):
+            hits = [self._col[s] for s in self.matcher.matched(doc.normalized_tokens)]
+            x[hits] = 1.0
+        return x
+
+    def match_rates(self, text: Union[str, AnalyzedResume]) -> np.ndarray:
+        """Keyword match rate of the resume for every role."""
+        hits = self.matrix @ self.resume_vector(text)
+        return hits / np.maximum(self.skill_counts, 1)
+
+    def rank(
+        self,
+        text: Union[str, AnalyzedResume],
+        top_k: Optional[int] = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Roles ordered by keyword match rate (ties keep meta order), with
+        matched and missing skills for the `top_k` returned roles. Many
+        postings share a job title; each title is listed once, with its
+        best-matching posting.
+        """
+        x = self.resume_vector(text)
+        hits = self.matrix @ x
+        rates = hits / np.maximum(self.skill_counts, 1)
+
+        order = np.argsort(-rates, kind="stable")
+
+        ranked = []
+        seen = set()
+        indptr, indices = self.matrix.indptr, self.matrix.indices
+        for i in order:
+            if top_k is not None and len(ranked) >= top_k:
+                break
+            key = self.roles[i].strip().casefold()
+            if key in seen:
+                continue
+            seen.add(key)
+            row = indices[indptr[i]:indptr[i + 1]]
+            present = x[row] > 0
+            ranked.append({
+                "role": self.roles[i],
+                "match_rate": round(float(rates[i]), 3),
+                "matched": [self.skill_names[j] for j in row[present]],
+                "missing": [self.skill_names[j] for j in row[~present]],
+            })
+        return ranked
+
+
+_matrix_cache: Dict[str, Any] = {"meta": None, "matrix": None}
+
+
+def get_role_skill_matrix(meta: Union[MetaStore, List[dict]]) -> RoleSkillMatrix:
+    """Matrix for a meta list, rebuilt only when a different list is passed."""
+    if _matrix_cache["meta"] is not meta:
+        _matrix_cache["matrix"] = RoleSkillMatrix(meta)
+        _matrix_cache["meta"] = meta
+    return _matrix_cache["matrix"]
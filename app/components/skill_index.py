@@ -0,0 +1,136 @@
+import json
+import os
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .ats_scoring import AnalyzedResume
+from .skill_matcher import SkillMatcher, get_skill_matcher
+from .utils import atomic_write_path, load_json, normalize_token
+
+
+# -------------------------------------------------
+# ARTIFACT FILES
+# -------------------------------------------------
+
+VOCAB_FILE = "skills_vocab.json"      # sorted normalized skills; position = skill id
+POSTINGS_FILE = "skill_postings.npy"  # int32 role ids, grouped by skill id
+OFFSETS_FILE = "skill_offsets.npy"    # int64, postings of skill i = [offsets[i], offsets[i+1])
+
+
+# -------------------------------------------------
+# INVERTED SKILL INDEX
+# -------------------------------------------------
+
+class SkillIndex:
+    """
+    Normalized skill -> ids of the roles (rows of faiss_meta) requiring it.
+
+    Postings are stored CSR-style in two .npy files that are memory-mapped
+    on load; document frequency is the length of a skill's posting list.
+    """
+
+    def __init__(self, vocab: List[str], postings: np.ndarray, offsets: np.ndarray, n_roles: int):
+        self.vocab = vocab
+        self.postings = postings
+        self.offsets = offsets
+        self.n_roles = n_roles
+        self._ids = {s: i for i, s in enumerate(vocab)}
+
+        self.df = np.diff(offsets).astype(np.int32)
+        # smoothed IDF, as in sklearn's TfidfVectorizer
+        self.idf = np.log((1 + n_roles) / (1 + self.df)) + 1.0
+
+        # total IDF of each role's skills, the denominator of role scores
+        self.role_weight = np.zeros(n_roles, dtype=np.float64)
+        np.add.at(self.role_weight, np.asarray(postings), np.repeat(self.idf, self.df))
+
+        self._matcher: Optional[SkillMatcher] = None
+
+    @classmethod
+    def build(cls, role_skills: Sequence[Iterable[str]]) -> "SkillIndex":
+        """`role_skills[r]` are the (raw or normalized) skills of role r."""
+        by_skill = {}
+        for role_id, skills in enumerate(role_skills):
+            for s in {normalize_token(s) for s in skills if s}:
+                by_skill.setdefault(s, []).append(role_id)
+
+        vocab = sorted(by_skill)
+        lists = [by_skill[s] for s in vocab]
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in lists])
+        postings = np.fromiter(
+            (r for p in lists for r in p), dtype=np.int32, count=int(offsets[-1])
+        )
+        return cls(vocab, postings, offsets, len(role_skills))
+
+    # -------------------------------------------------
+    # PERSISTENCE
+    # -------------------------------------------------
+
+    def save(self, art_dir: str):
+        # unique temp file + rename per file: indexes already mapped from
+        # the old postings / offsets stay valid, and readers never load a
+        # partial file
+        with atomic_write_path(os.path.join(art_dir, VOCAB_FILE)) as tmp:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.vocab, f, ensure_ascii=False, indent=2)
+        for name, arr in (
+            (POSTINGS_FILE, np.asarray(self.postings, dtype=np.int32)),
+            (OFFSETS_FILE, np.asarray(self.offsets, dtype=np.int64)),
+        ):
+            with atomic_write_path(os.path.join(art_dir, name)) as tmp:
+                with open(tmp, "wb") as f:
+                    np.save(f, arr)
+
+    @classmethod
+    def load(cls, art_dir: str, n_roles: int, mmap: bool = True) -> Optional["SkillIndex"]:
+        """None when the index files are missing (artifacts built before it existed)."""
+        paths = [os.path.join(art_dir, f) for f in (VOCAB_FILE, POSTINGS_FILE, OFFSETS_FILE)]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        mode = "r" if mmap else None
+        vocab = load_json(paths[0], default=[])
+        postings = np.load(paths[1], mmap_mode=mode)
+        offsets = np.load(paths[2], mmap_mode=mode)
+        return cls(vocab, postings, offsets, n_roles)
+
+    # -------------------------------------------------
+    # LOOKUPS
+    # -------------------------------------------------
+
+    def roles_for(self, skill: str) -> np.ndarray:
+        i = self._ids.get(normalize_token(skill))
+        if i is None:
+            return np.zeros(0, dtype=np.int32)
+        return np.asarray(self.postings[self.offsets[i]:self.offsets[i + 1]])
+
+    def skills_in(self, text: Union[str, AnalyzedResume]) -> List[int]:
+        """Ids of the indexed skills that occur in a resume."""
+        if self._matcher is None:
+            self._matcher = get_skill_matcher(self.vocab)
+        doc = text if isinstance(text, AnalyzedResume) else AnalyzedResume(text)
+        if not doc.text or not len(self._matcher):
+            return []
+        return sorted(self._ids[s] for s in self._matcher.matched(doc.normalized_tokens))
+
+    def role_scores(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """
+        Per role: IDF of the given skills it requires / IDF of all its
+        skills. Rare skills weigh more than ones every role lists.
+        """
+        scores = np.zeros(self.n_roles, dtype=np.float64)
+        for i in skill_ids:
+            scores[self.postings[self.offsets[i]:self.offsets[i + 1]]] += self.idf[i]
+        return scores / np.maximum(self.role_weight, 1e-12)
+
+    def candidate_roles(
+        self,
+        text: Union[str, AnalyzedResume],
+        k: int = 5,
+    ) -> List[Tuple[int, float]]:
+        """Top-k (role id, IDF-weighted keyword score), roles with no hits skipped."""
+        scores = self.role_scores(self.skills_in(text))
+        hit = np.flatnonzero(scores > 0)
+        order = hit[np.argsort(-scores[hit], kind="stable")][:k]
+        return [(int(r), float(scores[r])) for r in order]
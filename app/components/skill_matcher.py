@@ -0,0 +1,150 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
+
+from .utils import TOKEN_PATTERN, normalize_token, normalize_tokens
+
+
+# -------------------------------------------------
+# TOKENIZATION
+# -------------------------------------------------
+
+_STEP_CACHE_SIZE = 200_000
+
+
+def normalized_tokens(text: str) -> List[str]:
+    """normalize_token applied to every token of `text`; empty results dropped."""
+    return [n for n in map(normalize_token, TOKEN_PATTERN.findall(text or "")) if n]
+
+
+def tokenize_normalized(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split text into tokens and normalize each one.
+    Returns (normalized_tokens, spans) where spans are (start, end)
+    offsets into `text`. Tokens that normalize to "" are dropped.
+    """
+    toks = normalize_tokens(text)
+    return [n for n, _, _ in toks], [(a, b) for _, a, b in toks]
+
+
+# -------------------------------------------------
+# AHO-CORASICK SKILL MATCHER
+# -------------------------------------------------
+
+class SkillMatcher:
+    """
+    Multi-pattern automaton over normalized skills.
+
+    A skill matches when its normalized form equals the concatenation of
+    one or more consecutive normalized resume tokens, so "Node js" still
+    matches "Node.js", "React" matches "React.js" and "Python" matches
+    "Python3" (see utils.TOKEN_PATTERN), but "javascript" no longer
+    matches "java". The
+    whole token stream is scanned once regardless of vocabulary size.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = sorted({normalize_token(s) for s in skills if s} - {""})
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # (state, token) -> state after consuming the whole token; resumes
+        # repeat the same tokens, so most steps become one dict lookup
+        self._step: Dict[Tuple[int, str], int] = {}
+
+        for pid, pat in enumerate(self.skills):
+            state = 0
+            for ch in pat:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+
+        # breadth-first failure links; outputs inherit from their fail state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _advance(self, state: int, tok: str) -> int:
+        goto, fail = self._goto, self._fail
+        for ch in tok:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+        return state
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def match_tokens(self, norm_tokens: List[str]) -> Iterator[Tuple[str, int, int]]:
+        """
+        Yield (skill, first_token, last_token_exclusive) for every
+        token-aligned occurrence in a normalized token stream.
+        """
+        out, skills, step = self._out, self.skills, self._step
+        if len(step) > _STEP_CACHE_SIZE:
+            step.clear()
+
+        # normalized-stream offset -> index of the token starting there
+        starts: Dict[int, int] = {}
+        offset = 0
+        state = 0
+
+        for ti, tok in enumerate(norm_tokens):
+            starts[offset] = ti
+            key = (state, tok)
+            nxt = step.get(key)
+            if nxt is None:
+                nxt = step[key] = self._advance(state, tok)
+            state = nxt
+            offset += len(tok)
+
+            # matches must end on a token boundary ...
+            for pid in out[state]:
+                first = starts.get(offset - len(skills[pid]))
+                # ... and start on one
+                if first is not None:
+                    yield skills[pid], first, ti + 1
+
+    def find(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Map each matched skill to its (start, end) offsets in `text`."""
+        norms, spans = tokenize_normalized(text)
+        return self.find_in_tokens(norms, spans)
+
+    def find_in_tokens(
+        self,
+        norm_tokens: List[str],
+        spans: List[Tuple[int, int]],
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        for skill, first, last in self.match_tokens(norm_tokens):
+            hits.setdefault(skill, []).append((spans[first][0], spans[last - 1][1]))
+        return hits
+
+    def matched(self, norm_tokens: List[str]) -> Set[str]:
+        return {skill for skill, _, _ in self.match_tokens(norm_tokens)}
+
+
+@lru_cache(maxsize=64)
+def _compiled(skills_norm: FrozenSet[str]) -> SkillMatcher:
+    return SkillMatcher(skills_norm)
+
+
+def get_skill_matcher(skills: Iterable[str]) -> SkillMatcher:
+    """Compiled matcher for a skill vocabulary, cached per vocabulary."""
+    if isinstance(skills, SkillMatcher):
+        return skills
+    return _compiled(frozenset(normalize_token(s) for s in skills if s))
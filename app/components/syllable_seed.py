@@ -0,0 +1,61 @@
+"""
+Syllable counts for common English and resume/tech words, used to seed the
+readability syllable cache. Counts follow pyphen's en_US hyphenation
+(positions + 1), the same rule textstat applies, so seeded and computed
+words agree.
+"""
+
+SYLLABLE_SEED = {
+    "a": 1, "ability": 3, "about": 1, "above": 1, "academics": 2, "accuracy": 4, "achieved": 1,
+    "achievements": 2, "across": 1, "after": 2, "again": 1, "against": 1, "agile": 2, "ai": 1,
+    "airflow": 2, "all": 1, "also": 2, "an": 1, "analysis": 3, "analytical": 5, "analytics": 4,
+    "analyzed": 3, "and": 1, "android": 2, "angular": 3, "any": 1, "api": 1, "apis": 1,
+    "application": 4, "applications": 4, "architecture": 4, "are": 1, "as": 1, "at": 1,
+    "automated": 4, "automation": 4, "award": 1, "awarded": 2, "awards": 1, "aws": 1,
+    "azure": 1, "bachelor": 3, "backend": 2, "be": 1, "because": 2, "been": 1, "before": 2,
+    "being": 2, "below": 2, "between": 2, "both": 1, "business": 2, "but": 1, "by": 1, "can": 1,
+    "certification": 5, "certifications": 5, "certified": 3, "client": 1, "clients": 1,
+    "cloud": 1, "collaborated": 5, "college": 2, "communication": 5, "company": 3,
+    "computer": 3, "configured": 3, "could": 1, "courses": 2, "created": 3, "css": 1,
+    "customer": 2, "customers": 2, "dashboard": 2, "dashboards": 2, "data": 2, "database": 2,
+    "databases": 2, "databricks": 1, "degree": 2, "delivered": 3, "deployed": 2,
+    "deployment": 3, "design": 2, "designed": 2, "developed": 3, "developer": 4,
+    "development": 4, "devops": 2, "did": 1, "django": 2, "do": 1, "docker": 2, "does": 1,
+    "doing": 2, "down": 1, "during": 2, "each": 1, "education": 4, "employment": 3,
+    "engineer": 3, "engineering": 4, "enterprise": 3, "environment": 4, "etl": 1, "excel": 2,
+    "experience": 4, "expertise": 3, "fastapi": 1, "features": 2, "few": 1, "firebase": 2,
+    "flask": 1, "for": 1, "framework": 2, "from": 1, "frontend": 2, "further": 2, "gcp": 1,
+    "git": 1, "golang": 1, "gpa": 1, "graphql": 1, "had": 1, "hadoop": 1, "has": 1, "have": 1,
+    "having": 2, "he": 1, "her": 1, "here": 1, "hers": 1, "hibernate": 3, "him": 1, "his": 1,
+    "honors": 2, "how": 1, "html": 1, "i": 1, "if": 1, "implemented": 4, "improved": 2,
+    "improving": 3, "in": 1, "increased": 2, "industry": 3, "information": 4,
+    "infrastructure": 4, "integrated": 4, "integration": 4, "intern": 2, "internship": 3,
+    "into": 2, "ios": 1, "is": 1, "it": 1, "its": 1, "java": 2, "javascript": 1, "jenkins": 2,
+    "junit": 2, "just": 1, "kafka": 2, "knowledge": 2, "kotlin": 1, "kubernetes": 3,
+    "latency": 3, "lead": 1, "leadership": 3, "learning": 2, "led": 1, "licenses": 3,
+    "linux": 2, "llm": 1, "machine": 2, "maintained": 2, "management": 3, "manager": 3,
+    "master": 2, "me": 1, "microservice": 3, "microservices": 3, "migrated": 3, "ml": 1,
+    "mobile": 2, "model": 2, "models": 2, "mongodb": 2, "monitoring": 4, "more": 1, "most": 1,
+    "my": 1, "mysql": 1, "nlp": 1, "no": 1, "node": 1, "nor": 1, "not": 1, "now": 1, "numpy": 1,
+    "objective": 3, "of": 1, "off": 1, "on": 1, "once": 1, "only": 2, "operations": 4,
+    "optimization": 4, "optimized": 3, "or": 1, "oracle": 3, "other": 2, "our": 1, "out": 1,
+    "over": 1, "own": 1, "pandas": 2, "percentage": 3, "performance": 3, "pipeline": 2,
+    "pipelines": 2, "platform": 2, "platforms": 2, "postgresql": 2, "powerbi": 2,
+    "professional": 4, "profile": 2, "project": 1, "projects": 1, "python": 1, "pytorch": 2,
+    "qualifications": 5, "quality": 3, "rails": 1, "react": 2, "real": 2, "redis": 2,
+    "reduced": 2, "reliability": 6, "reporting": 3, "requirements": 3, "research": 2,
+    "responsible": 4, "rest": 1, "ruby": 2, "rust": 1, "same": 1, "scala": 1, "scalability": 5,
+    "scalable": 2, "science": 2, "scrum": 1, "security": 4, "selenium": 4, "senior": 2,
+    "server": 2, "service": 2, "services": 2, "she": 1, "should": 1, "skills": 1,
+    "snowflake": 1, "so": 1, "software": 2, "solution": 3, "solutions": 3, "some": 1,
+    "spark": 1, "spring": 1, "sql": 1, "stakeholders": 3, "strong": 1, "such": 1, "summary": 3,
+    "support": 2, "swift": 1, "system": 2, "systems": 2, "tableau": 1, "team": 1, "teams": 1,
+    "technical": 3, "technologies": 3, "technology": 4, "tensorflow": 3, "terraform": 2,
+    "testing": 2, "than": 1, "that": 1, "the": 1, "their": 1, "them": 1, "then": 1, "there": 1,
+    "these": 1, "they": 1, "this": 1, "those": 1, "through": 1, "throughput": 2, "to": 1,
+    "too": 1, "tools": 1, "typescript": 2, "under": 2, "university": 4, "until": 2, "up": 1,
+    "user": 2, "users": 1, "using": 2, "various": 3, "very": 1, "was": 1, "we": 1, "web": 1,
+    "were": 1, "what": 1, "when": 1, "where": 1, "which": 1, "while": 1, "who": 1, "whom": 1,
+    "why": 1, "will": 1, "with": 1, "work": 1, "worked": 1, "working": 2, "would": 1, "year": 1,
+    "years": 1, "you": 1, "your": 1,
+}
@@ -1,6 +1,11 @@
+import os
 import re
 import json
+import tempfile
+from contextlib import contextmanager
 from io import BytesIO
+from functools import lru_cache
+from typing import List, Tuple
 
 
 # -------------------------------------------------
@@ -24,6 +29,68 @@ def clean_text(text: str) -> str:
 # TECH TOKEN NORMALIZATION (CRITICAL)
 # -------------------------------------------------
 
+# Applied in order to the lowercased token. ".net" runs before the
+# "asp.net" entries, so those never fire and ASP.NET -> aspdotnet; the
+# table is kept as-is so persisted normalized skills stay valid.
+TOKEN_REPLACEMENTS = {
+    "c#": "csharp",
+    "c++": "cplusplus",
+    ".net core": "dotnetcore",
+    ".net": "dotnet",
+    "asp.net core": "aspnetcore",
+    "asp.net": "aspnet",
+    "web api": "webapi",
+    "rest api": "restapi",
+    "node.js": "nodejs",
+    "node js": "nodejs",
+    "javascript": "javascript",
+    "typescript": "typescript",
+}
+
+NORMALIZE_CACHE_SIZE = 65536
+NORMALIZE_CACHE_MAX_LEN = 64
+
+# Tokens are runs of letters or runs of digits, so compounds split at
+# "." and at letter/digit boundaries: React.js -> React .js, ASP.NET ->
+# ASP .NET, Python3 -> Python 3. A "." is kept only as the prefix of the
+# piece it introduces (.NET -> dotnet) and trailing "+"/"#" stay on
+# their piece (c#, c++). The skill matcher joins consecutive tokens, so
+# "reactjs", "aspdotnet" and "python3" still match the whole compound
+# while "react", "dotnet" and "python" now match its parts.
+TOKEN_PATTERN = re.compile(r"\.?(?:[^\W\d]+|\d+)[+#]*")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _compile_replacements(table):
+    """
+    One alternation equivalent to applying `table` in order: identity
+    entries and keys containing an earlier key (which that earlier
+    replacement always destroys) are dropped, the rest keep their order.
+    """
+    live = {}
+    for k, v in table.items():
+        if k != v and not any(prev in k for prev in live):
+            live[k] = v
+    if not live:
+        return None, live
+    return re.compile("|".join(re.escape(k) for k in live)), live
+
+
+_REPLACE, _REPLACE_TABLE = _compile_replacements(TOKEN_REPLACEMENTS)
+
+
+def _normalize(token: str) -> str:
+    t = token.lower().strip()
+    if _REPLACE is not None:
+        t = _REPLACE.sub(lambda m: _REPLACE_TABLE[m.group()], t)
+    # remove remaining non-alphanumeric chars
+    return _NON_ALNUM.sub("", t)
+
+
+_normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize)
+
+
 def normalize_token(token: str) -> str:
     """
     Normalize technical tokens so matching is consistent across:
@@ -31,37 +98,30 @@ def normalize_token(token: str) -> str:
 
     Examples:
     - C#        -> csharp
-    - ASP.NET   -> aspnet
     - .NET Core -> dotnetcore
     - Web API   -> webapi
     - Node.js   -> nodejs
+
+    Short inputs (single tokens and skills) are memoized.
     """
     if not token:
         return ""
+    if len(token) <= NORMALIZE_CACHE_MAX_LEN:
+        return _normalize_cached(token)
+    return _normalize(token)
 
-    t = token.lower().strip()
-
-    replacements = {
-        "c#": "csharp",
-        "c++": "cplusplus",
-        ".net core": "dotnetcore",
-        ".net": "dotnet",
-        "asp.net core": "aspnetcore",
-        "asp.net": "aspnet",
-        "web api": "webapi",
-        "rest api": "restapi",
-        "node.js": "nodejs",
-        "node js": "nodejs",
-        "javascript": "javascript",
-        "typescript": "typescript",
-    }
-
-    for k, v in replacements.items():
-        t = t.replace(k, v)
 
-    # remove remaining non-alphanumeric chars
-    t = re.sub(r"[^a-z0-9]+", "", t)
-    return t
+def normalize_tokens(text: str) -> List[Tuple[str, int, int]]:
+    """
+    (normalized, start, end) for every token of `text`, offsets into
+    `text`. Tokens that normalize to "" are dropped.
+    """
+    out = []
+    for m in TOKEN_PATTERN.finditer(text or ""):
+        n = normalize_token(m.group())
+        if n:
+            out.append((n, m.start(), m.end()))
+    return out
 
 
 # -------------------------------------------------
@@ -87,6 +147,26 @@ def save_json(path: str, obj) -> bool:
         return False
 
 
+@contextmanager
+def atomic_write_path(path: str, suffix: str = ".tmp"):
+    """
+    Yield a unique temp file next to `path`; it is renamed over `path`
+    when the block succeeds and removed when it raises. Concurrent
+    writers never share a temp file and readers see the old file or the
+    new one, never a partial write.
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=suffix,
+    )
+    os.close(fd)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 # -------------------------------------------------
 # CSV LIST UTILITY
 # -------------------------------------------------
@@ -0,0 +1,47 @@
+"""
+Synthetic resume text shared by the benchmarks.
+
+Run any benchmark from the repo root, e.g.
+    python benchmarks/bench_ats_single_pass.py
+"""
+
+import os
+import sys
+import random
+
+# make `components` importable the same way the Streamlit app does
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+
+SKILLS = [
+    "Python", "Java", "C#", "C++", "ASP.NET", ".NET Core", "Node.js", "React",
+    "TypeScript", "SQL", "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS",
+    "Azure", "GCP", "Terraform", "Kafka", "Spark", "Airflow", "PyTorch",
+    "TensorFlow", "scikit-learn", "Pandas", "REST API", "Web API", "GraphQL",
+    "Redis", "Linux", "Git", "CI/CD", "Jenkins", "FastAPI", "Django", "Flask",
+]
+
+VERBS = ["Built", "Designed", "Led", "Implemented", "Optimized", "Migrated", "Automated", "Developed"]
+NOUNS = ["pipeline", "service", "dashboard", "API", "platform", "model", "ETL job", "microservice"]
+HEADERS = ["SUMMARY", "Experience", "Projects", "Technical Skills:", "Education", "Certifications", "Awards"]
+
+
+def synthetic_resume(n_lines: int = 400, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    lines = ["Jane Doe", "jane@example.com | +1 555 0100", ""]
+    while len(lines) < n_lines:
+        lines.append(rnd.choice(HEADERS))
+        for _ in range(rnd.randint(4, 12)):
+            skills = ", ".join(rnd.sample(SKILLS, 3))
+            lines.append(
+                f"- {rnd.choice(VERBS)} a {rnd.choice(NOUNS)} using {skills}, "
+                f"improving throughput by {rnd.randint(5, 90)}% for {rnd.randint(2, 40)} teams."
+            )
+        lines.append("")
+    return "\n".join(lines[:n_lines])
+
+
+def synthetic_corpus(n: int, n_lines: int = 60, seed: int = 0):
+    return [synthetic_resume(n_lines, seed + i) for i in range(n)]
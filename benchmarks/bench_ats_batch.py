@@ -0,0 +1,73 @@
+"""
+ats_score_batch vs. calling ats_score once per resume, on distinct
+texts. Checks that every row of the batch result equals the per-resume
+score and detail. The synthetic corpus reuses a small vocabulary, which
+favours the batch (it works per distinct word), so it is also timed with
+made-up words mixed in.
+
+    python benchmarks/bench_ats_batch.py [n_resumes]
+"""
+
+import random
+import string
+import sys
+import time
+
+from _corpus import synthetic_corpus, SKILLS
+
+from components.ats_scoring import ats_score, ats_score_batch
+
+
+def batch_row(result, i):
+    """Rebuild the ats_score (score, detail) tuple for row i."""
+    if result["empty"][i]:
+        return 0.0, {"error": "Empty resume text"}
+    detail = {
+        "sections_detected": dict(zip(result["section_names"], result["sections"][i].tolist())),
+    }
+    for name in ("section_coverage", "keyword_match_rate", "quantification_signal",
+                 "readability", "formatting_penalty"):
+        detail[name] = float(result[name][i])
+    return float(result["score"][i]), detail
+
+
+def varied_corpus(n: int, seed: int = 0):
+    """synthetic_corpus with a made-up word (names, products) after every fifth word."""
+    rnd = random.Random(seed)
+    out = []
+    for text in synthetic_corpus(n, n_lines=60, seed=seed):
+        words = text.split(" ")
+        for k in range(0, len(words), 5):
+            made_up = "".join(rnd.choices(string.ascii_letters, k=rnd.randint(3, 10)))
+            words[k] += " " + made_up
+        out.append(" ".join(words))
+    return out
+
+
+def run(label, texts, skills):
+    start = time.perf_counter()
+    single = [ats_score(t, skills) for t in texts]
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ats_score_batch(texts, skills)
+    t_batch = time.perf_counter() - start
+
+    for i, expected in enumerate(single):
+        assert batch_row(batch, i) == expected, i
+
+    print(
+        f"{label:>14} {len(texts)} resumes: per-resume {len(texts) / t_single:8.1f} /s | "
+        f"batch {len(texts) / t_batch:8.1f} /s | x{t_single / t_batch:.2f}"
+    )
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    skills = SKILLS[:15]
+    run("synthetic", synthetic_corpus(n, n_lines=60), skills)
+    run("varied vocab", varied_corpus(n, seed=n), skills)
+
+
+if __name__ == "__main__":
+    main()
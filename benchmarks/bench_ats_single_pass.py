@@ -0,0 +1,90 @@
+"""
+ats_score on one shared AnalyzedResume vs. the previous implementation,
+where every signal re-scanned the raw text on its own. Also checks that
+both produce identical scores.
+"""
+
+import re
+import timeit
+
+import textstat
+
+from _corpus import synthetic_resume, SKILLS
+
+from components.ats_scoring import ats_score, SECTION_HINTS, _combine_signals
+from components.utils import normalize_token
+
+
+# -------------------------------------------------
+# PREVIOUS (MULTI-PASS) IMPLEMENTATION
+# -------------------------------------------------
+
+def legacy_ats_score(text, required_skills):
+    text_lower = text.lower()
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    sections = {}
+    for sec, hints in SECTION_HINTS.items():
+        found = any(ln.lower().rstrip(":") == sec or ln.lower().rstrip(":") in hints for ln in lines[:60])
+        if not found:
+            found = any(re.search(r"\b" + re.escape(h) + r"\b", text_lower) for h in hints)
+        if not found:
+            if sec == "experience":
+                found = bool(re.search(r"\b(develop|built|worked|engineer|implemented|\d+\s+years?)\b", text_lower))
+            elif sec == "education":
+                found = bool(re.search(r"\b(bachelor|master|degree|gpa|percentage)\b", text_lower))
+            elif sec == "skills":
+                found = len(set(re.findall(r"[A-Za-z0-9\+\#\./-]{2,}", text))) > 8
+        sections[sec] = found
+
+    text_norm = normalize_token(text)
+    skills_norm = {normalize_token(s) for s in required_skills if s}
+    keyword_rate = sum(1 for s in skills_norm if s and s in text_norm) / len(skills_norm) if skills_norm else 0.0
+
+    nums = len(re.findall(r"\b\d+(\.\d+)?%?\b", text))
+    bullets = len(re.findall(r"(^\s*[-•*])", text, flags=re.MULTILINE))
+    sentences = max(1, len(re.findall(r"[.!?]", text)))
+    quantify = min(1.0, (nums + bullets) / (sentences * 0.6))
+
+    try:
+        read = max(0.0, min(100.0, textstat.flesch_reading_ease(text)))
+    except Exception:
+        read = 50.0
+
+    words = text.split()
+    all_caps = len(re.findall(r"\b[A-Z]{3,}\b", text))
+    long_sentences = sum(1 for s in re.split(r"[.!?]", text) if len(s.split()) > 35)
+    caps_ratio = all_caps / max(1, len(words))
+    long_ratio = long_sentences / max(1, len(re.split(r"[.!?]", text)))
+    penalty = min(0.15, (caps_ratio * 0.15) + (long_ratio * 0.15))
+
+    return _combine_signals(sections, keyword_rate, quantify, read, penalty)
+
+
+def main():
+    skills = SKILLS[:15]
+    for n_lines in (50, 400, 2000, 8000):
+        text = synthetic_resume(n_lines)
+        assert legacy_ats_score(text, skills) == ats_score(text, skills)
+
+        # textstat memoizes whole texts; append a unique suffix per call so
+        # both sides do the full work, as they do for new uploads
+        runs = iter(range(10 ** 9))
+
+        def old():
+            return legacy_ats_score(f"{text}\nref {next(runs)}", skills)
+
+        def new():
+            return ats_score(f"{text}\nref {next(runs)}", skills)
+
+        reps = max(3, 4000 // n_lines)
+        t_old = min(timeit.repeat(old, number=reps, repeat=3)) / reps
+        t_new = min(timeit.repeat(new, number=reps, repeat=3)) / reps
+        print(
+            f"{n_lines:5d} lines ({len(text):7d} chars): "
+            f"multi-pass {t_old * 1e3:8.2f} ms | single-pass {t_new * 1e3:8.2f} ms | "
+            f"x{t_old / t_new:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Embedding backends for JDIndex._embed: SentenceTransformer (PyTorch) vs
+ONNX Runtime on the float32 and int8-quantized exports, with and without
+length bucketing, at 1 thread and all cores.
+
+Reports texts/s, cosine agreement with the PyTorch encoder, and overlap
+of each backend's top-10 JDs per resume with PyTorch's. Texts are JD
+postings and resumes of mixed length.
+
+    python bench_embedders.py [model id or local dir] [int8 onnx file]
+"""
+
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from _corpus import synthetic_corpus
+from bench_embedding_cache import MODEL
+from bench_jd_build import synthetic_csv
+
+from components.embedders import ONNX_MODEL_FILE, OnnxEmbedder, make_embedder
+from components.jd_index import _chunk_records
+
+K = 10
+
+
+def texts_for_bench():
+    frame = pd.read_csv(io.StringIO(synthetic_csv(1500)), dtype=str).fillna("")
+    jds = [rec["text"] for rec in _chunk_records(frame)]
+    resumes = synthetic_corpus(300, n_lines=40, seed=2)
+    queries = [line for r in synthetic_corpus(20, n_lines=10, seed=3) for line in r.splitlines() if line][:200]
+    return jds, resumes + queries
+
+
+def timed(model, texts, batch_size=64):
+    t = time.perf_counter()
+    embs = np.asarray(model.encode(texts, batch_size=batch_size, normalize_embeddings=True), dtype=np.float32)
+    return embs, time.perf_counter() - t
+
+
+def top_k(jd_embs, q_embs):
+    return np.argsort(-(q_embs @ jd_embs.T), axis=1)[:, :K]
+
+
+def main():
+    model = sys.argv[1] if len(sys.argv) > 1 else MODEL
+    int8_file = sys.argv[2] if len(sys.argv) > 2 else ONNX_MODEL_FILE
+    jds, queries = texts_for_bench()
+    texts = jds + queries
+    n_jd = len(jds)
+    cores = os.cpu_count() or 1
+    thread_counts = sorted({1, cores})
+    print(f"{model}: {len(texts)} texts ({n_jd} JDs, {len(queries)} resumes / lines), {cores} cores")
+
+    reference = None
+    for threads in thread_counts:
+        st = make_embedder(model, "sentence_transformers", threads=threads)
+        st.encode(texts[:8])
+        embs, secs = timed(st, texts)
+        reference = embs if reference is None else reference
+        print(f"{'sentence_transformers':34s} threads {threads:2d} | {len(texts) / secs:7.1f} texts/s")
+    ref_top = top_k(reference[:n_jd], reference[n_jd:])
+
+    variants = [
+        ("onnx float32", "onnx/model.onnx", True),
+        ("onnx int8", int8_file, True),
+        ("onnx int8, no length bucketing", int8_file, False),
+    ]
+    for label, model_file, bucketing in variants:
+        for threads in thread_counts:
+            try:
+                onnx = OnnxEmbedder(model, model_file=model_file, threads=threads, sort_by_length=bucketing)
+            except Exception as exc:  # export not published / not present locally
+                print(f"{label:34s} skipped: {exc}")
+                break
+            onnx.encode(texts[:8])
+            embs, secs = timed(onnx, texts)
+            cos = (embs * reference).sum(axis=1)
+            overlap = np.mean([
+                len(set(a) & set(b)) / K for a, b in zip(top_k(embs[:n_jd], embs[n_jd:]), ref_top)
+            ])
+            print(
+                f"{label:34s} threads {threads:2d} | {len(texts) / secs:7.1f} texts/s "
+                f"| cosine mean {cos.mean():.4f} min {cos.min():.4f} | top-{K} overlap {overlap:.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
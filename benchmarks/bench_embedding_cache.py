@@ -0,0 +1,92 @@
+"""
+Embedding cost of a JD rebuild and of repeated resume queries with and
+without the on-disk embedding cache.
+
+Uses SentenceTransformer when it is installed; otherwise a stand-in
+embedder with a fixed per-text cost, so the numbers only show how much
+model work the cache avoids.
+"""
+
+import hashlib
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from _corpus import SKILLS, synthetic_resume
+
+from components.embedding_cache import EmbeddingCache
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def make_embedder():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        def embed(texts):
+            time.sleep(0.0005 * len(texts))  # ~2k texts/s, a small CPU model
+            out = np.stack([
+                np.frombuffer(hashlib.sha512(t.encode("utf-8")).digest() * 6, dtype=np.uint8)[:384]
+                for t in texts
+            ]).astype(np.float32)
+            return out / np.linalg.norm(out, axis=1, keepdims=True)
+        return embed, "stand-in embedder"
+
+    model = SentenceTransformer(MODEL)
+    return (lambda texts: model.encode(texts, batch_size=64, normalize_embeddings=True)), MODEL
+
+
+def jd_texts(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    return [
+        f"Job Position: Role {i}\nSkills: {', '.join(rnd.sample(SKILLS, 6))}\nSummary: {rnd.random()}"
+        for i in range(n)
+    ]
+
+
+def main():
+    embed, name = make_embedder()
+    print(f"embedder: {name}")
+
+    texts = jd_texts(5000)
+    edited = list(texts)
+    for i in random.Random(1).sample(range(len(texts)), len(texts) // 20):
+        edited[i] += " (updated)"
+
+    for dtype in ("float32", "float16"):
+        cache = EmbeddingCache(MODEL, cache_dir=tempfile.mkdtemp(), dtype=dtype)
+
+        t = time.perf_counter()
+        cold = cache.get_or_embed(texts, embed)
+        t_cold = time.perf_counter() - t
+
+        t = time.perf_counter()
+        cache.get_or_embed(edited, embed)
+        t_edit = time.perf_counter() - t
+
+        t = time.perf_counter()
+        warm = cache.get_or_embed(texts, embed)
+        t_warm = time.perf_counter() - t
+
+        resume = synthetic_resume(60)
+        cache.get_or_embed([resume], embed)
+        t = time.perf_counter()
+        for _ in range(100):
+            cache.get_or_embed([resume], embed)
+        t_query = (time.perf_counter() - t) / 100
+
+        ref = np.asarray(embed(texts[:200]), dtype=np.float32)
+        err = float(np.abs(warm[:200] - ref).max())
+        stats = cache.stats()
+        print(
+            f"{dtype}: cold {t_cold:6.2f} s | 5% edited {t_edit:6.2f} s | unchanged {t_warm * 1e3:7.1f} ms "
+            f"| cached query {t_query * 1e6:6.0f} us | max err {err:.1e} "
+            f"| hit rate {stats['hit_rate']} | {stats['size_bytes'] / 2**20:.1f} MiB"
+        )
+        assert np.array_equal(cold, warm)
+
+
+if __name__ == "__main__":
+    main()
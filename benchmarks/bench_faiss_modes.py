@@ -0,0 +1,82 @@
+"""
+FAISS index modes for the JD index: recall@k against the exact flat
+index, single-query latency percentiles, build time and serialized
+size, swept over nprobe / efSearch.
+
+Vectors are a normalized Gaussian mixture shaped like sentence
+embeddings (384-d, clustered), built with the same IndexBuilder as
+JDIndex.build_from_csv.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import _corpus  # noqa: F401  (puts app/ on sys.path)
+
+from components.ann_index import IndexBuilder, IndexConfig, apply_search_params, index_nbytes
+
+DIM = 384
+K = 10
+
+
+def clustered(n: int, n_clusters: int = 500, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, DIM)).astype(np.float32)
+    x = centers[rng.integers(0, n_clusters, n)] + 0.6 * rng.standard_normal((n, DIM)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def build(config: IndexConfig, xb: np.ndarray, chunk: int = 5000):
+    t = time.perf_counter()
+    builder = IndexBuilder(config)
+    for i in range(0, len(xb), chunk):
+        builder.add(xb[i:i + chunk])
+    index = builder.finish()
+    return index, builder.config, time.perf_counter() - t
+
+
+def latencies(index, xq: np.ndarray) -> np.ndarray:
+    out = np.empty(len(xq))
+    for i in range(len(xq)):
+        t = time.perf_counter()
+        index.search(xq[i:i + 1], K)
+        out[i] = time.perf_counter() - t
+    return out * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    xb = clustered(n)
+    xq = clustered(500, seed=1)
+
+    flat, _, t_flat = build(IndexConfig(type="flat"), xb)
+    _, truth = flat.search(xq, K)
+
+    modes = [
+        (IndexConfig(type="flat"), [{}]),
+        (IndexConfig(type="ivf_flat", train_size=n), [{"nprobe": p} for p in (1, 8, 32)]),
+        (IndexConfig(type="ivf_pq", train_size=n), [{"nprobe": p} for p in (8, 32)]),
+        (IndexConfig(type="hnsw"), [{"ef_search": e} for e in (16, 64, 128)]),
+    ]
+    print(f"{n} vectors x {DIM}d, {len(xq)} queries, recall@{K} vs flat")
+    for config, sweeps in modes:
+        index, resolved, t_build = build(config, xb)
+        size = index_nbytes(index)
+        for params in sweeps:
+            tuned = resolved._replace(**params)
+            apply_search_params(index, tuned)
+            _, ids = index.search(xq, K)
+            recall = np.mean([len(set(a) & set(b)) / K for a, b in zip(ids, truth)])
+            lat = latencies(index, xq)
+            label = resolved.type + "".join(f" {k}={v}" for k, v in params.items())
+            print(
+                f"{label:22s} recall {recall:5.3f} | p50 {np.percentile(lat, 50):6.2f} ms "
+                f"p95 {np.percentile(lat, 95):6.2f} ms p99 {np.percentile(lat, 99):6.2f} ms "
+                f"| {size / 2**20:7.1f} MiB | build {t_build:5.1f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
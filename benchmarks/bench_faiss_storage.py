@@ -0,0 +1,112 @@
+"""
+Vector storage for the JD index: float32 vs float16 vs int8 scalar
+quantization, each loaded normally or memory-mapped.
+
+Per mode: recall@k against exact float32 flat search, single-query
+latency percentiles, file size, and the memory a worker process pays
+after loading the index and serving queries. "private" is anonymous
+memory (a copy per process); "mapped" is file-backed pages that every
+process mapping the same file shares through the page cache.
+
+Vectors are the clustered 384-d mixture from bench_faiss_modes.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+import _corpus  # noqa: F401  (puts app/ on sys.path)
+
+from bench_faiss_modes import DIM, K, build, clustered, latencies
+from components.ann_index import IndexConfig, apply_search_params, read_index, write_index
+
+MODES = [
+    IndexConfig(type="flat"),
+    IndexConfig(type="flat", sq="fp16"),
+    IndexConfig(type="flat", sq="int8"),
+    IndexConfig(type="hnsw"),
+    IndexConfig(type="hnsw", sq="int8"),
+    IndexConfig(type="ivf_flat", nprobe=32),
+    IndexConfig(type="ivf_flat", sq="int8", nprobe=32),
+]
+
+
+def _smaps_kib() -> dict:
+    """Rss / Anonymous of this process in KiB (Linux)."""
+    out = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Anonymous"):
+                out[key] = int(rest.split()[0])
+    return out
+
+
+def child(path: str, mmap: bool, queries_path: str):
+    """Load `path` in a fresh process, run the queries, print the memory delta."""
+    import faiss  # noqa: F401  (library load is not part of the index cost)
+
+    xq = np.load(queries_path)
+    before = _smaps_kib()
+    index = read_index(path, mmap=mmap)
+    index.search(xq, K)
+    after = _smaps_kib()
+    private = after["Anonymous"] - before["Anonymous"]
+    rss = after["Rss"] - before["Rss"]
+    print(json.dumps({"private_kib": private, "mapped_kib": max(0, rss - private)}))
+
+
+def load_cost(path: str, mmap: bool, queries_path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", path, "1" if mmap else "0", queries_path],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    xb = clustered(n)
+    xq = clustered(500, seed=1)
+
+    exact, _, _ = build(IndexConfig(type="flat"), xb)
+    _, truth = exact.search(xq, K)
+
+    tmp = tempfile.mkdtemp()
+    queries_path = os.path.join(tmp, "queries.npy")
+    np.save(queries_path, xq)
+
+    print(f"{n} vectors x {DIM}d, {len(xq)} queries, recall@{K} vs float32 flat")
+    print("memory per worker process after load + search, MiB (private / page-cache mapped)")
+    for config in MODES:
+        index, resolved, t_build = build(config._replace(train_size=n), xb)
+        apply_search_params(index, resolved)
+        path = os.path.join(tmp, "index.bin")
+        write_index(index, path)
+        size = os.path.getsize(path)
+
+        _, ids = index.search(xq, K)
+        recall = np.mean([len(set(a) & set(b)) / K for a, b in zip(ids, truth)])
+        lat = latencies(index, xq)
+        read = load_cost(path, False, queries_path)
+        mapped = load_cost(path, True, queries_path)
+
+        label = f"{resolved.type} {resolved.sq or 'float32'}"
+        print(
+            f"{label:15s} recall {recall:5.3f} | p50 {np.percentile(lat, 50):6.2f} ms "
+            f"p95 {np.percentile(lat, 95):6.2f} ms | file {size / 2**20:6.1f} MiB "
+            f"| read {read['private_kib'] / 1024:6.1f} / {read['mapped_kib'] / 1024:5.1f} "
+            f"| mmap {mapped['private_kib'] / 1024:6.1f} / {mapped['mapped_kib'] / 1024:5.1f} "
+            f"| build {t_build:5.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3] == "1", sys.argv[4])
+    else:
+        main()
@@ -0,0 +1,50 @@
+"""
+IncrementalATSScorer vs. a full ats_score after one-line edits, the way
+users tweak pasted text between two "Analyze" clicks. Every incremental
+result is checked against the full rescore.
+"""
+
+import random
+import time
+
+from _corpus import synthetic_resume, SKILLS
+
+from components.ats_scoring import ats_score, IncrementalATSScorer
+
+
+def one_line_edits(text, n, seed=0):
+    rnd = random.Random(seed)
+    lines = text.split("\n")
+    for k in range(n):
+        i = rnd.randrange(len(lines))
+        lines[i] = lines[i] + f" (edit {k})"
+        yield "\n".join(lines)
+
+
+def main():
+    skills = SKILLS[:15]
+    for n_lines in (60, 400, 2000):
+        edits = list(one_line_edits(synthetic_resume(n_lines), 50, seed=n_lines))
+
+        scorer = IncrementalATSScorer()
+        scorer.score(synthetic_resume(n_lines), skills)
+
+        t_full = t_inc = 0.0
+        for text in edits:
+            start = time.perf_counter()
+            expected = ats_score(text, skills)
+            t_full += time.perf_counter() - start
+
+            start = time.perf_counter()
+            got = scorer.score(text, skills)
+            t_inc += time.perf_counter() - start
+            assert got == expected
+
+        print(
+            f"{n_lines:5d} lines: full rescore {t_full / len(edits) * 1e3:7.2f} ms | "
+            f"incremental {t_inc / len(edits) * 1e3:6.3f} ms | x{t_full / t_inc:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
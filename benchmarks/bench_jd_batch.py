@@ -0,0 +1,65 @@
+"""
+JDIndex.query / match_role called once per resume vs. query_batch /
+match_role_batch over the whole list. Uses the stand-in embedder from
+bench_embedding_cache when SentenceTransformer is not installed.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from _corpus import synthetic_corpus
+from bench_embedding_cache import make_embedder
+from bench_jd_build import synthetic_csv
+from bench_jd_upsert import new_index
+
+import components.jd_index as jd_index
+
+
+def main():
+    embed, name = make_embedder()
+    print(f"embedder: {name}")
+
+    jd_index.ART_DIR = tempfile.mkdtemp()
+    csv_path = os.path.join(jd_index.ART_DIR, "jobs.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(synthetic_csv(20000))
+    jd = new_index(embed)
+    jd.build_from_csv(csv_path, progress=False)
+
+    for n in (100, 1000):
+        resumes = synthetic_corpus(n, n_lines=40, seed=n)
+
+        t = time.perf_counter()
+        single = [jd.query(r, k=10) for r in resumes]
+        t_query = time.perf_counter() - t
+
+        t = time.perf_counter()
+        batch = jd.query_batch(resumes, k=10)
+        t_query_batch = time.perf_counter() - t
+
+        assert [[m["id"] for m in hits] for hits in single] == batch["ids"].tolist()
+        assert np.allclose([[m["score"] for m in hits] for hits in single], batch["scores"], atol=1e-5)
+
+        t = time.perf_counter()
+        roles = [jd.match_role(r) for r in resumes]
+        t_role = time.perf_counter() - t
+
+        t = time.perf_counter()
+        top = jd.match_role_batch(resumes, top_n=3)
+        t_role_batch = time.perf_counter() - t
+
+        assert [r for r, _ in roles] == top["roles"][:, 0].tolist()
+        assert np.allclose([p for _, p in roles], top["proba"][:, 0])
+
+        print(
+            f"{n:5d} resumes: query {t_query:6.2f} s -> query_batch {t_query_batch:6.2f} s "
+            f"(x{t_query / t_query_batch:.1f}) | match_role {t_role:6.2f} s -> "
+            f"match_role_batch {t_role_batch:6.2f} s (x{t_role / t_role_batch:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+JDIndex retrieval modes: cold start of a fresh process (load + first
+query) and per-query latency for sparse (TF-IDF), hybrid and dense
+retrieval. The cold start runs in a subprocess, so its memory and import
+cost are what a new pod pays; SentenceTransformer's own cold start is
+timed only when it is installed. Warm latencies use the stand-in
+embedder from bench_embedding_cache when it is not.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from _corpus import synthetic_corpus
+from bench_embedding_cache import MODEL, make_embedder
+from bench_jd_build import synthetic_csv
+from bench_jd_upsert import new_index
+
+import components.jd_index as jd_index
+from components.jd_index import JDIndex
+
+
+def _rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def child(art_dir: str):
+    """Fresh process: sparse load + first query, then the embedder's cold start."""
+    rss0, t = _rss_mib(), time.perf_counter()
+    jd_index.ART_DIR = art_dir
+    jd = JDIndex(retrieval_mode="sparse")
+    jd.load()
+    t_load = time.perf_counter() - t
+    jd.query("Python developer with Docker and AWS experience", k=10)
+    out = {
+        "load_s": t_load,
+        "first_query_s": time.perf_counter() - t,
+        "rss_mib": _rss_mib() - rss0,
+        "embedder_imported": "sentence_transformers" in sys.modules,
+    }
+
+    t = time.perf_counter()
+    try:
+        from sentence_transformers import SentenceTransformer
+        SentenceTransformer(MODEL).encode(["warm up"])
+        out["embedder_cold_s"] = time.perf_counter() - t
+        out["embedder_rss_mib"] = _rss_mib() - rss0 - out["rss_mib"]
+    except ImportError:
+        pass
+    print(json.dumps(out))
+
+
+def per_query_ms(fn, texts) -> np.ndarray:
+    out = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        t = time.perf_counter()
+        fn(text)
+        out[i] = time.perf_counter() - t
+    return out * 1e3
+
+
+def main():
+    embed, name = make_embedder()
+    print(f"embedder: {name}")
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    jd_index.ART_DIR = tempfile.mkdtemp()
+    csv_path = os.path.join(jd_index.ART_DIR, "jobs.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(synthetic_csv(n))
+    jd = new_index(embed)
+    jd.build_from_csv(csv_path, progress=False)
+    size = os.path.getsize(os.path.join(jd_index.ART_DIR, jd_index.TFIDF_MATRIX_FILE))
+    print(f"{n} postings, TF-IDF matrix {size / 2**20:.1f} MiB")
+
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", jd_index.ART_DIR],
+        check=True, capture_output=True, text=True,
+    )
+    cold = json.loads(out.stdout.strip().splitlines()[-1])
+    print(
+        f"cold start, sparse: load {cold['load_s']:.2f} s, first query after {cold['first_query_s']:.2f} s, "
+        f"+{cold['rss_mib']:.0f} MiB RSS, sentence_transformers imported: {cold['embedder_imported']}"
+    )
+    if "embedder_cold_s" in cold:
+        print(f"cold start, embedder: {cold['embedder_cold_s']:.2f} s, +{cold['embedder_rss_mib']:.0f} MiB RSS")
+    else:
+        print("cold start, embedder: sentence_transformers not installed")
+
+    resumes = synthetic_corpus(200, n_lines=40, seed=1)
+    modes = [
+        ("sparse", lambda r: jd.query(r, k=10, mode="sparse")),
+        ("hybrid", lambda r: jd.query(r, k=10, mode="hybrid")),
+        ("dense", lambda r: jd.query(r, k=10, mode="dense")),
+    ]
+    for label, fn in modes:
+        lat = per_query_ms(fn, resumes)
+        print(f"{label:7s} p50 {np.percentile(lat, 50):7.2f} ms  p95 {np.percentile(lat, 95):7.2f} ms")
+
+    t = time.perf_counter()
+    jd.query_batch(resumes, k=10, mode="sparse")
+    print(f"sparse query_batch: {(time.perf_counter() - t) / len(resumes) * 1e3:.2f} ms / resume")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
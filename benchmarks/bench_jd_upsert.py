@@ -0,0 +1,76 @@
+"""
+Adding / replacing / deleting job postings with JDIndex.upsert / delete
+vs. re-running build_from_csv, plus the background classifier refit
+that follows. Uses the stand-in embedder from bench_embedding_cache
+when SentenceTransformer is not installed.
+"""
+
+import os
+import tempfile
+import time
+
+from bench_embedding_cache import make_embedder
+from bench_jd_build import synthetic_csv
+
+import components.jd_index as jd_index
+from components.jd_index import JDIndex
+
+
+class _Encoder:
+    def __init__(self, embed):
+        self.embed = embed
+
+    def encode(self, texts, batch_size=64, normalize_embeddings=True):
+        return self.embed(list(texts))
+
+
+def new_index(embed) -> JDIndex:
+    jd = JDIndex(use_embed_cache=False)
+    jd.model = _Encoder(embed)
+    jd.retrain_delay = None  # timed separately below
+    return jd
+
+
+def main():
+    embed, name = make_embedder()
+    print(f"embedder: {name}")
+
+    for n in (5000, 20000):
+        jd_index.ART_DIR = tempfile.mkdtemp()
+        csv_path = os.path.join(jd_index.ART_DIR, "jobs.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write(synthetic_csv(n, seed=n))
+
+        jd = new_index(embed)
+        t_build = jd.build_from_csv(csv_path, progress=False)["seconds"]
+
+        posting = {"job_position": "Rust Engineer", "relevant_skills": "Rust, Tokio, gRPC"}
+        t = time.perf_counter()
+        (pid,) = jd.upsert([posting])
+        t_add = time.perf_counter() - t
+
+        t = time.perf_counter()
+        jd.upsert([dict(posting, id=pid, relevant_skills="Rust, Tokio")])
+        t_replace = time.perf_counter() - t
+
+        t = time.perf_counter()
+        jd.upsert([dict(posting, job_position=f"Role {i}") for i in range(100)])
+        t_add100 = time.perf_counter() - t
+
+        t = time.perf_counter()
+        jd.delete([pid])
+        t_delete = time.perf_counter() - t
+
+        t = time.perf_counter()
+        jd.retrain_role_classifier()
+        t_retrain = time.perf_counter() - t
+
+        print(
+            f"{n:6d} postings: rebuild {t_build:6.2f} s | upsert 1 {t_add * 1e3:6.1f} ms "
+            f"| replace 1 {t_replace * 1e3:6.1f} ms | upsert 100 {t_add100 * 1e3:6.1f} ms "
+            f"| delete 1 {t_delete * 1e3:6.1f} ms | background refit {t_retrain:5.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+keyword_match_rate: Aho-Corasick token matcher vs. the previous
+per-skill substring test against one normalized blob, for growing
+skill vocabularies.
+"""
+
+import random
+import string
+import timeit
+
+from _corpus import synthetic_resume, SKILLS
+
+from components.ats_scoring import AnalyzedResume, keyword_match_rate
+from components.skill_matcher import SkillMatcher
+from components.utils import normalize_token
+
+
+def legacy_keyword_match_rate(text, skills):
+    text_norm = normalize_token(text)
+    skills_norm = {normalize_token(s) for s in skills if s}
+    return sum(1 for s in skills_norm if s and s in text_norm) / len(skills_norm)
+
+
+# (resume text, skill, expected match): compounds match as a whole and by part
+CASES = [
+    ("Built SPAs in React.js", "React", True),
+    ("Built SPAs in React.js", "React.js", True),
+    ("ASP.NET MVC services", ".NET", True),
+    ("ASP.NET MVC services", "ASP.NET", True),
+    ("C#.NET desktop apps", "C#", True),
+    ("Node.js APIs", "Node js", True),
+    ("Python3, Java8", "Python", True),
+    ("Python3, Java8", "Java", True),
+    ("Python3, Java8", "Python3", True),
+    ("TensorFlow2 models", "TensorFlow", True),
+    ("C++17 engine", "C++", True),
+    ("JavaScript", "Java", False),
+]
+
+
+def vocabulary(n, seed=0):
+    rnd = random.Random(seed)
+    vocab = list(SKILLS)
+    while len(vocab) < n:
+        vocab.append("".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(3, 12))))
+    return vocab[:n]
+
+
+def main():
+    for resume, skill, expected in CASES:
+        got = keyword_match_rate(AnalyzedResume(resume), [skill]) == 1.0
+        assert got == expected, (resume, skill)
+
+    text = synthetic_resume(400)
+    doc = AnalyzedResume(text)
+    doc.normalized_tokens  # tokenized once per resume, shared with other signals
+
+    for n in (15, 500, 5000, 20000):
+        skills = vocabulary(n)
+        t_build = timeit.timeit(lambda: SkillMatcher(skills), number=1)
+        keyword_match_rate(doc, skills)  # warm the per-vocabulary cache
+
+        reps = 20
+        t_old = min(timeit.repeat(lambda: legacy_keyword_match_rate(text, skills), number=reps, repeat=3)) / reps
+        t_new = min(timeit.repeat(lambda: keyword_match_rate(doc, skills), number=reps, repeat=3)) / reps
+        print(
+            f"{n:6d} skills: substring {t_old * 1e3:8.2f} ms | automaton {t_new * 1e3:6.2f} ms "
+            f"(build once {t_build * 1e3:7.1f} ms) | x{t_old / t_new:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup cost of the JD meta: parsing faiss_meta.json (indent=2, one
+dict per posting) vs. opening the memory-mapped MetaStore. Reports
+load time, Python heap allocated by the load (memory-mapped pages are
+not counted), on-disk size, and the cost of decoding single records.
+"""
+
+import os
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+
+from _corpus import SKILLS
+
+from components.meta_store import MetaStore
+from components.utils import normalize_token
+
+ROLES = [f"{level} {area} Engineer" for level in ("Junior", "Senior", "Staff") for area in ("Data", "Backend", "ML", "Cloud")]
+
+
+def synthetic_records(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    records = []
+    for i in range(n):
+        role = rnd.choice(ROLES)
+        skills = rnd.sample(SKILLS, rnd.randint(4, 10))
+        records.append({
+            "job_position": role,
+            "job_position_norm": normalize_token(role),
+            "skills": skills,
+            "skills_norm": [normalize_token(s) for s in skills],
+            "text": (
+                f"Job Position: {role}\nSkills: {', '.join(skills)}\n"
+                f"Qualifications: BS in CS, {rnd.randint(1, 10)}+ years\n"
+                + "Responsibilities: design, build and operate services. " * rnd.randint(5, 15)
+            ),
+            "id": i,
+        })
+    return records
+
+
+def measure(load):
+    """Seconds for one load, then the heap it allocates (traced in a second, slower run)."""
+    t = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - t
+    tracemalloc.start()
+    obj = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return elapsed, peak
+
+
+def main():
+    for n in (10000, 100000):
+        records = synthetic_records(n, seed=n)
+        d = tempfile.mkdtemp()
+        json_path = os.path.join(d, "faiss_meta.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        MetaStore.from_records(records).save(d)
+
+        json_size = os.path.getsize(json_path)
+        store_size = sum(os.path.getsize(os.path.join(d, f)) for f in os.listdir(d) if f.startswith("meta_"))
+
+        def load_json():
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        t_json, mem_json = measure(load_json)
+        t_store, mem_store = measure(lambda: MetaStore.load(d))
+        store = MetaStore.load(d)
+
+        rows = [random.Random(1).randrange(n) for _ in range(10000)]
+        assert all(store[r] == records[r] for r in rows[:100])
+        t = time.perf_counter()
+        for r in rows:
+            store[r]
+        t_record = (time.perf_counter() - t) / len(rows)
+        t = time.perf_counter()
+        for r in rows:
+            store.record(r, ("job_position", "skills"))
+        t_fields = (time.perf_counter() - t) / len(rows)
+
+        print(
+            f"{n:7d} postings: json {t_json * 1e3:7.1f} ms / {mem_json / 2**20:6.1f} MiB heap / {json_size / 2**20:6.1f} MiB disk"
+            f" | store {t_store * 1e3:5.1f} ms / {mem_store / 2**20:5.2f} MiB heap / {store_size / 2**20:6.1f} MiB disk"
+            f" | record {t_record * 1e6:4.1f} us, role+skills {t_fields * 1e6:4.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+normalize_token: compiled replacement table + memo vs. the previous
+dict-of-str.replace loop, on skills, resume tokens and whole resumes.
+Also checks normalize_tokens() against per-token normalization.
+"""
+
+import re
+import timeit
+
+from _corpus import synthetic_resume, SKILLS
+
+from components.utils import TOKEN_PATTERN, normalize_token, normalize_tokens, _normalize
+
+
+def legacy_normalize_token(token):
+    if not token:
+        return ""
+    t = token.lower().strip()
+    replacements = {
+        "c#": "csharp", "c++": "cplusplus", ".net core": "dotnetcore", ".net": "dotnet",
+        "asp.net core": "aspnetcore", "asp.net": "aspnet", "web api": "webapi",
+        "rest api": "restapi", "node.js": "nodejs", "node js": "nodejs",
+        "javascript": "javascript", "typescript": "typescript",
+    }
+    for k, v in replacements.items():
+        t = t.replace(k, v)
+    t = re.sub(r"[^a-z0-9]+", "", t)
+    return t
+
+
+def main():
+    text = synthetic_resume(400)
+    tokens = TOKEN_PATTERN.findall(text)
+    cases = {
+        "skills": SKILLS * 30,
+        "resume tokens": tokens,
+        "whole resumes": [synthetic_resume(60, seed=i) for i in range(20)],
+    }
+
+    for name, items in cases.items():
+        assert [legacy_normalize_token(t) for t in items] == [normalize_token(t) for t in items]
+        t_old = min(timeit.repeat(lambda: [legacy_normalize_token(t) for t in items], number=3, repeat=3)) / 3
+        t_new = min(timeit.repeat(lambda: [normalize_token(t) for t in items], number=3, repeat=3)) / 3
+        print(
+            f"{name:14s} ({len(items):6d} calls): old {t_old / len(items) * 1e6:7.2f} us | "
+            f"new {t_new / len(items) * 1e6:7.2f} us | x{t_old / t_new:.1f}"
+        )
+
+    # cold path: every token seen for the first time
+    t_old = min(timeit.repeat(lambda: [legacy_normalize_token(t) for t in tokens], number=3, repeat=3)) / 3
+    t_new = min(timeit.repeat(lambda: [_normalize(t) for t in tokens], number=3, repeat=3)) / 3
+    print(
+        f"{'uncached':14s} ({len(tokens):6d} calls): old {t_old / len(tokens) * 1e6:7.2f} us | "
+        f"new {t_new / len(tokens) * 1e6:7.2f} us | x{t_old / t_new:.1f}"
+    )
+
+    spans = normalize_tokens(text)
+    assert [n for n, _, _ in spans] == [n for n in map(legacy_normalize_token, tokens) if n]
+    assert all(normalize_token(text[a:b]) == n for n, a, b in spans)
+    t_tok = min(timeit.repeat(lambda: normalize_tokens(text), number=3, repeat=3)) / 3
+    print(f"normalize_tokens on {len(text)} chars: {t_tok * 1e3:.2f} ms ({len(spans)} tokens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+readability_score (shared tokenization + cached syllables) vs.
+textstat.flesch_reading_ease on the raw text. Reports the largest score
+difference against the installed textstat.
+"""
+
+import timeit
+
+import textstat
+
+from _corpus import synthetic_corpus
+
+from components.ats_scoring import AnalyzedResume, readability_score, word_syllables
+
+
+def textstat_readability(text):
+    try:
+        return max(0.0, min(100.0, textstat.flesch_reading_ease(text)))
+    except Exception:
+        return 50.0
+
+
+def main():
+    for n_lines in (60, 400, 2000):
+        texts = synthetic_corpus(50, n_lines=n_lines, seed=n_lines)
+        # textstat memoizes whole texts; append a unique suffix per run so
+        # every call does the full work, as it does for new uploads
+        runs = iter(range(10 ** 9))
+
+        def old():
+            k = next(runs)
+            return [textstat_readability(f"{t}\nref {k}") for t in texts]
+
+        def new():
+            k = next(runs)
+            return [readability_score(AnalyzedResume(f"{t}\nref {k}")) for t in texts]
+
+        diff = max(abs(a - b) for a, b in zip(old(), new()))
+
+        word_syllables.cache_clear()
+        t_cold = timeit.timeit(new, number=1) / len(texts)
+        t_old = min(timeit.repeat(old, number=1, repeat=3)) / len(texts)
+        t_new = min(timeit.repeat(new, number=1, repeat=3)) / len(texts)
+        print(
+            f"{n_lines:5d} lines: textstat {t_old * 1e3:7.2f} ms | in-house {t_new * 1e3:6.2f} ms "
+            f"(cold cache {t_cold * 1e3:6.2f} ms) | x{t_old / t_new:.1f} | max |diff| {diff:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Keyword match rate for every role: one sparse role x skill product
+(RoleSkillMatrix.rank) vs. keyword_match_rate called once per role.
+Checks both give the same rates.
+"""
+
+import random
+import string
+import timeit
+
+from _corpus import synthetic_resume, SKILLS
+
+from components.ats_scoring import AnalyzedResume, keyword_match_rate
+from components.role_fit import RoleSkillMatrix
+
+
+def synthetic_meta(n_roles, vocab_size=3000, skills_per_role=15, seed=0):
+    rnd = random.Random(seed)
+    vocab = list(SKILLS)
+    while len(vocab) < vocab_size:
+        vocab.append("".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(3, 12))))
+    return [
+        {"job_position": f"Role {i}", "skills": rnd.sample(vocab, skills_per_role)}
+        for i in range(n_roles)
+    ]
+
+
+def main():
+    text = synthetic_resume(120)
+    for n_roles in (4, 500, 5000):
+        meta = synthetic_meta(n_roles, seed=n_roles)
+        t_build = timeit.timeit(lambda: RoleSkillMatrix(meta), number=1)
+        matrix = RoleSkillMatrix(meta)
+
+        def per_role():
+            doc = AnalyzedResume(text)
+            return [keyword_match_rate(doc, m["skills"]) for m in meta]
+
+        expected = per_role()
+        rates = matrix.match_rates(text)
+        assert all(abs(a - b) < 1e-6 for a, b in zip(expected, rates.tolist()))
+
+        reps = 5
+        t_old = min(timeit.repeat(per_role, number=reps, repeat=3)) / reps
+        t_new = min(timeit.repeat(lambda: matrix.rank(text, top_k=10), number=reps, repeat=3)) / reps
+        print(
+            f"{n_roles:5d} roles: per-role {t_old * 1e3:8.2f} ms | matrix top-10 {t_new * 1e3:6.2f} ms "
+            f"(build once {t_build * 1e3:7.1f} ms) | x{t_old / t_new:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
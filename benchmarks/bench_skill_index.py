@@ -0,0 +1,59 @@
+"""
+Candidate roles from the inverted skill index vs. scanning every role's
+skill set, for the same IDF-weighted overlap score. Also reports the
+on-disk size and load time of the memory-mapped postings.
+"""
+
+import os
+import math
+import tempfile
+import timeit
+
+from _corpus import synthetic_resume
+from bench_role_fit import synthetic_meta
+
+from components.skill_index import SkillIndex
+from components.utils import normalize_token
+
+
+def brute_force(index, role_skills, resume_skills, k):
+    n = len(role_skills)
+    idf = {s: math.log((1 + n) / (1 + index.df[i])) + 1.0 for i, s in enumerate(index.vocab)}
+    scores = []
+    for r, skills in enumerate(role_skills):
+        total = sum(idf[s] for s in skills)
+        hit = sum(idf[s] for s in skills & resume_skills)
+        if hit > 0:
+            scores.append((-(hit / total), r))
+    return [(r, -s) for s, r in sorted(scores)[:k]]
+
+
+def main():
+    text = synthetic_resume(120)
+    for n_roles in (500, 5000, 50000):
+        meta = synthetic_meta(n_roles, seed=n_roles)
+        role_skills = [{normalize_token(s) for s in m["skills"]} for m in meta]
+
+        index = SkillIndex.build(role_skills)
+        with tempfile.TemporaryDirectory() as d:
+            index.save(d)
+            size = sum(os.path.getsize(os.path.join(d, f)) for f in os.listdir(d))
+            t_load = timeit.timeit(lambda: SkillIndex.load(d, n_roles), number=1)
+            index = SkillIndex.load(d, n_roles)
+
+            resume_skills = {index.vocab[i] for i in index.skills_in(text)}
+            got = index.candidate_roles(text, k=10)
+            expected = brute_force(index, role_skills, resume_skills, 10)
+            assert [r for r, _ in got] == [r for r, _ in expected]
+            assert all(abs(a - b) < 1e-9 for (_, a), (_, b) in zip(got, expected))
+
+            t_old = min(timeit.repeat(lambda: brute_force(index, role_skills, resume_skills, 10), number=3, repeat=3)) / 3
+            t_new = min(timeit.repeat(lambda: index.candidate_roles(text, k=10), number=3, repeat=3)) / 3
+        print(
+            f"{n_roles:6d} roles: scan {t_old * 1e3:8.2f} ms | inverted index {t_new * 1e3:6.2f} ms "
+            f"| x{t_old / t_new:.0f} | {size / 1024:7.1f} KiB on disk, load {t_load * 1e3:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()